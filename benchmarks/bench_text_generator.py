@@ -0,0 +1,66 @@
+"""
+Torio Tools Scribe - Benchmark do TextSubtitleGenerator
+Throughput de generate_subtitles de 1 mil a 1 milhão de palavras, em todos os formatos,
+e o pico de memória do caminho arquivo -> arquivo (deve ficar constante).
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, List
+
+from common import measure, max_rss_mb, synthetic_text
+
+from text_generator import TextSubtitleGenerator
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+FORMATS = ('srt', 'vtt', 'ass', 'json', 'txt')
+
+def bench_file_to_file(generator: TextSubtitleGenerator, text: str) -> Dict[str, Any]:
+    """Ler o texto de um arquivo e gravar a legenda em outro, bloco a bloco."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source = Path(temp_dir) / 'roteiro.txt'
+        source.write_text(text, encoding='utf-8')
+        
+        timings = {}
+        with measure(timings, 'generate'):
+            result = generator.generate_subtitles(source, 'srt', output_path=str(Path(temp_dir) / 'roteiro.srt'))
+    
+    return {**timings['generate'], 'segment_count': result['segment_count']}
+
+def run(sizes: List[int] = DEFAULT_SIZES, formats=FORMATS) -> Dict[str, Any]:
+    """Executar o benchmark para cada tamanho de texto e formato."""
+    generator = TextSubtitleGenerator()
+    results = []
+    
+    for word_count in sizes:
+        text = synthetic_text(word_count)
+        per_format = {}
+        
+        for output_format in formats:
+            timings = {}
+            with measure(timings, 'generate'):
+                result = generator.generate_subtitles(text, output_format=output_format)
+            
+            seconds = timings['generate']['seconds']
+            per_format[output_format] = {
+                **timings['generate'],
+                'words_per_second': round(word_count / seconds) if seconds else None,
+                'segment_count': result['segment_count'],
+                'output_chars': len(result['subtitles'])
+            }
+            print(f"[Bench] TextGenerator {word_count:>9,} palavras / {output_format}: {seconds:.3f}s")
+        
+        streamed = bench_file_to_file(generator, text)
+        print(f"[Bench] TextGenerator {word_count:>9,} palavras / arquivo -> srt: "
+              f"pico {streamed['peak_alloc_mb']:.2f} MB")
+        
+        results.append({
+            'words': word_count,
+            'text_chars': len(text),
+            'formats': per_format,
+            'file_to_file': streamed,
+            'max_rss_mb': max_rss_mb()
+        })
+    
+    return {'runs': results}
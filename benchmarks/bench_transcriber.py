@@ -0,0 +1,89 @@
+"""
+Torio Tools Scribe - Benchmark do WhisperTranscriber
+Fator de tempo real, memória e tempos por etapa em áudio sintético.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from common import measure, max_rss_mb, write_synthetic_wav
+from stub_model import StubWhisperModel
+
+from transcriber import WhisperTranscriber, SUBTITLE_FORMATS
+
+DEFAULT_DURATIONS = [60, 600, 3600]
+
+SETTINGS = {
+    'max_chars_per_line': 42,
+    'max_lines': 2,
+    'min_duration': 1.0,
+    'max_duration': 7.0
+}
+
+def build_transcriber(model: str = 'stub', decode_cost: float = 0.0, models_path: Optional[Path] = None) -> WhisperTranscriber:
+    """Transcritor com o modelo stub (padrão) ou um modelo real."""
+    if model == 'stub':
+        return WhisperTranscriber(model_size='stub', model=StubWhisperModel(decode_cost))
+    return WhisperTranscriber(model_size=model, models_path=models_path)
+
+def ffmpeg_available(transcriber: WhisperTranscriber) -> bool:
+    return os.path.exists(transcriber.ffmpeg_path) or shutil.which(transcriber.ffmpeg_path) is not None
+
+def bench_duration(transcriber: WhisperTranscriber, audio_path: str, seconds: float) -> Dict[str, Any]:
+    """Medir cada etapa para um arquivo de `seconds` segundos."""
+    stages = {}
+    
+    with measure(stages, 'prepare_input'):
+        audio = transcriber._prepare_input(audio_path)
+    
+    if ffmpeg_available(transcriber):
+        with measure(stages, 'extract_audio'):
+            transcriber._extract_audio(audio_path)
+    
+    options = transcriber._decode_options()
+    with measure(stages, 'decode'):
+        segments, info = transcriber._decode(audio, 'pt', options)
+        segments = list(segments)
+    
+    for output_format in SUBTITLE_FORMATS:
+        with measure(stages, f'format_{output_format}'):
+            transcriber._format_segments(segments, output_format, SETTINGS)
+    
+    with measure(stages, 'end_to_end'):
+        transcriber.transcribe(audio_path, language='pt', output_format='srt', settings=SETTINGS)
+    
+    end_to_end = stages['end_to_end']['seconds']
+    return {
+        'audio_seconds': seconds,
+        'segments': len(segments),
+        'real_time_factor': round(end_to_end / seconds, 6),
+        'stages': stages,
+        'max_rss_mb': max_rss_mb()
+    }
+
+def run(
+    durations: List[float] = DEFAULT_DURATIONS,
+    model: str = 'stub',
+    decode_cost: float = 0.0,
+    models_path: Optional[Path] = None
+) -> Dict[str, Any]:
+    """Executar o benchmark para cada duração."""
+    transcriber = build_transcriber(model, decode_cost, models_path)
+    results = []
+    
+    with tempfile.TemporaryDirectory(prefix='scribe-bench-') as temp_dir:
+        for seconds in durations:
+            audio_path = write_synthetic_wav(Path(temp_dir) / f'synthetic_{int(seconds)}s.wav', seconds)
+            result = bench_duration(transcriber, str(audio_path), seconds)
+            print(f"[Bench] Transcriber {seconds:>6.0f}s de áudio: RTF {result['real_time_factor']:.5f}")
+            results.append(result)
+            os.unlink(audio_path)
+    
+    return {
+        'model': model,
+        'decode_cost': decode_cost,
+        'runs': results
+    }
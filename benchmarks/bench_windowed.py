@@ -0,0 +1,90 @@
+"""
+Torio Tools Scribe - Benchmark da decodificação em janelas
+Pico de memória de decode_windows de 10 min a 6 h de áudio: deve ficar constante.
+
+Uso direto (sai com código 1 se o pico crescer com a duração):
+    python benchmarks/bench_windowed.py
+"""
+
+import io
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from common import measure, max_rss_mb
+from bench_transcriber import build_transcriber
+
+from windowed import PipeWindowReader, DECODE_WINDOW_SECONDS, BYTES_PER_SAMPLE
+
+SAMPLE_RATE = 16000
+
+DEFAULT_DURATIONS = [600, 3600, 6 * 3600]
+
+# Pico da maior duração / pico da menor: acima disso, a memória cresce com o arquivo
+BOUND_TOLERANCE = 1.25
+
+class SyntheticPcmStream(io.RawIOBase):
+    """PCM float32 silencioso de `seconds` segundos gerado sob demanda (como o stdout do FFmpeg)."""
+    
+    def __init__(self, seconds: float):
+        self.remaining = int(seconds * SAMPLE_RATE) * BYTES_PER_SAMPLE
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        count = min(len(buffer), self.remaining)
+        buffer[:count] = bytes(count)
+        self.remaining -= count
+        return count
+
+def bench_duration(transcriber, seconds: float, window_seconds: float) -> Dict[str, Any]:
+    """Decodificar `seconds` segundos em janelas medindo tempo e pico de alocações."""
+    stream = io.BufferedReader(SyntheticPcmStream(seconds), 1 << 20)
+    reader = PipeWindowReader(stream, int(window_seconds * SAMPLE_RATE))
+    options = transcriber._decode_options({'word_cues': False})
+    
+    timings = {}
+    with measure(timings, 'decode_windows'):
+        result = transcriber.decode_windows(reader, 'pt', options)
+    
+    return {
+        'audio_seconds': seconds,
+        'segments': len(result['segments']),
+        'full_array_mb': round(seconds * SAMPLE_RATE * BYTES_PER_SAMPLE / (1024 * 1024), 1),
+        **timings['decode_windows'],
+        'max_rss_mb': max_rss_mb()
+    }
+
+def run(
+    durations: List[float] = DEFAULT_DURATIONS,
+    window_seconds: float = DECODE_WINDOW_SECONDS,
+    model: str = 'stub',
+    decode_cost: float = 0.0,
+    models_path: Optional[Path] = None
+) -> Dict[str, Any]:
+    """Executar para cada duração e verificar se o pico ficou limitado."""
+    transcriber = build_transcriber(model, decode_cost, models_path)
+    results = []
+    
+    for seconds in durations:
+        result = bench_duration(transcriber, seconds, window_seconds)
+        print(f"[Bench] Janelas {seconds:>6.0f}s de áudio: pico {result['peak_alloc_mb']:.1f} MB "
+              f"(array completo: {result['full_array_mb']:.0f} MB)")
+        results.append(result)
+    
+    peaks = [result['peak_alloc_mb'] for result in results]
+    peak_ratio = round(max(peaks) / min(peaks), 3) if min(peaks) else None
+    bounded = peak_ratio is not None and peak_ratio <= BOUND_TOLERANCE
+    print(f"[Bench] Pico maior/menor: {peak_ratio} ({'limitado' if bounded else 'CRESCE com a duração'})")
+    
+    return {
+        'model': model,
+        'window_seconds': window_seconds,
+        'peak_ratio': peak_ratio,
+        'bounded': bounded,
+        'runs': results
+    }
+
+if __name__ == '__main__':
+    sys.exit(0 if run()['bounded'] else 1)
@@ -0,0 +1,113 @@
+"""
+Torio Tools Scribe - Benchmarks (utilitários comuns)
+Medição de tempo, memória e dados sintéticos determinísticos.
+"""
+
+import os
+import sys
+import json
+import time
+import wave
+import random
+import struct
+import platform
+import tracemalloc
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+
+ENGINE_DIR = Path(__file__).resolve().parent.parent / 'engine'
+if str(ENGINE_DIR) not in sys.path:
+    sys.path.insert(0, str(ENGINE_DIR))
+
+SAMPLE_RATE = 16000
+
+WORDS = (
+    'o a de que e do da em um para com não uma os no se na por mais as dos como mas '
+    'legenda vídeo áudio tempo texto modelo arquivo linha quadro cena roteiro '
+    'transcrição microfone gravação entrevista programa episódio conteúdo criador'
+).split()
+
+def max_rss_mb() -> float:
+    """Pico de memória residente do processo (MB), quando disponível."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KB, macOS em bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+@contextmanager
+def measure(result: Dict[str, Any], key: str) -> Iterator[None]:
+    """Medir tempo (s) e pico de alocações Python (MB) de um bloco."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result[key] = {
+            'seconds': round(elapsed, 6),
+            'peak_alloc_mb': round(peak / (1024 * 1024), 3)
+        }
+
+def synthetic_text(word_count: int, seed: int = 0) -> str:
+    """Texto determinístico com sentenças e parágrafos."""
+    rng = random.Random(seed)
+    paragraphs = []
+    sentence = []
+    paragraph = []
+    
+    for i in range(word_count):
+        sentence.append(rng.choice(WORDS))
+        if len(sentence) >= rng.randint(6, 18) or i == word_count - 1:
+            text = ' '.join(sentence)
+            paragraph.append(text[0].upper() + text[1:] + rng.choice('..!?'))
+            sentence = []
+            if len(paragraph) >= rng.randint(3, 6):
+                paragraphs.append(' '.join(paragraph))
+                paragraph = []
+    
+    if paragraph:
+        paragraphs.append(' '.join(paragraph))
+    return '\n\n'.join(paragraphs)
+
+def write_synthetic_wav(path: Path, seconds: float, seed: int = 0) -> Path:
+    """Gravar WAV mono 16 kHz 16-bit com ruído determinístico (sem numpy)."""
+    rng = random.Random(seed)
+    total = int(seconds * SAMPLE_RATE)
+    block = 4096
+    
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        # Um bloco de ruído repetido: conteúdo irrelevante para o stub
+        noise = struct.pack(f'<{block}h', *(rng.randint(-3000, 3000) for _ in range(block)))
+        written = 0
+        while written < total:
+            count = min(block, total - written)
+            wav.writeframes(noise[:count * 2])
+            written += count
+    return path
+
+def environment() -> Dict[str, Any]:
+    """Informações da máquina para comparar execuções."""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+def write_results(results: Dict[str, Any], output: Path):
+    """Gravar resultados em JSON."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"[Bench] Resultados: {output}")
@@ -0,0 +1,46 @@
+"""
+Torio Tools Scribe - Benchmarks (comparação)
+Compara dois arquivos de resultados e mostra a variação de cada medida de tempo.
+
+Uso:
+    python benchmarks/compare.py antes.json depois.json
+"""
+
+import sys
+import json
+from typing import Dict, Any, Iterator, Tuple
+
+def iter_seconds(data: Any, path: str = '') -> Iterator[Tuple[str, float]]:
+    """Percorrer o JSON devolvendo (caminho, segundos) de cada medida."""
+    if isinstance(data, dict):
+        if 'seconds' in data and isinstance(data['seconds'], (int, float)):
+            yield path, data['seconds']
+        for key, value in data.items():
+            if key == 'environment':
+                continue
+            yield from iter_seconds(value, f'{path}/{key}' if path else key)
+    elif isinstance(data, list):
+        for item in data:
+            # Identificar execuções pelo tamanho, não pela posição
+            label = item.get('audio_seconds', item.get('words')) if isinstance(item, dict) else None
+            yield from iter_seconds(item, f'{path}[{label}]')
+
+def load(path: str) -> Dict[str, float]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return dict(iter_seconds(json.load(f)))
+
+def main(argv=None) -> int:
+    argv = argv if argv is not None else sys.argv[1:]
+    if len(argv) != 2:
+        print(__doc__)
+        return 2
+    
+    before, after = load(argv[0]), load(argv[1])
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key], after[key]
+        change = ((new - old) / old * 100) if old else 0.0
+        print(f"{key:<70} {old:>10.4f}s {new:>10.4f}s {change:>+8.1f}%")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
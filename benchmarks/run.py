@@ -0,0 +1,63 @@
+"""
+Torio Tools Scribe - Benchmarks
+Executa a suíte offline e grava os resultados em JSON para comparação.
+
+Uso:
+    python benchmarks/run.py                     # tudo, modelo stub
+    python benchmarks/run.py --quick             # tamanhos reduzidos
+    python benchmarks/run.py --suite text        # só o gerador de texto
+    python benchmarks/run.py --suite windowed    # memória da decodificação em janelas
+    python benchmarks/run.py --model base        # modelo real (precisa dos pesos)
+    python benchmarks/compare.py antes.json depois.json
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+from common import environment, write_results
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmarks do Torio Scribe Engine')
+    parser.add_argument('--suite', choices=['all', 'transcriber', 'text', 'windowed'], default='all')
+    parser.add_argument('--quick', action='store_true', help='Tamanhos reduzidos (execução rápida)')
+    parser.add_argument('--model', default='stub', help="'stub' (padrão, sem pesos) ou tamanho do modelo real")
+    parser.add_argument('--models-path', type=Path, default=None, help='Pasta de modelos (modelo real)')
+    parser.add_argument('--decode-cost', type=float, default=0.0, help='Custo simulado do stub (s de CPU por s de áudio)')
+    parser.add_argument('--output', type=Path, default=None, help='Arquivo JSON de saída')
+    args = parser.parse_args(argv)
+    
+    results = {
+        'environment': environment(),
+        'suites': {}
+    }
+    
+    if args.suite in ('all', 'transcriber'):
+        import bench_transcriber
+        durations = [30, 300] if args.quick else bench_transcriber.DEFAULT_DURATIONS
+        results['suites']['transcriber'] = bench_transcriber.run(
+            durations, args.model, args.decode_cost, args.models_path
+        )
+    
+    if args.suite in ('all', 'text'):
+        import bench_text_generator
+        sizes = [1_000, 10_000, 100_000] if args.quick else bench_text_generator.DEFAULT_SIZES
+        results['suites']['text_generator'] = bench_text_generator.run(sizes)
+    
+    if args.suite in ('all', 'windowed'):
+        import bench_windowed
+        durations = [300, 1800] if args.quick else bench_windowed.DEFAULT_DURATIONS
+        window_seconds = 120.0 if args.quick else bench_windowed.DECODE_WINDOW_SECONDS
+        results['suites']['windowed'] = bench_windowed.run(
+            durations, window_seconds, args.model, args.decode_cost, args.models_path
+        )
+    
+    output = args.output or RESULTS_DIR / f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    write_results(results, output)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Torio Tools Scribe - Benchmarks (modelo stub)
+Substituto do WhisperModel sem rede nem pesos: gera segmentos determinísticos.
+"""
+
+import time
+import wave
+from types import SimpleNamespace
+from typing import Optional, Iterator, Tuple
+
+SAMPLE_RATE = 16000
+
+SEGMENT_SECONDS = 3.0  # Duração de cada segmento gerado
+WORD_SECONDS = 0.4     # Duração de cada palavra gerada
+
+STUB_WORDS = 'isto é uma legenda sintética gerada pelo modelo de teste do benchmark'.split()
+
+def _audio_duration(audio) -> float:
+    """Duração do áudio (array 16 kHz ou caminho de WAV)."""
+    if isinstance(audio, str):
+        with wave.open(audio, 'rb') as wav:
+            return wav.getnframes() / wav.getframerate()
+    return len(audio) / SAMPLE_RATE
+
+class StubWhisperModel:
+    """Mesma interface usada pelo WhisperTranscriber (transcribe/detect_language)."""
+    
+    def __init__(self, decode_cost: float = 0.0):
+        """
+        Args:
+            decode_cost: Segundos de CPU simulados por segundo de áudio (0 = instantâneo)
+        """
+        self.decode_cost = decode_cost
+    
+    def transcribe(self, audio, language: Optional[str] = None, word_timestamps: bool = False, **options) -> Tuple[Iterator, SimpleNamespace]:
+        duration = _audio_duration(audio)
+        info = SimpleNamespace(
+            language=language or 'pt',
+            language_probability=1.0,
+            duration=duration,
+            duration_after_vad=duration
+        )
+        return self._segments(duration, word_timestamps), info
+    
+    def detect_language(self, audio=None, **options):
+        return 'pt', 1.0, [('pt', 1.0)]
+    
+    def _segments(self, duration: float, word_timestamps: bool) -> Iterator[SimpleNamespace]:
+        start = 0.0
+        index = 0
+        while start < duration:
+            end = min(start + SEGMENT_SECONDS, duration)
+            if self.decode_cost:
+                _busy_wait((end - start) * self.decode_cost)
+            
+            words = []
+            t = start
+            i = 0
+            while t + WORD_SECONDS <= end:
+                words.append(SimpleNamespace(
+                    start=round(t, 3),
+                    end=round(t + WORD_SECONDS, 3),
+                    word=' ' + STUB_WORDS[(index + i) % len(STUB_WORDS)],
+                    probability=0.9
+                ))
+                t += WORD_SECONDS
+                i += 1
+            
+            yield SimpleNamespace(
+                id=index + 1,
+                start=round(start, 3),
+                end=round(end, 3),
+                text=''.join(word.word for word in words) or ' ...',
+                avg_logprob=-0.3,
+                no_speech_prob=0.01,
+                compression_ratio=1.4,
+                words=words if word_timestamps else None
+            )
+            index += 1
+            start = end
+
+def _busy_wait(seconds: float):
+    """Ocupar a CPU (simula custo de inferência sem dormir)."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
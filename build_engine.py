@@ -42,6 +42,23 @@ def main():
         # Arquivos necessários
         "--add-data", f"{engine_dir / 'transcriber.py'};.",
         "--add-data", f"{engine_dir / 'text_generator.py'};.",
+        "--add-data", f"{engine_dir / 'config.py'};.",
+        "--add-data", f"{engine_dir / 'segments.py'};.",
+        "--add-data", f"{engine_dir / 'transcription_cache.py'};.",
+        "--add-data", f"{engine_dir / 'jobs.py'};.",
+        "--add-data", f"{engine_dir / 'parallel.py'};.",
+        "--add-data", f"{engine_dir / 'model_registry.py'};.",
+        "--add-data", f"{engine_dir / 'autotune.py'};.",
+        "--add-data", f"{engine_dir / 'metrics.py'};.",
+        "--add-data", f"{engine_dir / 'profiling.py'};.",
+        "--add-data", f"{engine_dir / 'audio_cache.py'};.",
+        "--add-data", f"{engine_dir / 'output_writer.py'};.",
+        "--add-data", f"{engine_dir / 'cli.py'};.",
+        "--add-data", f"{engine_dir / 'watcher.py'};.",
+        "--add-data", f"{engine_dir / 'language_detection.py'};.",
+        "--add-data", f"{engine_dir / 'refinement.py'};.",
+        "--add-data", f"{engine_dir / 'alignment.py'};.",
+        "--add-data", f"{engine_dir / 'windowed.py'};.",
         # Hidden imports ESSENCIAIS
         "--hidden-import", "flask",
         "--hidden-import", "flask_cors", 
@@ -0,0 +1,87 @@
+"""
+Torio Tools Scribe - Script Alignment
+Alinhamento de um roteiro conhecido às palavras reconhecidas (com tempos) no áudio.
+
+As palavras do roteiro são casadas com as reconhecidas (difflib); as que o
+modelo errou ou não ouviu herdam o tempo do trecho correspondente, ou são
+interpoladas entre as vizinhas já casadas, proporcionalmente ao tamanho.
+"""
+
+import re
+from difflib import SequenceMatcher
+from typing import Optional, Dict, Any, List, Tuple
+
+ALIGN_BEAM_SIZE = 1  # Só os tempos importam: busca gulosa basta
+
+_NON_WORD = re.compile(r'[^\w]+')
+
+def normalize_token(token: str) -> str:
+    """Palavra comparável: minúsculas e sem pontuação."""
+    return _NON_WORD.sub('', token.lower())
+
+def _spread(
+    tokens: List[str],
+    times: List[Optional[Tuple[float, float]]],
+    first: int,
+    last: int,
+    start: float,
+    end: float
+):
+    """Distribuir [start, end] entre tokens[first:last], proporcional ao número de caracteres."""
+    weights = [max(1, len(tokens[i])) for i in range(first, last)]
+    total = sum(weights)
+    position = start
+    for offset, weight in enumerate(weights):
+        length = (end - start) * weight / total
+        times[first + offset] = (position, position + length)
+        position += length
+
+def align_tokens(
+    script_tokens: List[str],
+    words: List[Dict[str, Any]]
+) -> Tuple[List[Tuple[float, float]], int]:
+    """
+    Tempo (início, fim) de cada palavra do roteiro.
+
+    Args:
+        script_tokens: Palavras do roteiro, na ordem
+        words: Palavras reconhecidas (start, end, word), na ordem
+
+    Returns:
+        Tupla (tempos por palavra do roteiro, palavras casadas exatamente)
+    """
+    if not words:
+        raise ValueError("Nenhuma fala reconhecida para alinhar o roteiro")
+
+    script = [normalize_token(token) for token in script_tokens]
+    heard = [normalize_token(word['word']) for word in words]
+    times: List[Optional[Tuple[float, float]]] = [None] * len(script)
+    matched = 0
+
+    matcher = SequenceMatcher(None, script, heard, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for offset in range(i2 - i1):
+                word = words[j1 + offset]
+                times[i1 + offset] = (word['start'], word['end'])
+            matched += i2 - i1
+        elif tag == 'replace':
+            # Modelo ouviu outras palavras no mesmo lugar: usar o tempo delas
+            _spread(script, times, i1, i2, words[j1]['start'], words[j2 - 1]['end'])
+        # 'delete' (roteiro não ouvido) fica para a interpolação; 'insert' (fala fora do roteiro) é ignorado
+
+    # Interpolar lacunas entre vizinhas com tempo
+    index = 0
+    while index < len(times):
+        if times[index] is not None:
+            index += 1
+            continue
+        gap_end = index
+        while gap_end < len(times) and times[gap_end] is None:
+            gap_end += 1
+        start = times[index - 1][1] if index > 0 else words[0]['start']
+        end = times[gap_end][0] if gap_end < len(times) else max(start, words[-1]['end'])
+        _spread(script, times, index, gap_end, start, max(start, end))
+        index = gap_end
+
+    return times, matched
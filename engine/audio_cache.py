@@ -0,0 +1,156 @@
+"""
+Torio Tools Scribe - Audio Cache
+Cache em disco do áudio decodificado (mono, 16 kHz, float32), lido via mmap.
+
+Retranscrever o mesmo vídeo (outro idioma, outras opções) pula o FFmpeg:
+o PCM cru é mapeado direto do disco.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+import numpy as np
+
+import metrics
+
+SAMPLE_RATE = 16000
+
+class AudioCache:
+    """Cache LRU em disco de PCM float32, limitado por tamanho."""
+    
+    def __init__(self, cache_dir: Path, max_bytes: int = 2048 * 1024 * 1024):
+        """
+        Inicializar cache.
+        
+        Args:
+            cache_dir: Pasta onde os arquivos .f32 são gravados
+            max_bytes: Tamanho máximo em disco (os menos usados são removidos)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._remove_orphans()
+    
+    def make_key(self, file_path: str) -> str:
+        """Chave pelo caminho, tamanho e mtime da mídia de origem."""
+        stat = os.stat(file_path)
+        payload = json.dumps({
+            'path': os.path.abspath(file_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sample_rate': SAMPLE_RATE
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.f32'
+    
+    def get(self, file_path: str) -> Optional[np.ndarray]:
+        """
+        Buscar áudio decodificado.
+        
+        Returns:
+            Array somente leitura mapeado do disco, ou None
+        """
+        path = self._entry_path(self.make_key(file_path))
+        
+        with self._lock:
+            if not path.exists():
+                self.misses += 1
+                metrics.record_cache('audio', hit=False)
+                return None
+            
+            try:
+                if path.stat().st_size == 0:
+                    audio = np.zeros(0, dtype=np.float32)
+                else:
+                    audio = np.memmap(path, dtype=np.float32, mode='r')
+                # Marcar como usado recentemente (LRU pelo mtime)
+                os.utime(path, None)
+            except (OSError, ValueError) as e:
+                print(f"[AudioCache] Registro ilegível, removendo: {path.name} ({e})")
+                self._unlink(path)
+                self.misses += 1
+                metrics.record_cache('audio', hit=False)
+                return None
+            
+            self.hits += 1
+            metrics.record_cache('audio', hit=True)
+        
+        return audio
+    
+    def put(self, file_path: str, audio: np.ndarray):
+        """Gravar áudio decodificado (escrita atômica) e aplicar o limite de tamanho."""
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        if audio.nbytes > self.max_bytes:
+            return
+        
+        path = self._entry_path(self.make_key(file_path))
+        temp_path = path.with_name(path.name + '.tmp')
+        
+        with self._lock:
+            try:
+                with open(temp_path, 'wb') as f:
+                    audio.tofile(f)
+                os.replace(temp_path, path)
+            except OSError as e:
+                print(f"[AudioCache] Erro ao gravar registro: {e}")
+                self._unlink(temp_path)
+                return
+            
+            self._evict()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas do cache."""
+        sizes = []
+        for entry in self.cache_dir.glob('*.f32'):
+            try:
+                sizes.append(entry.stat().st_size)
+            except OSError:
+                continue
+        return {
+            'entries': len(sizes),
+            'bytes': sum(sizes),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+    
+    def _evict(self):
+        """Remover registros menos usados até caber no limite."""
+        entries = []
+        for entry in self.cache_dir.glob('*.f32'):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            if self._unlink(entry):
+                total -= size
+                print(f"[AudioCache] Removido (LRU): {entry.name}")
+    
+    def _unlink(self, path: Path) -> bool:
+        # No Windows, arquivos ainda mapeados por uma transcrição não podem ser apagados
+        try:
+            path.unlink(missing_ok=True)
+            return True
+        except OSError:
+            return False
+    
+    def _remove_orphans(self):
+        """Apagar arquivos temporários deixados por gravações interrompidas."""
+        for orphan in self.cache_dir.glob('*.tmp'):
+            self._unlink(orphan)
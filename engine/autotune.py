@@ -0,0 +1,258 @@
+"""
+Torio Tools Scribe - Compute Auto-Tuning
+Calibra compute_type e cpu_threads por máquina e modelo na primeira execução.
+"""
+
+import os
+import json
+import time
+import hashlib
+import platform
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+CLIP_SECONDS = 10  # Duração do clipe de calibração
+ENCODER_FRAMES = 3000  # Um bloco de 30 s do Whisper (entrada fixa do encoder)
+TIMED_RUNS = 3  # Passadas medidas por combinação (vale a mais rápida)
+
+# Tipos testados (apenas os suportados pela CPU entram na calibração)
+CANDIDATE_COMPUTE_TYPES = ('int8', 'int8_float32', 'float32')
+
+CPU_FEATURE_FLAGS = ('avx', 'avx2', 'fma', 'f16c', 'avx512f', 'avx512bw', 'avx512_vnni', 'avx_vnni', 'amx_int8')
+
+def detect_cpu_features() -> List[str]:
+    """Detectar extensões relevantes da CPU (Linux via /proc/cpuinfo)."""
+    cpuinfo = Path('/proc/cpuinfo')
+    if cpuinfo.exists():
+        try:
+            for line in cpuinfo.read_text(errors='ignore').splitlines():
+                if line.startswith('flags'):
+                    flags = set(line.split(':', 1)[1].split())
+                    return [flag for flag in CPU_FEATURE_FLAGS if flag in flags]
+        except OSError:
+            pass
+    return []
+
+def cpu_fingerprint() -> Dict[str, Any]:
+    """Identificação da máquina usada como chave da calibração."""
+    return {
+        'processor': platform.processor() or platform.machine(),
+        'system': platform.system(),
+        'cpu_count': os.cpu_count() or 1,
+        'features': detect_cpu_features()
+    }
+
+def fingerprint_key(fingerprint: Dict[str, Any]) -> str:
+    payload = json.dumps(fingerprint, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def thread_candidates(cpu_count: int) -> List[int]:
+    """Quantidades de threads testadas (um quarto, metade e todos os núcleos lógicos)."""
+    return sorted({max(1, cpu_count // 4), max(1, cpu_count // 2), cpu_count})
+
+def calibration_clip() -> np.ndarray:
+    """
+    Sinal sintético determinístico para a calibração (gerado em memória).
+    
+    Só o encoder é medido, e o custo dele não depende do conteúdo do áudio.
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(CLIP_SECONDS * SAMPLE_RATE, dtype=np.float32) / SAMPLE_RATE
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 2 * t) > 0)
+    noise = 0.05 * rng.standard_normal(t.shape).astype(np.float32)
+    return (tone + noise).astype(np.float32)
+
+class ComputeTuner:
+    """Escolhe (compute_type, cpu_threads) mais rápido por máquina e modelo."""
+    
+    def __init__(
+        self,
+        calibration_file: Path,
+        compute_type_override: Optional[str] = None,
+        cpu_threads_override: int = 0,
+        enabled: bool = True
+    ):
+        """
+        Inicializar tuner.
+        
+        Args:
+            calibration_file: JSON onde os resultados são persistidos
+            compute_type_override: compute_type fixo da configuração ('auto' = calibrar)
+            cpu_threads_override: cpu_threads fixo da configuração (0 = calibrar)
+            enabled: Desligado, usa int8 e o padrão de threads do CTranslate2
+        """
+        self.calibration_file = Path(calibration_file)
+        self.compute_type_override = None if compute_type_override in (None, '', 'auto') else compute_type_override
+        self.cpu_threads_override = cpu_threads_override or 0
+        self.enabled = enabled
+        self.fingerprint = cpu_fingerprint()
+        self.machine_key = fingerprint_key(self.fingerprint)
+        # _lock só protege _results; a calibração roda sob o lock do modelo
+        self._lock = threading.Lock()
+        self._calibration_locks: Dict[str, threading.Lock] = {}
+        self._results = self._load()
+    
+    def _load(self) -> Dict[str, Any]:
+        if not self.calibration_file.exists():
+            return {}
+        try:
+            with open(self.calibration_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data.get(self.machine_key, {}).get('models', {})
+        except (OSError, ValueError) as e:
+            print(f"[AutoTune] Erro ao ler calibração: {e}")
+            return {}
+    
+    def _save(self):
+        data = {}
+        if self.calibration_file.exists():
+            try:
+                with open(self.calibration_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+        
+        data[self.machine_key] = {
+            'fingerprint': self.fingerprint,
+            'models': self._results
+        }
+        
+        self.calibration_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.calibration_file.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, self.calibration_file)
+    
+    def needs_calibration(self, model_size: str) -> bool:
+        """A calibração ainda vai rodar para este modelo?"""
+        if not self.enabled:
+            return False
+        if self.compute_type_override and self.cpu_threads_override:
+            return False
+        with self._lock:
+            return model_size not in self._results
+    
+    def resolve(self, model_size: str, model_path: str) -> Tuple[str, int]:
+        """
+        Obter (compute_type, cpu_threads) para o modelo, calibrando se necessário.
+        
+        Overrides da configuração sempre têm prioridade. A calibração de um
+        modelo só bloqueia quem pede o mesmo modelo; os demais seguem.
+        """
+        if not self.enabled:
+            return self.compute_type_override or 'int8', self.cpu_threads_override
+        
+        with self._lock:
+            calibration_lock = self._calibration_locks.setdefault(model_size, threading.Lock())
+        
+        with calibration_lock:
+            if self.needs_calibration(model_size):
+                result = self._calibrate(model_path)
+                with self._lock:
+                    self._results[model_size] = result
+                    try:
+                        self._save()
+                    except OSError as e:
+                        print(f"[AutoTune] Erro ao salvar calibração: {e}")
+        
+        with self._lock:
+            best = self._results.get(model_size, {})
+        
+        compute_type = self.compute_type_override or best.get('compute_type', 'int8')
+        cpu_threads = self.cpu_threads_override or best.get('cpu_threads', 0)
+        return compute_type, cpu_threads
+    
+    def _candidate_compute_types(self) -> List[str]:
+        if self.compute_type_override:
+            return [self.compute_type_override]
+        
+        import ctranslate2
+        supported = ctranslate2.get_supported_compute_types('cpu')
+        return [compute_type for compute_type in CANDIDATE_COMPUTE_TYPES if compute_type in supported]
+    
+    def _calibrate(self, model_path: str) -> Dict[str, Any]:
+        """
+        Medir cada combinação e escolher a mais rápida.
+        
+        A carga é fixa: o encoder sobre um bloco de 30 s. Decodificar texto
+        mediria quantidades diferentes de tokens (alucinados, no sinal
+        sintético) em cada compute_type, e os tempos não seriam comparáveis.
+        """
+        from faster_whisper import WhisperModel
+        from faster_whisper.audio import pad_or_trim
+        
+        clip = calibration_clip()
+        threads = [self.cpu_threads_override] if self.cpu_threads_override else thread_candidates(self.fingerprint['cpu_count'])
+        compute_types = self._candidate_compute_types()
+        
+        print(f"[AutoTune] Calibrando {model_path}: {compute_types} x threads {threads} "
+              f"(CPU: {', '.join(self.fingerprint['features']) or 'sem flags detectadas'})")
+        
+        measurements = []
+        for compute_type in compute_types:
+            for cpu_threads in threads:
+                try:
+                    model = WhisperModel(model_path, device='cpu', compute_type=compute_type, cpu_threads=cpu_threads)
+                    features = pad_or_trim(model.feature_extractor(clip), ENCODER_FRAMES)
+                    # Primeira passada aquece; das seguintes vale a mais rápida
+                    model.encode(features)
+                    timings = []
+                    for attempt in range(TIMED_RUNS):
+                        started = time.perf_counter()
+                        model.encode(features)
+                        timings.append(time.perf_counter() - started)
+                    elapsed = min(timings)
+                    del model
+                except Exception as e:
+                    print(f"[AutoTune] {compute_type}/{cpu_threads} falhou: {e}")
+                    continue
+                
+                print(f"[AutoTune] {compute_type}/{cpu_threads} threads: {elapsed:.3f}s")
+                measurements.append({
+                    'compute_type': compute_type,
+                    'cpu_threads': cpu_threads,
+                    'seconds': round(elapsed, 4)
+                })
+        
+        if not measurements:
+            return {'compute_type': 'int8', 'cpu_threads': 0, 'measurements': [], 'calibrated_at': time.time()}
+        
+        best = min(measurements, key=lambda item: item['seconds'])
+        print(f"[AutoTune] Melhor configuração: {best['compute_type']} com {best['cpu_threads']} threads")
+        
+        return {
+            'compute_type': best['compute_type'],
+            'cpu_threads': best['cpu_threads'],
+            'measurements': measurements,
+            'clip_seconds': round(len(clip) / SAMPLE_RATE, 2),
+            'workload': 'encoder',
+            'calibrated_at': time.time()
+        }
+    
+    def status(self) -> Dict[str, Any]:
+        """Resumo para o /status."""
+        with self._lock:
+            results = dict(self._results)
+        
+        return {
+            'enabled': self.enabled,
+            'machine': self.machine_key,
+            'cpu': self.fingerprint,
+            'overrides': {
+                'compute_type': self.compute_type_override,
+                'cpu_threads': self.cpu_threads_override or None
+            },
+            'models': {
+                model_size: {
+                    'compute_type': result.get('compute_type'),
+                    'cpu_threads': result.get('cpu_threads'),
+                    'calibrated_at': result.get('calibrated_at')
+                }
+                for model_size, result in results.items()
+            }
+        }
@@ -0,0 +1,502 @@
+"""
+Torio Tools Scribe - CLI
+Transcrição sem servidor: `scribe batch arquivos... --output-dir legendas/`,
+`scribe watch pastas...` (monitoramento contínuo) e `scribe live gravação`
+(legendas de uma gravação ainda em andamento).
+
+O pipeline mantém a CPU ocupada: o FFmpeg extrai os próximos arquivos em
+paralelo enquanto o modelo decodifica o atual, e a formatação/gravação
+roda em outra thread.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import threading
+from collections import deque
+from contextlib import nullcontext, redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+from config import load_config, get_cache_path, get_models_path
+from autotune import ComputeTuner
+from model_registry import ModelRegistry
+from transcriber import WhisperTranscriber, SUBTITLE_FORMATS
+from watcher import FolderWatcher, WatchLedger, subtitle_path
+from windowed import DEFAULT_TAIL_LATENCY, TAIL_IDLE_SECONDS
+
+STATE_FILE_NAME = '.scribe-batch-state.json'
+SUMMARY_FILE_NAME = 'scribe-batch-summary.json'
+
+GLOB_CHARS = ('*', '?', '[')
+
+def collect_inputs(patterns: List[str], manifest: Optional[str] = None) -> List[str]:
+    """
+    Expandir arquivos, globs (com ** recursivo) e manifesto em caminhos absolutos.
+    
+    O manifesto é uma lista JSON ou um texto com um caminho por linha
+    (linhas vazias e iniciadas por # são ignoradas). A ordem é preservada
+    e duplicatas são removidas.
+    """
+    entries = list(patterns)
+    
+    if manifest:
+        with open(manifest, 'r', encoding='utf-8') as f:
+            content = f.read()
+        try:
+            listed = json.loads(content)
+        except ValueError:
+            listed = [line.strip() for line in content.splitlines()]
+        base_dir = os.path.dirname(os.path.abspath(manifest))
+        entries.extend(
+            os.path.join(base_dir, entry)
+            for entry in listed
+            if entry and not entry.startswith('#')
+        )
+    
+    files = []
+    for entry in entries:
+        if any(char in entry for char in GLOB_CHARS):
+            files.extend(sorted(glob.glob(entry, recursive=True)))
+        else:
+            files.append(entry)
+    
+    return list(dict.fromkeys(os.path.abspath(path) for path in files if os.path.isfile(path)))
+
+def common_root(files: List[str]) -> Optional[str]:
+    """
+    Pasta comum das entradas (espelhada dentro de --output-dir).
+    
+    Entradas em drives diferentes (C:\\ e D:\\) não têm pasta comum: None
+    grava todas direto em --output-dir.
+    """
+    try:
+        return os.path.commonpath([os.path.dirname(path) for path in files])
+    except ValueError as e:
+        print(f"[Batch] Entradas sem pasta comum ({e}): legendas direto na pasta de saída")
+        return None
+
+def source_signature(path: str) -> Dict[str, int]:
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+class BatchState:
+    """Arquivo de estado para retomar um lote interrompido."""
+    
+    def __init__(self, state_path: Path):
+        self.state_path = Path(state_path)
+        self._lock = threading.Lock()
+        self.files: Dict[str, Dict[str, Any]] = {}
+        
+        if self.state_path.exists():
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self.files = json.load(f).get('files', {})
+            except (OSError, ValueError) as e:
+                print(f"[Batch] Estado ilegível, começando do zero: {e}")
+    
+    def is_done(self, path: str) -> bool:
+        """Já concluído, com a mesma origem e as saídas ainda no disco?"""
+        entry = self.files.get(path)
+        if not entry or entry.get('status') != 'completed':
+            return False
+        try:
+            if entry.get('source') != source_signature(path):
+                return False
+        except OSError:
+            return False
+        return all(os.path.exists(output['path']) for output in entry.get('outputs', {}).values())
+    
+    def record(self, path: str, entry: Dict[str, Any]):
+        """Registrar resultado de um arquivo e persistir (escrita atômica)."""
+        with self._lock:
+            self.files[path] = entry
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'files': self.files}, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.state_path)
+
+class BatchPipeline:
+    """Extração, decodificação e gravação sobrepostas em três estágios."""
+    
+    def __init__(
+        self,
+        transcriber: WhisperTranscriber,
+        state: BatchState,
+        output_dir: Optional[Path],
+        formats: List[str],
+        language: str = 'pt',
+        settings: Optional[Dict[str, Any]] = None,
+        prefetch: int = 2,
+        writers: int = 2,
+        input_root: Optional[str] = None
+    ):
+        """
+        Inicializar pipeline.
+        
+        Args:
+            transcriber: Transcritor já carregado
+            state: Estado para retomar o lote
+            output_dir: Pasta das legendas (None = ao lado de cada arquivo)
+            formats: Formatos gravados por arquivo
+            language: Código do idioma ou 'auto'
+            settings: Configurações de legenda e decodificação
+            prefetch: Arquivos extraídos à frente da decodificação (memória: um áudio cada)
+            writers: Threads de formatação/gravação
+            input_root: Pasta comum das entradas, espelhada dentro de output_dir
+        """
+        self.transcriber = transcriber
+        self.state = state
+        self.output_dir = output_dir
+        self.formats = formats
+        self.language = language
+        self.settings = settings or {}
+        self.prefetch = max(1, prefetch)
+        self.writers = max(1, writers)
+        self.input_root = input_root
+    
+    def _output_base(self, path: str) -> str:
+        return subtitle_path(path, self.formats[0], self.output_dir, self.input_root)
+    
+    def _extract(self, path: str) -> Tuple[Any, float]:
+        """Estágio 1 (pool de extração): mídia -> array."""
+        started = time.perf_counter()
+        audio = self.transcriber.load_audio(path)
+        return audio, time.perf_counter() - started
+    
+    def _write(self, path: str, entry: Dict[str, Any], segments: List) -> Dict[str, Any]:
+        """Estágio 3 (pool de gravação): formatar, gravar e registrar no estado."""
+        started = time.perf_counter()
+        try:
+            entry['outputs'] = self.transcriber.write_outputs(
+                segments, self.formats, self.settings, self._output_base(path)
+            )
+            entry['status'] = 'completed'
+        except Exception as e:
+            entry['status'] = 'failed'
+            entry['error'] = str(e)
+        entry['format_seconds'] = round(time.perf_counter() - started, 3)
+        self.state.record(path, entry)
+        return entry
+    
+    def run(self, files: List[str]) -> List[Dict[str, Any]]:
+        """Processar arquivos; devolve um registro por arquivo."""
+        extract_pool = ThreadPoolExecutor(max_workers=self.prefetch, thread_name_prefix='scribe-extract')
+        write_pool = ThreadPoolExecutor(max_workers=self.writers, thread_name_prefix='scribe-write')
+        
+        pending = iter(files)
+        extracting = deque()
+        writing = []
+        
+        def submit_next():
+            path = next(pending, None)
+            if path is not None:
+                extracting.append((path, extract_pool.submit(self._extract, path)))
+        
+        try:
+            for _ in range(self.prefetch):
+                submit_next()
+            
+            position = 0
+            while extracting:
+                path, extraction = extracting.popleft()
+                # Repor a fila: o próximo arquivo extrai enquanto este decodifica
+                submit_next()
+                position += 1
+                
+                entry = {'path': path, 'status': 'failed'}
+                try:
+                    # Arquivo apagado ou ilegível depois de listado: falha só dele
+                    entry['source'] = source_signature(path)
+                    audio, extract_seconds = extraction.result()
+                    entry['extract_seconds'] = round(extract_seconds, 3)
+                    
+                    started = time.perf_counter()
+                    result = self.transcriber.decode_audio(
+                        audio, self.language, self.settings, output_format=self.formats
+                    )
+                    decode_seconds = time.perf_counter() - started
+                    del audio
+                except Exception as e:
+                    entry['error'] = str(e)
+                    print(f"[Batch] ({position}/{len(files)}) {path}: erro: {e}")
+                    self.state.record(path, entry)
+                    continue
+                
+                duration = result['duration'] or 0
+                entry.update({
+                    'duration': round(duration, 3),
+                    'language': result['language'],
+                    'decode_seconds': round(decode_seconds, 3),
+                    'rtf': round(decode_seconds / duration, 4) if duration else None
+                })
+                print(f"[Batch] ({position}/{len(files)}) {Path(path).name}: "
+                      f"{duration:.1f}s de áudio, decodificado em {decode_seconds:.1f}s (RTF {entry['rtf']})")
+                
+                writing.append(write_pool.submit(self._write, path, entry, result['segments']))
+            
+            for future in writing:
+                future.result()
+        finally:
+            extract_pool.shutdown(wait=True, cancel_futures=True)
+            write_pool.shutdown(wait=True)
+        
+        # Inclui os arquivos que falharam antes da gravação
+        return [self.state.files[path] for path in files if path in self.state.files]
+
+def build_transcriber(
+    config: Dict[str, Any],
+    model: str,
+    compute_type: Optional[str],
+    num_workers: int = 1
+) -> WhisperTranscriber:
+    """Carregar o modelo com a mesma calibração usada pelo servidor."""
+    tuner = ComputeTuner(
+        get_cache_path() / 'calibration.json',
+        compute_type_override=config['compute_type'],
+        cpu_threads_override=config['cpu_threads'],
+        enabled=config['auto_tune']
+    )
+    registry = ModelRegistry(
+        models_path=get_models_path(),
+        max_loaded=1,
+        memory_budget_mb=config['model_memory_budget_mb'],
+        default_compute_type=config['compute_type'],
+        transcriber_options={'num_workers': num_workers, 'audio_backend': config['audio_backend']},
+        tuner=tuner
+    )
+    return registry.get(model, compute_type)
+
+def write_summary(summary_path: Path, summary: Dict[str, Any]):
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+def parse_formats(value: str) -> List[str]:
+    """'srt,txt' -> ['srt', 'txt'] (vazio se algum formato não existe)."""
+    formats = [fmt.strip() for fmt in value.split(',') if fmt.strip()]
+    if any(fmt not in SUBTITLE_FORMATS for fmt in formats):
+        return []
+    return formats
+
+def decode_settings(args: argparse.Namespace) -> Dict[str, Any]:
+    """Configurações de legenda e decodificação vindas dos argumentos."""
+    return {
+        'max_chars_per_line': args.max_chars_per_line,
+        'max_lines': args.max_lines,
+        'batched': args.batched,
+        'batch_size': args.batch_size,
+        'beam_size': args.beam_size,
+        'word_cues': not args.segment_cues
+    }
+
+def run_batch(args: argparse.Namespace) -> int:
+    """Comando `batch`."""
+    config = load_config()
+    files = collect_inputs(args.inputs, args.manifest)
+    if not files:
+        print("[Batch] Nenhum arquivo encontrado")
+        return 2
+    
+    formats = parse_formats(args.format)
+    if not formats:
+        print(f"[Batch] Formato inválido: {args.format}")
+        return 2
+    
+    output_dir = Path(args.output_dir).resolve() if args.output_dir else None
+    state_dir = output_dir or Path.cwd()
+    state = BatchState(Path(args.state) if args.state else state_dir / STATE_FILE_NAME)
+    
+    pending = [path for path in files if not state.is_done(path)]
+    skipped = len(files) - len(pending)
+    print(f"[Batch] {len(files)} arquivos ({skipped} já concluídos, {len(pending)} a processar)")
+    
+    started = time.time()
+    entries = []
+    if pending:
+        transcriber = build_transcriber(config, args.model or config['default_model'], args.compute_type)
+        pipeline = BatchPipeline(
+            transcriber,
+            state,
+            output_dir,
+            formats,
+            language=args.language,
+            settings=decode_settings(args),
+            prefetch=args.prefetch,
+            writers=args.writers,
+            input_root=common_root(files)
+        )
+        entries = pipeline.run(pending)
+    
+    elapsed = time.time() - started
+    completed = [entry for entry in entries if entry.get('status') == 'completed']
+    failed = [entry for entry in entries if entry.get('status') != 'completed']
+    audio_seconds = sum(entry.get('duration') or 0 for entry in completed)
+    decode_seconds = sum(entry.get('decode_seconds') or 0 for entry in completed)
+    
+    summary = {
+        'started_at': started,
+        'finished_at': time.time(),
+        'elapsed_seconds': round(elapsed, 3),
+        'totals': {
+            'files': len(files),
+            'completed': len(completed),
+            'failed': len(failed),
+            'skipped': skipped,
+            'audio_seconds': round(audio_seconds, 3),
+            'decode_rtf': round(decode_seconds / audio_seconds, 4) if audio_seconds else None,
+            'wall_rtf': round(elapsed / audio_seconds, 4) if audio_seconds else None
+        },
+        'files': entries
+    }
+    
+    summary_path = Path(args.summary) if args.summary else state_dir / SUMMARY_FILE_NAME
+    write_summary(summary_path, summary)
+    print(f"[Batch] Concluído em {elapsed:.1f}s: {len(completed)} ok, {len(failed)} com erro, "
+          f"{skipped} pulados. Resumo: {summary_path}")
+    
+    return 1 if failed else 0
+
+def run_watch(args: argparse.Namespace) -> int:
+    """Comando `watch`."""
+    config = load_config()
+    folders = [folder for folder in args.folders if os.path.isdir(folder)]
+    if len(folders) != len(args.folders):
+        missing = set(args.folders) - set(folders)
+        print(f"[Watch] Pasta não encontrada: {', '.join(sorted(missing))}")
+        return 2
+    
+    formats = parse_formats(args.format)
+    if not formats:
+        print(f"[Watch] Formato inválido: {args.format}")
+        return 2
+    
+    transcriber = build_transcriber(
+        config, args.model or config['default_model'], args.compute_type, num_workers=args.concurrency
+    )
+    watcher = FolderWatcher(
+        transcriber,
+        folders,
+        WatchLedger(Path(args.state) if args.state else get_cache_path() / 'watch-state.json'),
+        formats,
+        language=args.language,
+        settings=decode_settings(args),
+        concurrency=args.concurrency,
+        stable_seconds=args.stable_seconds,
+        poll_interval=args.poll_interval,
+        recursive=not args.no_recursive
+    )
+    watcher.run()
+    return 0
+
+def run_live(args: argparse.Namespace) -> int:
+    """Comando `live`."""
+    # Legendas no stdout: os logs ([Transcriber] ...) vão para o stderr e não se misturam a elas
+    output = sys.stdout
+    with nullcontext() if args.output else redirect_stdout(sys.stderr):
+        return _run_live(args, output)
+
+def _run_live(args: argparse.Namespace, output) -> int:
+    """Comando `live` com os logs já desviados (output: stdout original, sem --output)."""
+    config = load_config()
+    if args.source != '-' and not os.path.exists(args.source):
+        print(f"[Live] Arquivo não encontrado: {args.source}")
+        return 2
+    
+    formats = parse_formats(args.format)
+    if len(formats) != 1:
+        print(f"[Live] Informe um único formato válido: {args.format}")
+        return 2
+    
+    transcriber = build_transcriber(config, args.model or config['default_model'], args.compute_type)
+    source = sys.stdin.buffer if args.source == '-' else args.source
+    if args.output:
+        output = open(args.output, 'w', encoding='utf-8')
+    
+    try:
+        for event in transcriber.transcribe_tail(
+            source,
+            language=args.language,
+            output_format=formats[0],
+            settings=decode_settings(args),
+            latency=args.latency,
+            idle_timeout=args.idle_timeout
+        ):
+            # Mesmo separador dos arquivos ('\n' entre as partes), mas depois de cada
+            # parte: a linha da legenda mais recente já sai completa
+            if event['type'] == 'start' and event['header']:
+                output.write(event['header'] + '\n')
+            elif event['type'] == 'cue':
+                output.write(event['formatted'] + '\n')
+            # Cada legenda finalizada fica visível imediatamente
+            output.flush()
+    finally:
+        if args.output:
+            output.close()
+    
+    return 0
+
+def add_decode_arguments(parser: argparse.ArgumentParser):
+    """Argumentos comuns de formato, idioma, modelo e decodificação."""
+    parser.add_argument('--format', default='srt', help='Formatos separados por vírgula (srt,vtt,ass,json,txt)')
+    parser.add_argument('--language', default='pt', help="Idioma ou 'auto'")
+    parser.add_argument('--model', help='Modelo (padrão: default_model da configuração)')
+    parser.add_argument('--compute-type', help='compute_type do CTranslate2 (padrão: configuração)')
+    parser.add_argument('--max-chars-per-line', type=int, default=42)
+    parser.add_argument('--max-lines', type=int, default=2)
+    parser.add_argument('--batched', action='store_true', help='Inferência em lote (throughput)')
+    parser.add_argument('--batch-size', type=int)
+    parser.add_argument('--beam-size', type=int)
+    parser.add_argument('--segment-cues', action='store_true',
+                        help='Uma legenda por segmento, sem alinhamento por palavra (mais rápido)')
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='scribe', description='Torio Tools Scribe sem interface')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    batch = commands.add_parser('batch', help='Transcrever vários arquivos')
+    batch.add_argument('inputs', nargs='*', help='Arquivos ou globs (use aspas para ** recursivo)')
+    batch.add_argument('--manifest', help='Lista de arquivos (JSON ou um caminho por linha)')
+    batch.add_argument('--output-dir', help='Pasta das legendas (padrão: ao lado de cada arquivo)')
+    add_decode_arguments(batch)
+    batch.add_argument('--prefetch', type=int, default=2, help='Arquivos extraídos à frente do modelo')
+    batch.add_argument('--writers', type=int, default=2, help='Threads de formatação/gravação')
+    batch.add_argument('--state', help=f'Arquivo de estado para retomar (padrão: {STATE_FILE_NAME})')
+    batch.add_argument('--summary', help=f'Resumo JSON (padrão: {SUMMARY_FILE_NAME})')
+    batch.set_defaults(handler=run_batch)
+    
+    watch = commands.add_parser('watch', help='Monitorar pastas e transcrever mídias novas')
+    watch.add_argument('folders', nargs='+', help='Pastas monitoradas (legendas gravadas ao lado das mídias)')
+    add_decode_arguments(watch)
+    watch.add_argument('--concurrency', type=int, default=1, help='Transcrições simultâneas')
+    watch.add_argument('--stable-seconds', type=float, default=5.0,
+                       help='Tempo sem mudança no arquivo antes de processar')
+    watch.add_argument('--poll-interval', type=float, default=2.0, help='Intervalo das verificações (s)')
+    watch.add_argument('--no-recursive', action='store_true', help='Ignorar subpastas')
+    watch.add_argument('--state', help='Registro das mídias já transcritas (padrão: cache/watch-state.json)')
+    watch.set_defaults(handler=run_watch)
+    
+    live = commands.add_parser('live', help='Legendar uma gravação em andamento')
+    live.add_argument('source', help="Arquivo ainda sendo gravado, ou '-' para PCM float32 mono 16 kHz no stdin")
+    add_decode_arguments(live)
+    live.add_argument('--output', help='Arquivo da legenda, gravado a cada legenda finalizada (padrão: stdout)')
+    live.add_argument('--latency', type=float, default=DEFAULT_TAIL_LATENCY,
+                      help='Áudio novo (s) entre decodificações: menor = legendas mais cedo, mais CPU')
+    live.add_argument('--idle-timeout', type=float, default=TAIL_IDLE_SECONDS,
+                      help='Encerrar após esse tempo (s) sem o arquivo crescer')
+    live.set_defaults(handler=run_live)
+    
+    return parser
+
+def run_cli(argv: List[str]) -> int:
+    """Ponto de entrada da CLI (chamado por main.py quando há subcomando)."""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(run_cli(sys.argv[1:]))
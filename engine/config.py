@@ -0,0 +1,80 @@
+"""
+Torio Tools Scribe - Configuração do Engine
+Valores padrão, sobrescritos por config.json e variáveis TORIO_SCRIBE_*.
+"""
+
+import os
+import sys
+import json
+from pathlib import Path
+from typing import Dict, Any
+
+DEFAULT_CONFIG = {
+    'transcription_cache_enabled': True,   # Reaproveitar transcrições já feitas
+    'transcription_cache_mb': 512,         # Limite de disco do cache de transcrições
+    'audio_cache_enabled': True,           # Guardar o áudio decodificado de vídeos (mmap)
+    'audio_cache_mb': 2048,                # Limite de disco do cache de áudio
+    'job_workers': 1,                      # Jobs de transcrição simultâneos (/jobs)
+    'default_model': 'base',               # Modelo usado quando o pedido não define
+    'compute_type': 'auto',                # Tipo de computação do CTranslate2 ('auto' = calibrado)
+    'cpu_threads': 0,                      # Threads de inferência (0 = calibrado)
+    'auto_tune': True,                     # Calibrar compute_type/threads na primeira execução
+    'max_loaded_models': 2,                # Modelos mantidos na memória ao mesmo tempo
+    'model_memory_budget_mb': 4096,        # Orçamento de memória dos modelos residentes
+    'max_profiles': 20,                    # Perfis (profile=true) mantidos em cache/profiles
+    'language_cache_entries': 4096,        # Arquivos com idioma detectado (/detect-language) em memória
+    'audio_backend': 'ffmpeg',             # Decodificador de mídia: 'ffmpeg' (pipe) ou 'pyav' (embutido)
+}
+
+def get_base_path() -> Path:
+    """Obter pasta base do aplicativo (onde ficam models/, cache/ e config.json)."""
+    if getattr(sys, 'frozen', False):
+        # Executável PyInstaller
+        return Path(sys.executable).parent.parent
+    # Desenvolvimento
+    return Path(__file__).parent.parent
+
+def get_models_path() -> Path:
+    """Obter caminho da pasta de modelos."""
+    return get_base_path() / 'models'
+
+def get_cache_path() -> Path:
+    """Obter caminho da pasta de cache."""
+    return get_base_path() / 'cache'
+
+def _coerce(value: str, default: Any) -> Any:
+    """Converter valor de variável de ambiente para o tipo do padrão."""
+    if isinstance(default, bool):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    if isinstance(default, int):
+        return int(value)
+    if isinstance(default, float):
+        return float(value)
+    return value
+
+def load_config() -> Dict[str, Any]:
+    """
+    Carregar configuração do engine.
+    
+    Ordem de prioridade: variáveis de ambiente (TORIO_SCRIBE_<CHAVE>),
+    config.json na pasta base e, por fim, DEFAULT_CONFIG.
+    """
+    config = dict(DEFAULT_CONFIG)
+    
+    config_file = get_base_path() / 'config.json'
+    if config_file.exists():
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"[Config] Erro ao ler {config_file}: {e}")
+    
+    for key, default in DEFAULT_CONFIG.items():
+        env_value = os.environ.get(f'TORIO_SCRIBE_{key.upper()}')
+        if env_value is not None:
+            try:
+                config[key] = _coerce(env_value, default)
+            except ValueError:
+                print(f"[Config] Valor inválido para {key}: {env_value}")
+    
+    return config
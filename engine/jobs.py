@@ -0,0 +1,194 @@
+"""
+Torio Tools Scribe - Job Manager
+Fila de transcrições assíncronas com pool de workers, progresso e cancelamento.
+"""
+
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, List
+
+from transcriber import TranscriptionCancelled
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+class Job:
+    """Uma transcrição submetida à fila."""
+    
+    def __init__(self, job_id: str, params: Dict[str, Any], on_change: Callable[[], None]):
+        self.id = job_id
+        self.params = params
+        self.status = JOB_QUEUED
+        self.progress = 0.0
+        self.processed_seconds = 0.0
+        self.total_seconds = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.future = None
+        self._on_change = on_change
+    
+    def report_progress(self, processed: float, total: float):
+        """Atualizar progresso (segundos de áudio processados / duração total)."""
+        self.processed_seconds = processed
+        self.total_seconds = total
+        if total:
+            self.progress = min(processed / total, 1.0)
+        self._on_change()
+    
+    @property
+    def eta(self) -> Optional[float]:
+        """Tempo restante estimado em segundos."""
+        if self.status != JOB_RUNNING or not self.started_at or self.progress <= 0:
+            return None
+        elapsed = time.time() - self.started_at
+        return elapsed / self.progress * (1 - self.progress)
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Estado do job (sem o resultado)."""
+        eta = self.eta
+        return {
+            'id': self.id,
+            'status': self.status,
+            'progress': round(self.progress * 100, 1),
+            'processed_seconds': round(self.processed_seconds, 3),
+            'total_seconds': self.total_seconds,
+            'eta': round(eta, 1) if eta is not None else None,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'file_path': self.params.get('file_path')
+        }
+
+class JobManager:
+    """Executa jobs em um pool limitado de workers."""
+    
+    def __init__(self, max_workers: int = 1, max_finished_jobs: int = 100):
+        """
+        Inicializar gerenciador.
+        
+        Args:
+            max_workers: Jobs executados ao mesmo tempo
+            max_finished_jobs: Jobs finalizados mantidos para consulta
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='scribe-job'
+        )
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+    
+    def submit(self, task: Callable[[Job], Dict[str, Any]], params: Dict[str, Any]) -> Job:
+        """
+        Enfileirar job.
+        
+        Args:
+            task: Função que recebe o Job e devolve o resultado
+            params: Parâmetros do pedido (guardados para consulta)
+        """
+        job = Job(uuid.uuid4().hex, params, self._notify)
+        
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        
+        job.future = self._executor.submit(self._run, job, task)
+        print(f"[Jobs] Job {job.id} enfileirado ({self.queue_depth()} na fila)")
+        return job
+    
+    def _run(self, job: Job, task: Callable[[Job], Dict[str, Any]]):
+        """Executar job no worker, registrando o estado final."""
+        if job.cancel_event.is_set():
+            self._finish(job, JOB_CANCELLED)
+            return
+        
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        self._notify()
+        
+        try:
+            job.result = task(job)
+            job.progress = 1.0
+            self._finish(job, JOB_COMPLETED)
+        except TranscriptionCancelled:
+            self._finish(job, JOB_CANCELLED)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            job.error = str(e)
+            self._finish(job, JOB_FAILED)
+    
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished_at = time.time()
+        print(f"[Jobs] Job {job.id}: {status}")
+        self._notify()
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def list_jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+    
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancelar job.
+        
+        Jobs na fila nunca começam; jobs em execução param no próximo
+        segmento decodificado.
+        """
+        job = self.get(job_id)
+        if not job or job.finished:
+            return job
+        
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            # Ainda não tinha começado
+            self._finish(job, JOB_CANCELLED)
+        return job
+    
+    def queue_depth(self) -> int:
+        """Jobs aguardando um worker."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == JOB_QUEUED)
+    
+    def active_count(self) -> int:
+        """Jobs em execução."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == JOB_RUNNING)
+    
+    def wait_for_change(self, timeout: float):
+        """Bloquear até alguma mudança de estado (ou timeout)."""
+        with self._changed:
+            self._changed.wait(timeout)
+    
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+    
+    def _prune(self):
+        """Descartar os jobs finalizados mais antigos além do limite."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
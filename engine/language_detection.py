@@ -0,0 +1,120 @@
+"""
+Torio Tools Scribe - Language Detection
+Detecção de idioma por amostragem: poucas janelas curtas espalhadas pelo arquivo.
+
+Só as janelas são decodificadas (FFmpeg com busca direta) e só a fala delas
+passa pelo detector do Whisper; o resultado fica guardado por arquivo para que
+um /transcribe com language='auto' pule a detecção.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+
+DEFAULT_WINDOWS = 3
+DEFAULT_WINDOW_SECONDS = 15.0
+DEFAULT_TOP_K = 5
+MAX_WINDOWS = 10
+
+# Abaixo desta probabilidade, o transcribe com 'auto' detecta de novo por conta própria
+MIN_REUSE_PROBABILITY = 0.5
+
+def media_duration(file_path: str) -> Optional[float]:
+    """Duração pelo cabeçalho do contêiner (PyAV, sem decodificar), ou None."""
+    try:
+        import av
+        with av.open(file_path) as container:
+            if container.duration:
+                return container.duration / av.time_base
+            stream = next((s for s in container.streams if s.type == 'audio'), None)
+            if stream is not None and stream.duration and stream.time_base:
+                return float(stream.duration * stream.time_base)
+    except Exception as e:
+        print(f"[Language] Duração indisponível para {file_path}: {e}")
+    return None
+
+def plan_windows(
+    duration: Optional[float],
+    windows: int = DEFAULT_WINDOWS,
+    window_seconds: float = DEFAULT_WINDOW_SECONDS
+) -> List[Tuple[float, float]]:
+    """
+    Janelas (início, fim) centradas em pontos igualmente espaçados do arquivo.
+    
+    Sem duração conhecida, ou em arquivos curtos, uma janela no início basta.
+    """
+    if not duration or duration <= window_seconds * windows:
+        return [(0.0, min(duration, window_seconds * windows) if duration else window_seconds)]
+    
+    planned = []
+    for index in range(windows):
+        center = duration * (index + 0.5) / windows
+        start = min(max(0.0, center - window_seconds / 2), duration - window_seconds)
+        planned.append((round(start, 3), round(start + window_seconds, 3)))
+    return planned
+
+def merge_probabilities(
+    detections: List[Tuple[List[Tuple[str, float]], float]],
+    top_k: Optional[int] = None
+) -> List[Tuple[str, float]]:
+    """
+    Média ponderada das probabilidades por idioma, da maior para a menor.
+    
+    Args:
+        detections: (probabilidades da janela, peso) — o peso é a fala da janela em segundos
+        top_k: Idiomas devolvidos (None = todos)
+    """
+    total_weight = sum(weight for _, weight in detections)
+    if total_weight <= 0:
+        return []
+    
+    merged: Dict[str, float] = {}
+    for probabilities, weight in detections:
+        for language, probability in probabilities:
+            merged[language] = merged.get(language, 0.0) + probability * weight / total_weight
+    
+    ranked = sorted(merged.items(), key=lambda item: item[1], reverse=True)
+    return ranked[:top_k]
+
+class LanguageCache:
+    """Idiomas detectados por arquivo (caminho, tamanho e mtime), em memória (LRU)."""
+    
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max(1, max_entries)
+        self._entries: 'OrderedDict[Tuple[str, int, int], Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _key(self, file_path: str) -> Tuple[str, int, int]:
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Detecção guardada (ou None; arquivo alterado conta como ausente)."""
+        try:
+            key = self._key(file_path)
+        except OSError:
+            return None
+        
+        with self._lock:
+            detection = self._entries.get(key)
+            if detection is not None:
+                self._entries.move_to_end(key)
+            return detection
+    
+    def put(self, file_path: str, detection: Dict[str, Any]):
+        """Guardar detecção e aplicar o limite de entradas."""
+        try:
+            key = self._key(file_path)
+        except OSError:
+            return
+        
+        with self._lock:
+            self._entries[key] = detection
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
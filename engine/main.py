@@ -3,39 +3,190 @@ Torio Tools Scribe - Python Engine
 Servidor Flask para transcrição de áudio com Whisper local.
 """
 
+import time
+
+PROCESS_STARTED = time.perf_counter()
+
 import os
 import sys
 import json
 import tempfile
+import threading
+import multiprocessing
 from pathlib import Path
-from flask import Flask, request, jsonify
+from contextlib import nullcontext
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
-from transcriber import WhisperTranscriber
+import metrics
+from model_registry import ModelRegistry
+from autotune import ComputeTuner
+from jobs import JobManager, JOB_COMPLETED
 from text_generator import TextSubtitleGenerator
+from transcription_cache import TranscriptionCache
+from audio_cache import AudioCache
+from language_detection import LanguageCache, DEFAULT_WINDOWS, DEFAULT_WINDOW_SECONDS, DEFAULT_TOP_K
+from windowed import DEFAULT_TAIL_LATENCY, TAIL_IDLE_SECONDS
+from profiling import ProfileStore
+from config import load_config, get_cache_path, get_models_path
 
 app = Flask(__name__)
 CORS(app)
 
 # Inicializar transcritor e gerador de texto
-transcriber = None
+model_registry = None
 text_generator = TextSubtitleGenerator()
+job_manager = None
+profile_store = None
+engine_config = {}
+
+# Fases de inicialização: starting -> [calibrating] -> loading_model -> warming_up -> ready (ou error)
+engine_state = {
+    'phase': 'starting',
+    'error': None,
+    'timings': {}
+}
+
+def stream_events(events, mode: str = 'ndjson') -> Response:
+    """
+    Transmitir eventos (dicts) como NDJSON ou Server-Sent Events.
+    
+    Erros durante a transmissão viram um evento do tipo 'error'.
+    """
+    def serialize(event):
+        payload = json.dumps(event, ensure_ascii=False)
+        if mode == 'sse':
+            return f"event: {event.get('type', 'message')}\ndata: {payload}\n\n"
+        return payload + '\n'
+    
+    def generate():
+        try:
+            for event in events:
+                yield serialize(event)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            yield serialize({'type': 'error', 'error': str(e)})
+    
+    mimetype = 'text/event-stream' if mode == 'sse' else 'application/x-ndjson'
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
-def get_models_path():
-    """Obter caminho da pasta de modelos."""
-    if getattr(sys, 'frozen', False):
-        # Executável PyInstaller
-        base_path = Path(sys.executable).parent.parent
-        return base_path / 'models'
-    else:
-        # Desenvolvimento
-        return Path(__file__).parent.parent / 'models'
+def parse_transcription_request(data: dict) -> dict:
+    """Extrair parâmetros de transcrição do corpo do pedido."""
+    return {
+        'file_path': data.get('file_path'),
+        'language': data.get('language', 'pt'),
+        'output_format': data.get('format', 'srt'),
+        'model': data.get('model') or engine_config.get('default_model', 'base'),
+        # Modelo maior que redecodifica só os segmentos de baixa confiança
+        'refine_model': data.get('refine_model'),
+        'compute_type': data.get('compute_type'),
+        # Configurações de legenda
+        'settings': {
+            'max_chars_per_line': data.get('max_chars_per_line', 42),
+            'max_lines': data.get('max_lines', 2),
+            'min_duration': data.get('min_duration', 1.0),
+            'max_duration': data.get('max_duration', 7.0),
+            # Legendas cortadas nas fronteiras das palavras (false = uma por segmento, sem alinhamento)
+            'word_cues': data.get('word_cues', True),
+            # Transcrição em trechos paralelos (arquivos longos)
+            'parallel': bool(data.get('parallel', False)),
+            'parallel_workers': data.get('parallel_workers'),
+            # Inferência em lote (throughput) e largura do beam
+            'batched': bool(data.get('batched', False)),
+            'batch_size': data.get('batch_size'),
+            'beam_size': data.get('beam_size'),
+            # Decodificação em janelas de memória constante (None = automático em arquivos longos)
+            'windowed': data.get('windowed'),
+            'window_seconds': data.get('window_seconds'),
+            # Trecho do arquivo (segundos); com `segments`, o trecho é encaixado neles
+            'start': data.get('start'),
+            'end': data.get('end'),
+            # Limiares do refinamento (min_avg_logprob, max_no_speech_prob, max_compression_ratio)
+            'refine_thresholds': data.get('refine_thresholds')
+        },
+        'segments': data.get('segments'),
+        # Gravar a legenda direto neste arquivo (a resposta leva só metadados)
+        'output_path': data.get('output_path')
+    }
+
+def parse_query_args(args) -> dict:
+    """Parâmetros da query string com números e booleanos convertidos (valores JSON; o resto fica texto)."""
+    data = {}
+    for key, value in args.items():
+        try:
+            data[key] = json.loads(value)
+        except ValueError:
+            data[key] = value
+    return data
+
+def parse_text_settings(data: dict) -> dict:
+    """Configurações de legenda do modo texto (/generate-from-text e /align)."""
+    return {
+        'max_chars_per_line': data.get('max_chars_per_line', 42),
+        'max_lines_per_cue': data.get('max_lines', 2),
+        'max_chars_per_cue': data.get('max_chars_per_cue', 84),
+        'min_duration_ms': int(data.get('min_duration', 1.0) * 1000),
+        'max_duration_ms': int(data.get('max_duration', 7.0) * 1000),
+        'gap_ms': int(data.get('gap', 0.15) * 1000),
+        'max_cps': data.get('max_cps', 17),
+        'words_per_minute': data.get('wpm', 150),
+    }
+
+def profile_request(data: dict, label: str, details: dict):
+    """Perfilar o pedido quando `profile: true` (senão, contexto vazio)."""
+    if profile_store is None or not data.get('profile'):
+        return nullcontext()
+    return profile_store.profile(label, details)
+
+def get_transcriber(params: dict):
+    """Obter transcritor do modelo pedido (carregado sob demanda)."""
+    return model_registry.get(params['model'], params['compute_type'])
+
+def get_refiner(params: dict):
+    """Transcritor do modelo de refinamento (ou None sem refine_model)."""
+    if not params['refine_model']:
+        return None
+    return model_registry.get(params['refine_model'], params['compute_type'])
+
+@app.before_request
+def track_request_start():
+    metrics.ACTIVE_REQUESTS.inc()
+
+@app.after_request
+def track_request_status(response):
+    endpoint = request.url_rule.rule if request.url_rule else 'unknown'
+    metrics.HTTP_REQUESTS.inc(endpoint=endpoint, status=response.status_code)
+    return response
+
+@app.teardown_request
+def track_request_end(exc=None):
+    # Em respostas transmitidas, roda ao fim da transmissão
+    metrics.ACTIVE_REQUESTS.dec()
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Métricas no formato de exposição do Prometheus."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/status', methods=['GET'])
 def status():
     """Verificar status do engine."""
+    default_model = engine_config.get('default_model', 'base')
+    # Pronto depois da inicialização, mesmo que o modelo padrão seja descarregado
+    # depois (LRU): o registro o carrega de novo no próximo pedido
+    ready = engine_state['phase'] == 'ready'
     return jsonify({
-        'ready': transcriber is not None and transcriber.is_ready,
-        'model': transcriber.model_name if transcriber else None,
+        'ready': ready,
+        'phase': engine_state['phase'],
+        'error': engine_state['error'],
+        'startup': engine_state['timings'],
+        'model': default_model if ready else None,
+        'models': model_registry.status() if model_registry else None,
+        'tuning': model_registry.tuner.status() if model_registry and model_registry.tuner else None,
         'version': '12-2025'
     })
 
@@ -44,17 +195,152 @@ def transcribe():
     """Transcrever arquivo de áudio para SRT."""
     try:
         data = request.get_json()
-        file_path = data.get('file_path')
-        language = data.get('language', 'pt')
-        output_format = data.get('format', 'srt')
+        params = parse_transcription_request(data)
+        file_path = params['file_path']
+        language = params['language']
+        output_format = params['output_format']
+        settings = params['settings']
         
-        # Configurações de legenda
-        settings = {
-            'max_chars_per_line': data.get('max_chars_per_line', 42),
-            'max_lines': data.get('max_lines', 2),
-            'min_duration': data.get('min_duration', 1.0),
-            'max_duration': data.get('max_duration', 7.0)
-        }
+        if not file_path or not os.path.exists(file_path):
+            return jsonify({
+                'success': False,
+                'error': 'Arquivo não encontrado'
+            }), 400
+        
+        if not model_registry.is_supported(params['model']):
+            return jsonify({
+                'success': False,
+                'error': f"Modelo não suportado: {params['model']}"
+            }), 400
+        
+        if params['refine_model'] and not model_registry.is_supported(params['refine_model']):
+            return jsonify({
+                'success': False,
+                'error': f"Modelo não suportado: {params['refine_model']}"
+            }), 400
+        
+        # Modo streaming: cada legenda é enviada assim que decodificada
+        # (validado antes de carregar o modelo: um pedido inválido não espera o carregamento)
+        stream_mode = data.get('stream')
+        if stream_mode and (
+            settings['start'] is not None
+            or settings['end'] is not None
+            or isinstance(output_format, list)
+            or params['output_path']
+            or params['refine_model']
+        ):
+            return jsonify({
+                'success': False,
+                'error': 'stream aceita apenas um formato, sem start/end, output_path nem refine_model'
+            }), 400
+        
+        transcriber = get_transcriber(params)
+        
+        if stream_mode:
+            return stream_events(
+                transcriber.transcribe_stream(
+                    file_path,
+                    language=language,
+                    output_format=output_format,
+                    settings=settings
+                ),
+                mode='sse' if stream_mode == 'sse' else 'ndjson'
+            )
+        
+        # Transcrever (com profile=true, sob cProfile + tracemalloc)
+        details = {'file_path': file_path, 'model': params['model'], 'format': output_format}
+        with profile_request(data, 'transcribe', details) as profile:
+            result = transcriber.transcribe(
+                file_path,
+                language=language,
+                output_format=output_format,
+                settings=settings,
+                base_segments=params['segments'],
+                output_path=params['output_path'],
+                refiner=get_refiner(params)
+            )
+            
+            with metrics.timed('serialize'):
+                response = jsonify({
+                    'success': True,
+                    'subtitles': result['subtitles'],
+                    'outputs': result.get('outputs'),
+                    'duration': result['duration'],
+                    'language': result['detected_language'],
+                    'model': params['model'],
+                    'cached': result.get('cached', False),
+                    'range': result.get('range'),
+                    'segments': result.get('segments'),
+                    'refinement': result.get('refinement'),
+                    'profile_id': profile.id if profile else None
+                })
+        return response
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/transcribe-live', methods=['POST'])
+def transcribe_live():
+    """Acompanhar uma gravação em andamento, transmitindo só legendas finalizadas."""
+    try:
+        # PCM cru no corpo (application/octet-stream): parâmetros na query string
+        pcm_body = request.mimetype == 'application/octet-stream'
+        data = parse_query_args(request.args) if pcm_body else (request.get_json() or {})
+        params = parse_transcription_request(data)
+        file_path = params['file_path']
+        output_format = params['output_format']
+        
+        if not pcm_body and (not file_path or not os.path.exists(file_path)):
+            return jsonify({
+                'success': False,
+                'error': 'Arquivo não encontrado'
+            }), 400
+        
+        if isinstance(output_format, list):
+            return jsonify({
+                'success': False,
+                'error': 'O acompanhamento aceita apenas um formato'
+            }), 400
+        
+        if not model_registry.is_supported(params['model']):
+            return jsonify({
+                'success': False,
+                'error': f"Modelo não suportado: {params['model']}"
+            }), 400
+        
+        transcriber = get_transcriber(params)
+        return stream_events(
+            transcriber.transcribe_tail(
+                request.stream if pcm_body else file_path,
+                language=params['language'],
+                output_format=output_format,
+                settings=params['settings'],
+                latency=float(data.get('latency') or DEFAULT_TAIL_LATENCY),
+                idle_timeout=float(data.get('idle_timeout') or TAIL_IDLE_SECONDS)
+            ),
+            mode='sse' if data.get('stream') == 'sse' else 'ndjson'
+        )
+    
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/detect-language', methods=['POST'])
+def detect_language():
+    """Detectar o idioma amostrando algumas janelas curtas do arquivo."""
+    try:
+        data = request.get_json() or {}
+        params = parse_transcription_request(data)
+        file_path = params['file_path']
         
         if not file_path or not os.path.exists(file_path):
             return jsonify({
@@ -62,20 +348,21 @@ def transcribe():
                 'error': 'Arquivo não encontrado'
             }), 400
         
-        # Transcrever
-        result = transcriber.transcribe(
+        if not model_registry.is_supported(params['model']):
+            return jsonify({
+                'success': False,
+                'error': f"Modelo não suportado: {params['model']}"
+            }), 400
+        
+        transcriber = get_transcriber(params)
+        result = transcriber.detect_language(
             file_path,
-            language=language,
-            output_format=output_format,
-            settings=settings
+            windows=int(data.get('windows') or DEFAULT_WINDOWS),
+            window_seconds=float(data.get('window_seconds') or DEFAULT_WINDOW_SECONDS),
+            top_k=int(data.get('top_k') or DEFAULT_TOP_K)
         )
         
-        return jsonify({
-            'success': True,
-            'subtitles': result['subtitles'],
-            'duration': result['duration'],
-            'language': result['detected_language']
-        })
+        return jsonify({'success': True, **result})
         
     except Exception as e:
         import traceback
@@ -85,46 +372,254 @@ def transcribe():
             'error': str(e)
         }), 500
 
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Enfileirar transcrição assíncrona."""
+    data = request.get_json() or {}
+    params = parse_transcription_request(data)
+    
+    if not params['file_path'] or not os.path.exists(params['file_path']):
+        return jsonify({
+            'success': False,
+            'error': 'Arquivo não encontrado'
+        }), 400
+    
+    if not model_registry.is_supported(params['model']):
+        return jsonify({
+            'success': False,
+            'error': f"Modelo não suportado: {params['model']}"
+        }), 400
+    
+    if params['refine_model'] and not model_registry.is_supported(params['refine_model']):
+        return jsonify({
+            'success': False,
+            'error': f"Modelo não suportado: {params['refine_model']}"
+        }), 400
+    
+    def task(job):
+        transcriber = get_transcriber(params)
+        result = transcriber.transcribe(
+            params['file_path'],
+            language=params['language'],
+            output_format=params['output_format'],
+            settings=params['settings'],
+            progress_callback=job.report_progress,
+            cancel_event=job.cancel_event,
+            base_segments=params['segments'],
+            output_path=params['output_path'],
+            refiner=get_refiner(params)
+        )
+        return {
+            'subtitles': result['subtitles'],
+            'outputs': result.get('outputs'),
+            'duration': result['duration'],
+            'language': result['detected_language'],
+            'model': params['model'],
+            'cached': result.get('cached', False),
+            'range': result.get('range'),
+            'segments': result.get('segments'),
+            'refinement': result.get('refinement')
+        }
+    
+    job = job_manager.submit(task, params)
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'job': job.to_dict()
+    }), 202
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    """Listar jobs."""
+    return jsonify({
+        'jobs': [job.to_dict() for job in job_manager.list_jobs()],
+        'queue_depth': job_manager.queue_depth(),
+        'workers': job_manager.max_workers
+    })
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Consultar estado do job."""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job não encontrado'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Transmitir estado do job (SSE) até ele terminar."""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job não encontrado'}), 404
+    
+    def events():
+        last = None
+        while True:
+            state = job.to_dict()
+            snapshot = (state['status'], state['progress'])
+            if snapshot != last:
+                last = snapshot
+                yield {'type': 'status', **state}
+            if job.finished:
+                break
+            job_manager.wait_for_change(timeout=1.0)
+    
+    return stream_events(events(), mode='sse')
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Obter resultado de um job concluído."""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job não encontrado'}), 404
+    
+    if job.status != JOB_COMPLETED:
+        return jsonify({
+            'success': False,
+            'error': job.error or f'Job ainda não concluído ({job.status})',
+            'job': job.to_dict()
+        }), 409
+    
+    return jsonify({'success': True, **job.result})
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancelar job (na fila ou em execução)."""
+    job = job_manager.cancel(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job não encontrado'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
 @app.route('/generate-from-text', methods=['POST'])
 def generate_from_text():
     """Gerar legendas a partir de texto (modo texto)."""
     try:
         data = request.get_json()
         text = data.get('text', '')
+        text_path = data.get('text_path')
         output_format = data.get('format', 'srt')
         
-        if not text or not text.strip():
+        if text_path:
+            if not os.path.exists(text_path):
+                return jsonify({
+                    'success': False,
+                    'error': 'Arquivo de texto não encontrado'
+                }), 400
+        elif not text or not text.strip():
             return jsonify({
                 'success': False,
                 'error': 'Texto não fornecido'
             }), 400
         
+        # Arquivo de texto: lido parágrafo a parágrafo, nunca inteiro na memória
+        source = Path(text_path) if text_path else text
+        
         # Configurações avançadas de legenda
-        settings = {
-            'max_chars_per_line': data.get('max_chars_per_line', 42),
-            'max_lines_per_cue': data.get('max_lines', 2),
-            'max_chars_per_cue': data.get('max_chars_per_cue', 84),
-            'min_duration_ms': int(data.get('min_duration', 1.0) * 1000),
-            'max_duration_ms': int(data.get('max_duration', 7.0) * 1000),
-            'gap_ms': int(data.get('gap', 0.15) * 1000),
-            'max_cps': data.get('max_cps', 17),
-            'words_per_minute': data.get('wpm', 150),
-        }
+        settings = parse_text_settings(data)
         
-        # Gerar legendas
-        result = text_generator.generate_subtitles(
-            text=text,
-            output_format=output_format,
-            settings=settings
-        )
+        # Modo streaming: cada bloco é enviado assim que gerado
+        stream_mode = data.get('stream')
+        if stream_mode:
+            if isinstance(output_format, list) or data.get('output_path'):
+                return jsonify({
+                    'success': False,
+                    'error': 'stream aceita apenas um formato, sem output_path'
+                }), 400
+            return stream_events(
+                text_generator.stream_subtitles(source, output_format=output_format, settings=settings),
+                mode='sse' if stream_mode == 'sse' else 'ndjson'
+            )
         
+        # Gerar legendas (com profile=true, sob cProfile + tracemalloc)
+        characters = os.path.getsize(text_path) if text_path else len(text)
+        details = {'characters': characters, 'format': output_format}
+        with profile_request(data, 'generate-from-text', details) as profile:
+            result = text_generator.generate_subtitles(
+                text=source,
+                output_format=output_format,
+                settings=settings,
+                output_path=data.get('output_path')
+            )
+            
+            with metrics.timed('serialize'):
+                response = jsonify({
+                    'success': True,
+                    'subtitles': result['subtitles'],
+                    'outputs': result['outputs'],
+                    'duration': result['duration'],
+                    'segment_count': result['segment_count'],
+                    'language': result['detected_language'],
+                    'profile_id': profile.id if profile else None
+                })
+        return response
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
         return jsonify({
-            'success': True,
-            'subtitles': result['subtitles'],
-            'duration': result['duration'],
-            'segment_count': result['segment_count'],
-            'language': result['detected_language']
-        })
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/align', methods=['POST'])
+def align_script():
+    """Alinhar um roteiro conhecido ao áudio (tempos reais, texto do roteiro)."""
+    try:
+        data = request.get_json() or {}
+        params = parse_transcription_request(data)
+        file_path = params['file_path']
+        text = data.get('text', '')
+        
+        if not text or not text.strip():
+            return jsonify({
+                'success': False,
+                'error': 'Texto não fornecido'
+            }), 400
+        
+        if not file_path or not os.path.exists(file_path):
+            return jsonify({
+                'success': False,
+                'error': 'Arquivo não encontrado'
+            }), 400
+        
+        if not model_registry.is_supported(params['model']):
+            return jsonify({
+                'success': False,
+                'error': f"Modelo não suportado: {params['model']}"
+            }), 400
+        
+        details = {'file_path': file_path, 'model': params['model'], 'characters': len(text)}
+        with profile_request(data, 'align', details) as profile:
+            transcriber = get_transcriber(params)
+            recognized = transcriber.transcribe_words(
+                file_path,
+                language=params['language'],
+                settings=params['settings']
+            )
+            result = text_generator.align_subtitles(
+                text,
+                recognized['words'],
+                output_format=params['output_format'],
+                settings=parse_text_settings(data),
+                output_path=params['output_path'],
+                language=recognized['detected_language']
+            )
+            
+            with metrics.timed('serialize'):
+                response = jsonify({
+                    'success': True,
+                    'subtitles': result['subtitles'],
+                    'outputs': result['outputs'],
+                    'duration': result['duration'],
+                    'segment_count': result['segment_count'],
+                    'language': result['detected_language'],
+                    'model': params['model'],
+                    'cached': recognized['cached'],
+                    'alignment': result['alignment'],
+                    'profile_id': profile.id if profile else None
+                })
+        return response
         
     except Exception as e:
         import traceback
@@ -134,6 +629,31 @@ def generate_from_text():
             'error': str(e)
         }), 500
 
+@app.route('/profiles', methods=['GET'])
+def list_profiles():
+    """Listar perfis capturados com profile=true."""
+    return jsonify({
+        'profiles': profile_store.list_profiles() if profile_store else []
+    })
+
+@app.route('/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """Resumo do perfil; `?format=pstats` baixa o arquivo do cProfile."""
+    if profile_store is None:
+        return jsonify({'success': False, 'error': 'Profiling indisponível'}), 404
+    
+    if request.args.get('format') == 'pstats':
+        stats_path = profile_store.stats_path(profile_id)
+        if stats_path is None:
+            return jsonify({'success': False, 'error': 'Perfil não encontrado'}), 404
+        return send_file(stats_path, mimetype='application/octet-stream', as_attachment=True,
+                         download_name=f'{profile_id}.prof')
+    
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        return jsonify({'success': False, 'error': 'Perfil não encontrado'}), 404
+    return jsonify(profile)
+
 @app.route('/languages', methods=['GET'])
 def get_languages():
     """Listar idiomas suportados."""
@@ -152,24 +672,119 @@ def get_languages():
         ]
     })
 
+def load_default_model(model_size: str):
+    """Carregar e aquecer o modelo padrão (thread de inicialização)."""
+    timings = engine_state['timings']
+    
+    try:
+        tuner = model_registry.tuner
+        if tuner is not None and tuner.needs_calibration(model_size):
+            # Primeira execução nesta máquina: medir compute_type/threads
+            engine_state['phase'] = 'calibrating'
+            started = time.perf_counter()
+            model_registry.get(model_size)
+            timings['calibration'] = round(time.perf_counter() - started, 3)
+        
+        engine_state['phase'] = 'loading_model'
+        started = time.perf_counter()
+        transcriber = model_registry.get(model_size)
+        timings['model_load'] = round(time.perf_counter() - started, 3)
+        print(f"[Torio Scribe Engine] Modelo carregado em {timings['model_load']:.2f}s")
+        
+        engine_state['phase'] = 'warming_up'
+        timings['warm_up'] = round(transcriber.warm_up(), 3)
+        
+        timings['total'] = round(time.perf_counter() - PROCESS_STARTED, 3)
+        engine_state['phase'] = 'ready'
+        print(f"[Torio Scribe Engine] Pronto em {timings['total']:.2f}s desde o início do processo")
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        engine_state['phase'] = 'error'
+        engine_state['error'] = str(e)
+
 def main():
-    global transcriber
+    global model_registry, job_manager, profile_store, engine_config
     
     print("[Torio Scribe Engine] Iniciando...")
+    engine_state['timings']['imports'] = round(time.perf_counter() - PROCESS_STARTED, 3)
+    config = load_config()
+    engine_config = config
+    
+    # Cache de transcrições (reformatar sem transcrever de novo)
+    transcription_cache = None
+    if config['transcription_cache_enabled']:
+        transcription_cache = TranscriptionCache(
+            get_cache_path() / 'transcriptions',
+            max_bytes=config['transcription_cache_mb'] * 1024 * 1024
+        )
+    
+    # Cache do áudio decodificado (retranscrever sem rodar o FFmpeg)
+    audio_cache = None
+    if config['audio_cache_enabled']:
+        audio_cache = AudioCache(
+            get_cache_path() / 'audio',
+            max_bytes=config['audio_cache_mb'] * 1024 * 1024
+        )
+    
+    # Idiomas detectados por /detect-language (transcribe com 'auto' reaproveita)
+    language_cache = LanguageCache(max_entries=config['language_cache_entries'])
     
     # Carregar modelo Whisper
     models_path = get_models_path()
     print(f"[Torio Scribe Engine] Caminho de modelos: {models_path}")
     
-    transcriber = WhisperTranscriber(
-        model_size='base',
-        models_path=models_path
+    # Calibração de compute_type/cpu_threads por máquina e modelo
+    tuner = ComputeTuner(
+        get_cache_path() / 'calibration.json',
+        compute_type_override=config['compute_type'],
+        cpu_threads_override=config['cpu_threads'],
+        enabled=config['auto_tune']
     )
     
-    print("[Torio Scribe Engine] Modelo carregado!")
+    model_registry = ModelRegistry(
+        models_path=models_path,
+        max_loaded=config['max_loaded_models'],
+        memory_budget_mb=config['model_memory_budget_mb'],
+        default_compute_type=config['compute_type'],
+        transcriber_options={
+            'cache': transcription_cache,
+            'audio_cache': audio_cache,
+            'language_cache': language_cache,
+            'audio_backend': config['audio_backend'],
+            'num_workers': config['job_workers']
+        },
+        tuner=tuner
+    )
+    
+    job_manager = JobManager(max_workers=config['job_workers'])
+    profile_store = ProfileStore(get_cache_path() / 'profiles', max_profiles=config['max_profiles'])
+    metrics.JOB_QUEUE_DEPTH.set_function(job_manager.queue_depth)
+    metrics.ACTIVE_JOBS.set_function(job_manager.active_count)
+    
+    # Modelo padrão carregado em segundo plano: o servidor responde desde já
+    threading.Thread(
+        target=load_default_model,
+        args=(config['default_model'],),
+        name='scribe-warmup',
+        daemon=True
+    ).start()
+    
+    server_ready = time.perf_counter() - PROCESS_STARTED
+    engine_state['timings']['server_ready'] = round(server_ready, 3)
+    print(f"[Torio Scribe Engine] Servidor pronto em {server_ready:.2f}s")
     print("[Torio Scribe Engine] Servidor rodando em http://127.0.0.1:5123")
     
     app.run(host='127.0.0.1', port=5123, debug=False, threaded=True)
 
 if __name__ == '__main__':
+    # Necessário para o pool de processos no executável PyInstaller (Windows)
+    multiprocessing.freeze_support()
+    
+    # Subcomandos sem servidor (ex.: `torio_scribe_engine batch *.mp4 --output-dir legendas`)
+    if len(sys.argv) > 1 and sys.argv[1] in ('batch', 'watch', 'live'):
+        from cli import run_cli
+        sys.exit(run_cli(sys.argv[1:]))
+    
     main()
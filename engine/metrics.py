@@ -0,0 +1,258 @@
+"""
+Torio Tools Scribe - Metrics
+Contadores e histogramas leves no formato de exposição do Prometheus.
+"""
+
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Buckets padrão (segundos): de 1 ms a 10 min
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# Fator de tempo real (tempo de processamento / duração do áudio)
+RTF_BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5)
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Metric:
+    """Base: nome, ajuda e rótulos."""
+    
+    kind = 'untyped'
+    
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+    
+    def render(self) -> List[str]:
+        return [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}'] + self._samples()
+    
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(Metric):
+    """Contador monotônico."""
+    
+    kind = 'counter'
+    
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}' for key, value in items]
+
+class Gauge(Metric):
+    """Valor instantâneo, definido diretamente ou lido de uma função."""
+    
+    kind = 'gauge'
+    
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._callback: Optional[Callable[[], float]] = None
+    
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+    
+    def set_function(self, callback: Callable[[], float]):
+        """Ler o valor de `callback` a cada coleta (sem rótulos)."""
+        self._callback = callback
+    
+    def _samples(self) -> List[str]:
+        if self._callback is not None:
+            try:
+                return [f'{self.name} {_format_value(self._callback())}']
+            except Exception:
+                return []
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}' for key, value in items]
+
+class Histogram(Metric):
+    """Histograma com buckets cumulativos, soma e contagem."""
+    
+    kind = 'histogram'
+    
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # rótulos -> [contagens por bucket, soma, contagem]
+        self._values: Dict[Tuple[str, ...], list] = {}
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*counts], total, count)) for key, (counts, total, count) in self._values.items())
+        
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {count}')
+        return lines
+
+class Registry:
+    """Conjunto de métricas expostas em /metrics."""
+    
+    def __init__(self):
+        self._metrics: List[Metric] = []
+    
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+    
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'scribe_stage_seconds',
+    'Tempo gasto em cada etapa do caminho crítico',
+    ['stage']
+))
+
+REAL_TIME_FACTOR = REGISTRY.register(Histogram(
+    'scribe_real_time_factor',
+    'Tempo de transcrição dividido pela duração do áudio',
+    ['model'],
+    buckets=RTF_BUCKETS
+))
+
+AUDIO_SECONDS = REGISTRY.register(Counter(
+    'scribe_audio_seconds_total',
+    'Segundos de áudio transcritos',
+    ['model']
+))
+
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    'scribe_cache_requests_total',
+    'Consultas aos caches por resultado (hit/miss)',
+    ['cache', 'result']
+))
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    'scribe_http_requests_total',
+    'Pedidos HTTP por endpoint e status',
+    ['endpoint', 'status']
+))
+
+ACTIVE_REQUESTS = REGISTRY.register(Gauge(
+    'scribe_active_requests',
+    'Pedidos HTTP em andamento'
+))
+
+JOB_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    'scribe_job_queue_depth',
+    'Jobs aguardando um worker'
+))
+
+ACTIVE_JOBS = REGISTRY.register(Gauge(
+    'scribe_active_jobs',
+    'Jobs em execução'
+))
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Medir um bloco e registrar em scribe_stage_seconds{stage=...}."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage=stage)
+
+def timed_iter(iterable: Iterable, stage: str) -> Iterator:
+    """
+    Repassar itens medindo apenas o tempo gasto dentro do iterador.
+    
+    Útil para geradores lazy (a decodificação acontece em cada next()).
+    """
+    iterator = iter(iterable)
+    spent = 0.0
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                spent += time.perf_counter() - started
+                break
+            spent += time.perf_counter() - started
+            yield item
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close:
+            close()
+        STAGE_SECONDS.observe(spent, stage=stage)
+
+def record_cache(cache: str, hit: bool):
+    """Registrar consulta a um cache."""
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+def record_transcription(model: str, audio_seconds: float, elapsed: float):
+    """Registrar fator de tempo real de uma transcrição."""
+    if audio_seconds:
+        REAL_TIME_FACTOR.observe(elapsed / audio_seconds, model=model)
+        AUDIO_SECONDS.inc(audio_seconds, model=model)
+
+def render() -> str:
+    """Exposição em texto de todas as métricas."""
+    return REGISTRY.render()
@@ -0,0 +1,190 @@
+"""
+Torio Tools Scribe - Model Registry
+Carrega modelos Whisper sob demanda e mantém os mais usados na memória (LRU).
+"""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+from transcriber import WhisperTranscriber, resolve_model_path
+from autotune import ComputeTuner
+
+SUPPORTED_MODELS = ('tiny', 'base', 'small', 'medium', 'large-v3')
+
+# Memória aproximada (MB) de cada modelo carregado em int8
+MODEL_MEMORY_MB = {
+    'tiny': 150,
+    'base': 250,
+    'small': 600,
+    'medium': 1600,
+    'large-v3': 3300,
+}
+
+# Multiplicador de memória por tipo de computação (relativo a int8)
+COMPUTE_TYPE_FACTOR = {
+    'int8': 1.0,
+    'int8_float32': 1.0,
+    'int8_float16': 1.0,
+    'int8_bfloat16': 1.0,
+    'int16': 1.8,
+    'float16': 1.8,
+    'bfloat16': 1.8,
+    'float32': 3.5,
+}
+
+class ModelRegistry:
+    """Registro de transcritores, um por (modelo, compute_type)."""
+    
+    def __init__(
+        self,
+        models_path: Optional[Path] = None,
+        max_loaded: int = 2,
+        memory_budget_mb: int = 4096,
+        default_compute_type: str = 'int8',
+        transcriber_options: Optional[Dict[str, Any]] = None,
+        tuner: Optional[ComputeTuner] = None
+    ):
+        """
+        Inicializar registro.
+        
+        Args:
+            models_path: Pasta de modelos (get_models_path())
+            max_loaded: Máximo de modelos residentes
+            memory_budget_mb: Orçamento de memória para os modelos residentes
+            default_compute_type: Tipo de computação quando o pedido não define ('auto' = tuner)
+            transcriber_options: Argumentos extras para WhisperTranscriber
+            tuner: Calibração de compute_type/cpu_threads por máquina (opcional)
+        """
+        self.models_path = models_path
+        self.max_loaded = max(1, max_loaded)
+        self.memory_budget_mb = memory_budget_mb
+        self.default_compute_type = default_compute_type
+        self.transcriber_options = transcriber_options or {}
+        self.tuner = tuner
+        self._loaded: 'OrderedDict[Tuple[str, str], WhisperTranscriber]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading_locks: Dict[Tuple[str, str], threading.Lock] = {}
+    
+    def is_supported(self, model_size: str) -> bool:
+        """Modelo conhecido ou presente na pasta de modelos."""
+        if model_size in SUPPORTED_MODELS:
+            return True
+        return bool(self.models_path and (self.models_path / f'faster-whisper-{model_size}').exists())
+    
+    def estimate_memory_mb(self, model_size: str, compute_type: str) -> float:
+        """Estimativa de memória de um modelo carregado."""
+        base = MODEL_MEMORY_MB.get(model_size, MODEL_MEMORY_MB['large-v3'])
+        return base * COMPUTE_TYPE_FACTOR.get(compute_type, 1.0)
+    
+    def get(self, model_size: str, compute_type: Optional[str] = None) -> WhisperTranscriber:
+        """
+        Obter transcritor, carregando o modelo se necessário.
+        
+        Modelos menos usados são descarregados para respeitar max_loaded e o
+        orçamento de memória. Pedidos em andamento mantêm sua referência até
+        terminar.
+        """
+        if not self.is_supported(model_size):
+            raise ValueError(f"Modelo não suportado: {model_size}")
+        
+        # Já carregado com o compute_type pedido: nem consulta a calibração
+        requested = compute_type or self.default_compute_type
+        if requested != 'auto':
+            with self._lock:
+                transcriber = self._touch((model_size, requested))
+                if transcriber is not None:
+                    return transcriber
+        
+        compute_type, cpu_threads = self._resolve_compute(model_size, compute_type)
+        key = (model_size, compute_type)
+        
+        with self._lock:
+            transcriber = self._touch(key)
+            if transcriber is not None:
+                return transcriber
+            loading_lock = self._loading_locks.setdefault(key, threading.Lock())
+        
+        # Carregar fora do lock global (outros modelos continuam atendendo)
+        with loading_lock:
+            with self._lock:
+                transcriber = self._touch(key)
+                if transcriber is not None:
+                    return transcriber
+                self._evict_for(self.estimate_memory_mb(model_size, compute_type))
+            
+            print(f"[Registry] Carregando modelo {model_size} ({compute_type})...")
+            transcriber = WhisperTranscriber(
+                model_size=model_size,
+                models_path=self.models_path,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                **self.transcriber_options
+            )
+            
+            with self._lock:
+                self._loaded[key] = transcriber
+            return transcriber
+    
+    def _touch(self, key: Tuple[str, str]) -> Optional[WhisperTranscriber]:
+        """Transcritor carregado (marcado como usado agora) ou None (chamar com o lock)."""
+        transcriber = self._loaded.get(key)
+        if transcriber is not None:
+            self._loaded.move_to_end(key)
+        return transcriber
+    
+    def _resolve_compute(self, model_size: str, compute_type: Optional[str]) -> Tuple[str, int]:
+        """Resolver compute_type ('auto' consulta a calibração) e cpu_threads."""
+        compute_type = compute_type or self.default_compute_type
+        
+        if self.tuner is not None:
+            tuned_compute_type, cpu_threads = self.tuner.resolve(
+                model_size, resolve_model_path(model_size, self.models_path)
+            )
+            if compute_type == 'auto':
+                compute_type = tuned_compute_type
+            return compute_type, cpu_threads
+        
+        return ('int8' if compute_type == 'auto' else compute_type), 0
+    
+    def _evict_for(self, needed_mb: float):
+        """Descarregar modelos menos usados até caber mais um (chamar com o lock)."""
+        while self._loaded and (
+            len(self._loaded) >= self.max_loaded
+            or self._resident_mb() + needed_mb > self.memory_budget_mb
+        ):
+            # Sem close(): pedidos em andamento ainda podem usar o transcritor; os
+            # processos do modo paralelo são encerrados quando ele for coletado
+            (model_size, compute_type), _ = self._loaded.popitem(last=False)
+            print(f"[Registry] Modelo descarregado (LRU): {model_size} ({compute_type})")
+    
+    def _resident_mb(self) -> float:
+        return sum(
+            self.estimate_memory_mb(model_size, compute_type)
+            for model_size, compute_type in self._loaded
+        )
+    
+    def loaded(self) -> List[Dict[str, Any]]:
+        """Modelos residentes, do menos para o mais usado recentemente."""
+        with self._lock:
+            return [
+                {
+                    'model': model_size,
+                    'compute_type': compute_type,
+                    'ready': transcriber.is_ready,
+                    'estimated_mb': round(self.estimate_memory_mb(model_size, compute_type))
+                }
+                for (model_size, compute_type), transcriber in self._loaded.items()
+            ]
+    
+    def status(self) -> Dict[str, Any]:
+        """Resumo para o /status."""
+        loaded = self.loaded()
+        return {
+            'loaded': loaded,
+            'max_loaded': self.max_loaded,
+            'memory_budget_mb': self.memory_budget_mb,
+            'estimated_mb': sum(model['estimated_mb'] for model in loaded),
+            'available': list(SUPPORTED_MODELS)
+        }
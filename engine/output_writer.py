@@ -0,0 +1,105 @@
+"""
+Torio Tools Scribe - Output Writer
+Escrita incremental de legendas em disco, com renomeação atômica ao final.
+"""
+
+import os
+import json
+from pathlib import Path
+from contextlib import ExitStack
+from typing import Dict, Any, Hashable, Iterable, Iterator, Tuple, Union
+
+JSON_ITEM_INDENT = '    '  # Itens da lista 'segments' no json.dumps(indent=2)
+
+def iter_joined(parts: Iterable[str], separator: str = '\n') -> Iterator[str]:
+    """Equivalente incremental de separator.join(parts)."""
+    first = True
+    for part in parts:
+        if first:
+            first = False
+            yield part
+        else:
+            yield separator + part
+
+def iter_json_segments(items: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Equivalente incremental de json.dumps({'segments': items}, indent=2, ensure_ascii=False).
+    
+    Cada item é serializado sozinho: o documento nunca existe inteiro em memória.
+    """
+    empty = True
+    for item in items:
+        item_json = json.dumps(item, indent=2, ensure_ascii=False)
+        indented = '\n'.join(JSON_ITEM_INDENT + line for line in item_json.split('\n'))
+        yield ('{\n  "segments": [\n' if empty else ',\n') + indented
+        empty = False
+    
+    yield '{\n  "segments": []\n}' if empty else '\n  ]\n}'
+
+def iter_lockstep(sources: Dict[Hashable, Iterable[str]]) -> Iterator[Tuple[Hashable, str]]:
+    """
+    Pedaços de vários documentos intercalados: um de cada por vez, até todos acabarem.
+    
+    Com formatos gerados da mesma sequência de legendas (itertools.tee), os
+    iteradores andam juntos e o tee não acumula blocos em memória.
+    """
+    iterators = {key: iter(chunks) for key, chunks in sources.items()}
+    while iterators:
+        for key in list(iterators):
+            chunk = next(iterators[key], None)
+            if chunk is None:
+                del iterators[key]
+            else:
+                yield key, chunk
+
+def output_path_for(output_path: str, output_format: str, multiple: bool) -> str:
+    """Caminho de saída de um formato (com vários formatos, troca a extensão)."""
+    if not multiple:
+        return output_path
+    return str(Path(output_path).with_suffix(f'.{output_format}'))
+
+def write_atomic(output_path: Union[str, Path], chunks: Iterable[str]) -> int:
+    """
+    Gravar os pedaços num temporário ao lado do destino e renomear no final.
+    
+    Quem lê o destino nunca vê um arquivo pela metade; em caso de erro o
+    temporário é apagado e o destino anterior (se houver) fica intacto.
+    
+    Returns:
+        Bytes gravados
+    """
+    return write_atomic_many({output_path: chunks})[output_path]
+
+def write_atomic_many(outputs: Dict[Union[str, Path], Iterable[str]]) -> Dict[Union[str, Path], int]:
+    """
+    Gravar vários arquivos ao mesmo tempo, pedaço a pedaço (ver write_atomic).
+    
+    Os pedaços são intercalados (iter_lockstep): vários formatos de uma única
+    passada pelas legendas são gravados sem guardar nenhum deles em memória.
+    
+    Returns:
+        Bytes gravados por destino
+    """
+    paths = {key: Path(key) for key in outputs}
+    temp_paths = {}
+    
+    try:
+        with ExitStack() as stack:
+            files = {}
+            for key, path in paths.items():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                temp_paths[key] = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+                # newline='' mantém '\n' (mesmo conteúdo que a resposta JSON entregaria)
+                files[key] = stack.enter_context(open(temp_paths[key], 'w', encoding='utf-8', newline=''))
+            
+            for key, chunk in iter_lockstep(outputs):
+                files[key].write(chunk)
+        
+        for key, path in paths.items():
+            os.replace(temp_paths[key], path)
+    except BaseException:
+        for temp_path in temp_paths.values():
+            temp_path.unlink(missing_ok=True)
+        raise
+    
+    return {key: path.stat().st_size for key, path in paths.items()}
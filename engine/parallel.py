@@ -0,0 +1,199 @@
+"""
+Torio Tools Scribe - Parallel Chunked Transcription
+Divide o áudio em silêncios (VAD) e transcreve os trechos em processos separados.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+import numpy as np
+
+import metrics
+from segments import segment_to_dict, shift_segment_dict, segments_from_dicts
+
+SAMPLE_RATE = 16000
+
+MIN_CHUNK_SECONDS = 60  # Trechos menores não compensam o custo por processo
+CANCEL_POLL_SECONDS = 0.5  # Intervalo de verificação do cancelamento enquanto os trechos rodam
+
+# Modelo do processo worker (um por processo)
+_worker_model = None
+
+def _init_worker(model_path: str, compute_type: str, cpu_threads: int):
+    """Carregar modelo próprio no processo worker."""
+    global _worker_model
+    from faster_whisper import WhisperModel
+    
+    _worker_model = WhisperModel(
+        model_path,
+        device='cpu',
+        compute_type=compute_type,
+        cpu_threads=cpu_threads
+    )
+
+def _transcribe_chunk(audio: np.ndarray, offset: float, language: Optional[str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Transcrever um trecho e devolver segmentos com tempos globais."""
+    segments, info = _worker_model.transcribe(audio, language=language, **options)
+    return {
+        'language': info.language,
+        'language_probability': info.language_probability,
+        'segments': [shift_segment_dict(segment_to_dict(segment), offset) for segment in segments]
+    }
+
+def plan_chunks(speech: List[Dict[str, int]], total_samples: int, target_samples: int) -> List[Tuple[int, int]]:
+    """
+    Planejar trechos contíguos cortando no meio dos silêncios.
+    
+    Args:
+        speech: Regiões de fala do VAD ({'start', 'end'} em amostras)
+        total_samples: Tamanho total do áudio
+        target_samples: Tamanho desejado de cada trecho
+    
+    Returns:
+        Lista de (início, fim) em amostras cobrindo todo o áudio
+    """
+    bounds = [0]
+    chunk_start = 0
+    
+    for current, following in zip(speech, speech[1:]):
+        if current['end'] - chunk_start >= target_samples:
+            cut = (current['end'] + following['start']) // 2
+            bounds.append(cut)
+            chunk_start = cut
+    
+    bounds.append(total_samples)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+class ParallelChunkRunner:
+    """Pool de processos, cada um com seu próprio modelo e orçamento de threads."""
+    
+    def __init__(self, model_path: str, workers: int, compute_type: str = 'int8'):
+        """
+        Inicializar pool (os modelos são carregados no primeiro uso).
+        
+        Args:
+            model_path: Caminho ou nome do modelo
+            workers: Número de processos
+            compute_type: Tipo de computação do CTranslate2
+        """
+        self.model_path = model_path
+        self.workers = max(1, workers)
+        self.compute_type = compute_type
+        self.cpu_threads = max(1, (os.cpu_count() or 1) // self.workers)
+        self._executor = None
+        # Pedidos usando o pool atual (o cancelamento só encerra os processos sem outros usuários)
+        self._users = 0
+        self._lock = threading.Lock()
+    
+    def _acquire(self) -> ProcessPoolExecutor:
+        """Pool atual (criado se preciso), registrado como em uso por mais um pedido."""
+        with self._lock:
+            if self._executor is None:
+                print(f"[Parallel] Iniciando {self.workers} processos ({self.cpu_threads} threads cada)")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.model_path, self.compute_type, self.cpu_threads)
+                )
+            self._users += 1
+            return self._executor
+    
+    def _release(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if executor is self._executor:
+                self._users -= 1
+    
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        language: Optional[str],
+        options: Dict[str, Any],
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Transcrever áudio em trechos paralelos e costurar os segmentos.
+        
+        Returns:
+            Dict com segments (ordenados, tempos globais), duration e language
+        """
+        from faster_whisper.vad import get_speech_timestamps
+        
+        duration = len(audio) / SAMPLE_RATE
+        with metrics.timed('vad'):
+            speech = get_speech_timestamps(audio)
+        target = max(MIN_CHUNK_SECONDS, duration / (self.workers * 2))
+        chunks = plan_chunks(speech, len(audio), int(target * SAMPLE_RATE))
+        
+        print(f"[Parallel] {len(chunks)} trechos de ~{target:.0f}s em {self.workers} processos")
+        
+        executor = self._acquire()
+        futures = {
+            executor.submit(_transcribe_chunk, audio[start:end], start / SAMPLE_RATE, language, options): (start, end)
+            for start, end in chunks
+        }
+        
+        results = {}
+        processed = 0.0
+        pending = set(futures)
+        try:
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    # Trechos já em execução não param sozinhos: encerrar os processos
+                    # (se outro pedido usa o pool, os trechos deste terminam e são descartados)
+                    self._terminate(executor)
+                    break
+                done, pending = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, end = futures[future]
+                    results[start] = future.result()
+                    processed += (end - start) / SAMPLE_RATE
+                    if progress_callback:
+                        progress_callback(processed, duration)
+        finally:
+            for future in pending:
+                future.cancel()
+            self._release(executor)
+        
+        ordered = [results[start] for start in sorted(results)]
+        
+        # Idioma predominante: o que cobre mais trechos
+        languages = [result['language'] for result in ordered]
+        detected = max(set(languages), key=languages.count) if languages else language
+        
+        return {
+            'segments': segments_from_dicts(
+                segment for result in ordered for segment in result['segments']
+            ),
+            'duration': duration,
+            'language': detected
+        }
+    
+    def _terminate(self, executor: ProcessPoolExecutor):
+        """
+        Matar os processos no meio da decodificação (o próximo uso cria outro pool).
+        
+        Só quando o pedido que cancela é o único usuário do pool: os trechos
+        de outros pedidos em andamento quebrariam junto (BrokenProcessPool).
+        """
+        with self._lock:
+            if executor is not self._executor or self._users > 1:
+                return
+            self._users = 0
+            # ProcessPoolExecutor não expõe os processos; sem isso, os trechos rodariam até o fim
+            processes = list((self._executor._processes or {}).values())
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        
+        for process in processes:
+            process.terminate()
+        print(f"[Parallel] Cancelado: {len(processes)} processos encerrados")
+    
+    def close(self):
+        """Encerrar processos."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,185 @@
+"""
+Torio Tools Scribe - Profiling sob demanda
+Captura cProfile e pico de alocações (tracemalloc) de um pedido e guarda o resultado em disco.
+"""
+
+import io
+import json
+import time
+import uuid
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator, List
+
+TOP_FUNCTIONS = 40     # Funções listadas no resumo (por tempo acumulado)
+TOP_ALLOCATIONS = 25   # Linhas com mais memória ainda alocada ao fim
+TRACEMALLOC_FRAMES = 10
+
+class ProfileSession:
+    """Um pedido sendo perfilado."""
+    
+    def __init__(self, profile_id: str, label: str, details: Dict[str, Any]):
+        self.id = profile_id
+        self.label = label
+        self.details = details
+
+class ProfileStore:
+    """Executa pedidos sob cProfile + tracemalloc e mantém os últimos perfis em disco."""
+    
+    def __init__(self, profile_dir: Path, max_profiles: int = 20):
+        """
+        Inicializar armazenamento.
+        
+        Args:
+            profile_dir: Pasta dos artefatos (<id>.prof e <id>.json)
+            max_profiles: Perfis mantidos (os mais antigos são apagados)
+        """
+        self.profile_dir = Path(profile_dir)
+        self.max_profiles = max(1, max_profiles)
+        # cProfile e tracemalloc são globais ao processo: um pedido perfilado por vez
+        self._lock = threading.Lock()
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+    
+    @contextmanager
+    def profile(self, label: str, details: Optional[Dict[str, Any]] = None) -> Iterator[ProfileSession]:
+        """
+        Perfilar o bloco.
+        
+        O id fica disponível desde a entrada (para ir na resposta); o resumo é
+        gravado na saída, mesmo se o bloco falhar.
+        """
+        session = ProfileSession(uuid.uuid4().hex[:12], label, details or {})
+        
+        with self._lock:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            error = None
+            profiler.enable()
+            try:
+                yield session
+            except Exception as e:
+                error = str(e)
+                raise
+            finally:
+                profiler.disable()
+                elapsed = time.perf_counter() - started
+                current, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot()
+                if started_tracing:
+                    tracemalloc.stop()
+                
+                try:
+                    self._save(session, profiler, snapshot, {
+                        'elapsed_seconds': round(elapsed, 4),
+                        'memory': {
+                            'baseline_bytes': baseline,
+                            'peak_bytes': peak,
+                            'peak_increase_bytes': max(0, peak - baseline),
+                            'retained_bytes': max(0, current - baseline)
+                        },
+                        'error': error
+                    })
+                except OSError as e:
+                    print(f"[Profile] Erro ao gravar perfil {session.id}: {e}")
+    
+    def _save(self, session: ProfileSession, profiler: cProfile.Profile, snapshot, summary: Dict[str, Any]):
+        """Gravar o .prof (pstats) e o resumo JSON; aplicar o limite de perfis."""
+        prof_path = self.profile_dir / f'{session.id}.prof'
+        profiler.dump_stats(str(prof_path))
+        
+        data = {
+            'id': session.id,
+            'label': session.label,
+            'details': session.details,
+            'created_at': time.time(),
+            **summary,
+            'functions': _top_functions(profiler),
+            'allocations': _top_allocations(snapshot)
+        }
+        
+        with open(self.profile_dir / f'{session.id}.json', 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        
+        peak_mb = summary['memory']['peak_increase_bytes'] / (1024 * 1024)
+        print(f"[Profile] {session.label} {session.id}: {summary['elapsed_seconds']:.2f}s, pico +{peak_mb:.1f} MB")
+        self._prune()
+    
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Resumo de um perfil (ou None)."""
+        path = self._path(profile_id, 'json')
+        if path is None or not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def stats_path(self, profile_id: str) -> Optional[Path]:
+        """Arquivo pstats do perfil (abrir com snakeviz, pstats etc.)."""
+        path = self._path(profile_id, 'prof')
+        return path if path is not None and path.exists() else None
+    
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Perfis guardados, do mais recente para o mais antigo."""
+        profiles = []
+        for path in sorted(self.profile_dir.glob('*.json'), key=lambda p: p.stat().st_mtime, reverse=True):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            profiles.append({
+                'id': data['id'],
+                'label': data['label'],
+                'created_at': data['created_at'],
+                'elapsed_seconds': data['elapsed_seconds'],
+                'peak_increase_bytes': data['memory']['peak_increase_bytes'],
+                'error': data.get('error')
+            })
+        return profiles
+    
+    def _path(self, profile_id: str, extension: str) -> Optional[Path]:
+        # Ids são hexadecimais: nada de caminhos vindos da URL
+        if not profile_id or not all(c in '0123456789abcdef' for c in profile_id):
+            return None
+        return self.profile_dir / f'{profile_id}.{extension}'
+    
+    def _prune(self):
+        """Apagar os perfis mais antigos além do limite."""
+        summaries = sorted(self.profile_dir.glob('*.json'), key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in summaries[self.max_profiles:]:
+            path.unlink(missing_ok=True)
+            path.with_suffix('.prof').unlink(missing_ok=True)
+
+def _top_functions(profiler: cProfile.Profile) -> List[Dict[str, Any]]:
+    """Funções com maior tempo acumulado."""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, name), (calls, total_calls, own_time, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f'{filename}:{line}({name})',
+            'calls': total_calls,
+            'own_seconds': round(own_time, 4),
+            'cumulative_seconds': round(cumulative, 4)
+        })
+    rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+    return rows[:TOP_FUNCTIONS]
+
+def _top_allocations(snapshot) -> List[Dict[str, Any]]:
+    """Linhas com mais memória alocada ao fim do pedido."""
+    return [
+        {
+            'location': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+            'bytes': stat.size,
+            'blocks': stat.count
+        }
+        for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]
+    ]
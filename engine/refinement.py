@@ -0,0 +1,78 @@
+"""
+Torio Tools Scribe - Refinement
+Confiança por segmento e escolha dos trechos redecodificados com um modelo maior.
+
+O modelo rápido transcreve tudo; só os segmentos com sinais de erro (logprob
+médio baixo, provável silêncio com texto, texto repetitivo) voltam a ser
+decodificados pelo modelo grande.
+"""
+
+import math
+from typing import Optional, Dict, Any, List, Tuple
+
+DEFAULT_THRESHOLDS = {
+    'min_avg_logprob': -0.8,       # Logprob médio abaixo disso: palavras duvidosas
+    'max_no_speech_prob': 0.6,     # Provável silêncio/ruído transcrito como fala
+    'max_compression_ratio': 2.4,  # Texto repetitivo (alucinação típica do Whisper)
+}
+
+MERGE_GAP = 1.0  # Trechos fracos separados por menos que isso são redecodificados juntos (s)
+
+def resolve_thresholds(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """Limiares padrão com os valores do pedido por cima (chaves desconhecidas são ignoradas)."""
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for key, value in (overrides or {}).items():
+        if key in thresholds and value is not None:
+            thresholds[key] = float(value)
+    return thresholds
+
+def segment_confidence(segment) -> Dict[str, Optional[float]]:
+    """
+    Sinais de confiança do segmento.
+
+    confidence é exp(avg_logprob): a probabilidade média por token (0 a 1).
+    """
+    avg_logprob = getattr(segment, 'avg_logprob', None)
+    no_speech_prob = getattr(segment, 'no_speech_prob', None)
+    compression_ratio = getattr(segment, 'compression_ratio', None)
+    return {
+        'confidence': round(math.exp(avg_logprob), 3) if avg_logprob is not None else None,
+        'avg_logprob': round(avg_logprob, 3) if avg_logprob is not None else None,
+        'no_speech_prob': round(no_speech_prob, 3) if no_speech_prob is not None else None,
+        'compression_ratio': round(compression_ratio, 3) if compression_ratio is not None else None
+    }
+
+def weak_reasons(segment, thresholds: Dict[str, float]) -> List[str]:
+    """Motivos para redecodificar o segmento (lista vazia = confiável)."""
+    if not segment.text.strip():
+        return []
+
+    reasons = []
+    avg_logprob = getattr(segment, 'avg_logprob', None)
+    no_speech_prob = getattr(segment, 'no_speech_prob', None)
+    compression_ratio = getattr(segment, 'compression_ratio', None)
+
+    if avg_logprob is not None and avg_logprob < thresholds['min_avg_logprob']:
+        reasons.append('avg_logprob')
+    if no_speech_prob is not None and no_speech_prob > thresholds['max_no_speech_prob']:
+        reasons.append('no_speech_prob')
+    if compression_ratio is not None and compression_ratio > thresholds['max_compression_ratio']:
+        reasons.append('compression_ratio')
+    return reasons
+
+def plan_refinement(segments: List, thresholds: Dict[str, float]) -> List[Tuple[float, float]]:
+    """
+    Trechos (início, fim) a redecodificar.
+
+    Cada trecho cobre segmentos fracos inteiros; vizinhos próximos viram um
+    trecho só (menos chamadas ao modelo e mais contexto para ele).
+    """
+    windows: List[List[float]] = []
+    for segment in segments:
+        if not weak_reasons(segment, thresholds):
+            continue
+        if windows and segment.start - windows[-1][1] <= MERGE_GAP:
+            windows[-1][1] = max(windows[-1][1], segment.end)
+        else:
+            windows.append([segment.start, segment.end])
+    return [(start, end) for start, end in windows]
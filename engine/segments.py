@@ -0,0 +1,59 @@
+"""
+Torio Tools Scribe - Segment Records
+Representação serializável dos segmentos do faster-whisper.
+"""
+
+from types import SimpleNamespace
+from typing import Dict, Any, Iterable, List
+
+def segment_to_dict(segment) -> Dict[str, Any]:
+    """Converter segmento (faster-whisper ou registro) em dict serializável."""
+    words = getattr(segment, 'words', None) or []
+    return {
+        'start': segment.start,
+        'end': segment.end,
+        'text': segment.text,
+        'avg_logprob': getattr(segment, 'avg_logprob', None),
+        'no_speech_prob': getattr(segment, 'no_speech_prob', None),
+        'compression_ratio': getattr(segment, 'compression_ratio', None),
+        'words': [
+            {
+                'start': word.start,
+                'end': word.end,
+                'word': word.word,
+                'probability': word.probability
+            }
+            for word in words
+        ]
+    }
+
+def segment_from_dict(data: Dict[str, Any]) -> SimpleNamespace:
+    """Reconstruir segmento com a mesma interface de atributos do faster-whisper."""
+    return SimpleNamespace(
+        start=data['start'],
+        end=data['end'],
+        text=data['text'],
+        avg_logprob=data.get('avg_logprob'),
+        no_speech_prob=data.get('no_speech_prob'),
+        compression_ratio=data.get('compression_ratio'),
+        words=[SimpleNamespace(**word) for word in data.get('words') or []]
+    )
+
+def segments_to_dicts(segments: Iterable) -> List[Dict[str, Any]]:
+    """Converter lista de segmentos em dicts."""
+    return [segment_to_dict(segment) for segment in segments]
+
+def segments_from_dicts(data: Iterable[Dict[str, Any]]) -> List[SimpleNamespace]:
+    """Reconstruir lista de segmentos a partir de dicts."""
+    return [segment_from_dict(item) for item in data]
+
+def shift_segment_dict(data: Dict[str, Any], offset: float) -> Dict[str, Any]:
+    """Deslocar tempos de um segmento (e de suas palavras) em `offset` segundos."""
+    shifted = dict(data)
+    shifted['start'] = data['start'] + offset
+    shifted['end'] = data['end'] + offset
+    shifted['words'] = [
+        {**word, 'start': word['start'] + offset, 'end': word['end'] + offset}
+        for word in data.get('words') or []
+    ]
+    return shifted
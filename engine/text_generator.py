@@ -3,9 +3,37 @@ Torio Tools Scribe - Text Subtitle Generator
 Gera legendas a partir de texto com segmentação profissional.
 """
 
+import os
 import re
+import json
 import math
-from typing import Dict, Any, List, Optional
+import itertools
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+import metrics
+from output_writer import iter_joined, iter_json_segments, iter_lockstep, output_path_for, write_atomic_many
+from alignment import align_tokens
+
+FORMATS = ('srt', 'vtt', 'ass', 'json', 'txt')
+
+# Texto inteiro, caminho de um arquivo UTF-8, arquivo aberto ou iterador de pedaços de texto
+TextSource = Union[str, os.PathLike, Iterable[str]]
+
+_REPEATED_SPACES = re.compile(r' {2,}')
+
+ASS_HEADER = """[Script Info]
+Title: Torio Tools Scribe
+ScriptType: v4.00+
+Collisions: Normal
+PlayDepth: 0
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Arial,48,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,-1,0,0,0,100,100,0,0,1,2,1,2,20,20,20,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
 
 class TextSubtitleGenerator:
     """Gera legendas SRT a partir de texto com timing calculado."""
@@ -22,130 +50,349 @@ class TextSubtitleGenerator:
             'words_per_minute': 150,        # Velocidade de leitura padrão
         }
     
+    def _settings(self, settings: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Configurações padrão com as do pedido por cima."""
+        cfg = {**self.default_settings}
+        if settings:
+            cfg.update(settings)
+        return cfg
+    
     def generate_subtitles(
         self,
-        text: str,
-        output_format: str = 'srt',
+        text: TextSource,
+        output_format: Union[str, List[str]] = 'srt',
         settings: Optional[Dict[str, Any]] = None,
-        start_time: float = 0.0
+        start_time: float = 0.0,
+        output_path: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Gerar legendas a partir de texto.
         
+        O texto passa parágrafo a parágrafo por limpeza, segmentação, timing,
+        normalização e formatação; com output_path, cada bloco vai direto
+        para o arquivo. Nenhuma etapa guarda o texto ou a lista de blocos.
+        
         Args:
-            text: Texto para converter em legendas
-            output_format: Formato de saída (srt, vtt, ass, json, txt)
+            text: Texto, caminho (Path) de um arquivo UTF-8, arquivo aberto ou iterador de str
+            output_format: Formato de saída (srt, vtt, ass, json, txt) ou lista de formatos
             settings: Configurações de legenda
             start_time: Tempo inicial em segundos
+            output_path: Gravar a legenda neste arquivo em vez de devolvê-la
         
         Returns:
-            Dict com subtitles e estatísticas
+            Dict com subtitles (texto, ou dict formato -> texto quando
+            output_format é uma lista) ou outputs (arquivos gravados) e estatísticas
         """
-        # Mesclar settings
-        cfg = {**self.default_settings}
-        if settings:
-            cfg.update(settings)
+        # As etapas correm intercaladas, bloco a bloco: um único tempo para todas
+        with metrics.timed('text_generate'):
+            cues = self.iter_subtitles(text, settings, start_time)
+            subtitles, outputs, summary = self._deliver(cues, output_format, output_path)
         
-        # Limpar texto
-        text = self._clean_text(text)
+        return {
+            'subtitles': subtitles,
+            'outputs': outputs,
+            'duration': summary['duration'],
+            'segment_count': summary['segment_count'],
+            'detected_language': 'pt'  # Placeholder
+        }
+    
+    def iter_subtitles(
+        self,
+        text: TextSource,
+        settings: Optional[Dict[str, Any]] = None,
+        start_time: float = 0.0
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Blocos (text, start, end, duration) à medida que são gerados.
         
-        # Segmentar em blocos
-        segments = self._segment_text(text, cfg)
+        Os primeiros blocos saem assim que o primeiro parágrafo é lido; a
+        memória fica limitada a um parágrafo, qualquer que seja o tamanho do texto.
+        """
+        cfg = self._settings(settings)
+        segments = self._iter_segments(text, cfg)
+        return self._iter_normalized(self._iter_timing(segments, cfg, start_time), cfg)
+    
+    def stream_subtitles(
+        self,
+        text: TextSource,
+        output_format: str = 'srt',
+        settings: Optional[Dict[str, Any]] = None,
+        start_time: float = 0.0
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Gerar legendas emitindo cada bloco assim que fica pronto.
+        
+        Eventos emitidos (dicts), como no streaming da transcrição:
+            start: formato e cabeçalho do documento
+            cue: bloco formatado (index, start, end, text, formatted)
+            summary: total de blocos e duração
+        """
+        if output_format not in FORMATS:
+            output_format = 'srt'
         
-        # Calcular timing para cada segmento
-        timed_segments = self._calculate_timing(segments, cfg, start_time)
+        yield {
+            'type': 'start',
+            'format': output_format,
+            'header': self._document_header(output_format)
+        }
         
-        # Normalizar timing (remover overlaps)
-        normalized_segments = self._normalize_timing(timed_segments, cfg)
+        count = 0
+        end = 0
+        for index, seg in enumerate(self.iter_subtitles(text, settings, start_time), 1):
+            count = index
+            end = seg['end']
+            yield {
+                'type': 'cue',
+                'index': index,
+                'start': round(seg['start'], 3),
+                'end': round(seg['end'], 3),
+                'text': seg['text'],
+                'formatted': self._render_cue(output_format, index, seg)
+            }
         
-        # Formatar saída
-        if output_format == 'srt':
-            subtitles = self._format_srt(normalized_segments)
-        elif output_format == 'vtt':
-            subtitles = self._format_vtt(normalized_segments)
-        elif output_format == 'ass':
-            subtitles = self._format_ass(normalized_segments)
-        elif output_format == 'json':
-            subtitles = self._format_json(normalized_segments)
-        elif output_format == 'txt':
-            subtitles = '\n'.join([s['text'] for s in normalized_segments])
-        else:
-            subtitles = self._format_srt(normalized_segments)
+        yield {
+            'type': 'summary',
+            'segment_count': count,
+            'duration': end
+        }
+
+    def align_subtitles(
+        self,
+        text: str,
+        words: List[Dict[str, Any]],
+        output_format: Union[str, List[str]] = 'srt',
+        settings: Optional[Dict[str, Any]] = None,
+        output_path: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Gerar legendas de um roteiro com os tempos reais do áudio.
+        
+        O texto é segmentado como em generate_subtitles; o tempo de cada bloco
+        vem das palavras reconhecidas (start, end, word) em vez de CPS/WPM.
+        
+        Returns:
+            Mesmo formato de generate_subtitles, com alignment (palavras casadas)
+        """
+        cfg = self._settings(settings)
+        
+        with metrics.timed('text_align'):
+            # O alinhamento precisa de todas as palavras do roteiro de uma vez
+            segments = list(self._iter_segments(text, cfg))
+            
+            tokens = [segment['raw_text'].split() for segment in segments]
+            times, matched = align_tokens([token for cue in tokens for token in cue], words)
+            
+            timed = []
+            position = 0
+            for segment, cue_tokens in zip(segments, tokens):
+                cue_times = times[position:position + len(cue_tokens)]
+                position += len(cue_tokens)
+                timed.append({
+                    'text': segment['text'],
+                    'start': cue_times[0][0],
+                    'end': cue_times[-1][1]
+                })
+            
+            normalized = self._iter_normalized(self._hold_aligned(timed, cfg), cfg)
+        
+        with metrics.timed('text_format'):
+            subtitles, outputs, summary = self._deliver(normalized, output_format, output_path)
         
-        # Calcular duração total
-        total_duration = normalized_segments[-1]['end'] if normalized_segments else 0
+        total_words = len(times)
+        print(f"[TextGenerator] Roteiro alinhado: {matched}/{total_words} palavras casadas com o áudio")
         
         return {
             'subtitles': subtitles,
-            'duration': total_duration,
-            'segment_count': len(normalized_segments),
-            'detected_language': 'pt'  # Placeholder
+            'outputs': outputs,
+            'duration': summary['duration'],
+            'segment_count': summary['segment_count'],
+            'detected_language': language,
+            'alignment': {
+                'matched_words': matched,
+                'total_words': total_words,
+                'match_ratio': round(matched / total_words, 3) if total_words else 0.0
+            }
         }
     
-    def _clean_text(self, text: str) -> str:
-        """Limpar e normalizar texto."""
-        # Remover quebras de linha excessivas
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        # Normalizar espaços
-        text = re.sub(r' {2,}', ' ', text)
-        # Remover espaços no início/fim das linhas
-        lines = [line.strip() for line in text.split('\n')]
-        return '\n'.join(lines)
+    def _hold_aligned(self, segments: List[Dict], cfg: Dict) -> List[Dict]:
+        """Estender blocos curtos até min_duration sem encostar no próximo (gap)."""
+        min_duration = cfg['min_duration_ms'] / 1000
+        gap = cfg['gap_ms'] / 1000
+        
+        for i, segment in enumerate(segments):
+            if segment['end'] - segment['start'] >= min_duration:
+                continue
+            end = segment['start'] + min_duration
+            if i + 1 < len(segments):
+                end = min(end, segments[i + 1]['start'] - gap)
+            segment['end'] = max(segment['end'], end)
+        return segments
+
+    def _deliver(
+        self,
+        segments: Iterable[Dict],
+        output_format: Union[str, List[str]],
+        output_path: Optional[str] = None
+    ) -> Tuple[Optional[Union[str, Dict[str, str]]], Optional[Dict[str, Dict[str, Any]]], Dict[str, Any]]:
+        """
+        Texto na resposta (um formato ou dict formato -> texto) ou arquivos em output_path.
+        
+        Os blocos são percorridos uma única vez, mesmo com vários formatos.
+        
+        Returns:
+            Tupla (subtitles, outputs, resumo com segment_count e duration)
+        """
+        multiple = isinstance(output_format, (list, tuple))
+        formats = list(dict.fromkeys(output_format)) if multiple else [output_format]
+        summary = {'segment_count': 0, 'duration': 0}
+        
+        # Cada formato lê sua cópia da sequência; avançando juntos, o tee quase não guarda blocos
+        counted = self._count_cues(segments, summary)
+        streams = itertools.tee(counted, len(formats)) if multiple else [counted]
+        chunks = {fmt: self._iter_output(stream, fmt) for fmt, stream in zip(formats, streams)}
+        
+        if output_path:
+            return None, self._write_outputs(chunks, output_path, multiple, summary), summary
+        
+        if not multiple:
+            return ''.join(chunks[output_format]), None, summary
+        
+        parts = {fmt: [] for fmt in formats}
+        for fmt, chunk in iter_lockstep(chunks):
+            parts[fmt].append(chunk)
+        return {fmt: ''.join(parts[fmt]) for fmt in formats}, None, summary
+    
+    def _count_cues(self, segments: Iterable[Dict], summary: Dict[str, Any]) -> Iterator[Dict]:
+        """Repassar os blocos contando-os e guardando o fim do último em summary."""
+        for seg in segments:
+            summary['segment_count'] += 1
+            summary['duration'] = seg['end']
+            yield seg
+    
+    def _write_outputs(
+        self,
+        chunks: Dict[str, Iterable[str]],
+        output_path: str,
+        multiple: bool,
+        summary: Dict[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Gravar os formatos em disco ao mesmo tempo, bloco a bloco (com vários formatos, troca a extensão)."""
+        paths = {fmt: output_path_for(output_path, fmt, multiple) for fmt in chunks}
+        sizes = write_atomic_many({paths[fmt]: fmt_chunks for fmt, fmt_chunks in chunks.items()})
+        
+        outputs = {}
+        for fmt, path in paths.items():
+            size = sizes[path]
+            outputs[fmt] = {'path': path, 'cue_count': summary['segment_count'], 'bytes': size}
+            print(f"[TextGenerator] Legenda gravada: {path} ({summary['segment_count']} blocos, {size} bytes)")
+        return outputs
+    
+    def _iter_output(self, segments: Iterable[Dict], output_format: str) -> Iterator[str]:
+        """Documento em pedaços, bloco a bloco (para gravar direto em disco)."""
+        if output_format == 'vtt':
+            return iter_joined(self._iter_vtt(segments))
+        elif output_format == 'ass':
+            return iter_joined(self._iter_ass(segments))
+        elif output_format == 'json':
+            return iter_json_segments(self._iter_json(segments))
+        elif output_format == 'txt':
+            return iter_joined(s['text'] for s in segments)
+        return iter_joined(self._iter_srt(segments))
     
-    def _segment_text(self, text: str, cfg: Dict) -> List[Dict]:
-        """Segmentar texto em blocos respeitando limites."""
+    def _iter_segments(self, text: TextSource, cfg: Dict) -> Iterator[Dict]:
+        """Blocos do texto inteiro, parágrafo a parágrafo."""
+        for paragraph in self._iter_paragraphs(text):
+            yield from self._segment_paragraph(paragraph, cfg)
+    
+    def _iter_paragraphs(self, text: TextSource) -> Iterator[str]:
+        """
+        Parágrafos limpos: linhas sem espaços nas pontas nem espaços repetidos.
+        
+        Linhas em branco separam parágrafos; as demais quebras ficam no texto.
+        """
+        lines = []
+        for line in self._iter_lines(text):
+            line = _REPEATED_SPACES.sub(' ', line).strip()
+            if line:
+                lines.append(line)
+            elif lines:
+                yield '\n'.join(lines)
+                lines = []
+        
+        if lines:
+            yield '\n'.join(lines)
+    
+    def _iter_lines(self, text: TextSource) -> Iterator[str]:
+        """Linhas do texto, sem o '\\n' (a string nunca é dividida de uma vez)."""
+        if isinstance(text, str):
+            start = 0
+            while True:
+                end = text.find('\n', start)
+                if end < 0:
+                    yield text[start:]
+                    return
+                yield text[start:end]
+                start = end + 1
+        
+        if isinstance(text, os.PathLike):
+            with open(text, 'r', encoding='utf-8') as f:
+                yield from self._iter_lines(f)
+            return
+        
+        # Arquivo (linha a linha) ou iterador de pedaços arbitrários
+        pending = ''
+        for chunk in text:
+            pending += chunk
+            *lines, pending = pending.split('\n')
+            yield from lines
+        yield pending
+
+    def _segment_paragraph(self, paragraph: str, cfg: Dict) -> Iterator[Dict]:
+        """Segmentar um parágrafo em blocos respeitando limites."""
         max_chars = cfg['max_chars_per_cue']
         max_line_chars = cfg['max_chars_per_line']
         max_lines = cfg['max_lines_per_cue']
         
-        segments = []
+        # Dividir parágrafo em sentenças
+        sentences = self._split_sentences(paragraph)
         
-        # Dividir por parágrafos primeiro
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+        current_segment = []
+        current_chars = 0
         
-        for paragraph in paragraphs:
-            # Dividir parágrafo em sentenças
-            sentences = self._split_sentences(paragraph)
+        for sentence in sentences:
+            sentence = sentence.strip()
+            if not sentence:
+                continue
             
-            current_segment = []
-            current_chars = 0
+            sentence_len = len(sentence)
             
-            for sentence in sentences:
-                sentence = sentence.strip()
-                if not sentence:
-                    continue
+            # Se a sentença sozinha é maior que o limite, dividir
+            if sentence_len > max_chars:
+                # Finalizar segmento atual se houver
+                if current_segment:
+                    yield self._create_segment(' '.join(current_segment), max_line_chars, max_lines)
+                    current_segment = []
+                    current_chars = 0
                 
-                sentence_len = len(sentence)
+                # Dividir sentença longa
+                yield from self._split_long_text(sentence, max_chars, max_line_chars, max_lines)
                 
-                # Se a sentença sozinha é maior que o limite, dividir
-                if sentence_len > max_chars:
-                    # Finalizar segmento atual se houver
-                    if current_segment:
-                        segments.append(self._create_segment(' '.join(current_segment), max_line_chars, max_lines))
-                        current_segment = []
-                        current_chars = 0
-                    
-                    # Dividir sentença longa
-                    sub_segments = self._split_long_text(sentence, max_chars, max_line_chars, max_lines)
-                    segments.extend(sub_segments)
-                    
-                elif current_chars + sentence_len + 1 > max_chars:
-                    # Segmento atual + nova sentença excede limite
-                    if current_segment:
-                        segments.append(self._create_segment(' '.join(current_segment), max_line_chars, max_lines))
-                    current_segment = [sentence]
-                    current_chars = sentence_len
-                    
-                else:
-                    # Adicionar sentença ao segmento atual
-                    current_segment.append(sentence)
-                    current_chars += sentence_len + 1
-            
-            # Finalizar último segmento do parágrafo
-            if current_segment:
-                segments.append(self._create_segment(' '.join(current_segment), max_line_chars, max_lines))
+            elif current_chars + sentence_len + 1 > max_chars:
+                # Segmento atual + nova sentença excede limite
+                if current_segment:
+                    yield self._create_segment(' '.join(current_segment), max_line_chars, max_lines)
+                current_segment = [sentence]
+                current_chars = sentence_len
+                
+            else:
+                # Adicionar sentença ao segmento atual
+                current_segment.append(sentence)
+                current_chars += sentence_len + 1
         
-        return segments
+        # Finalizar último segmento do parágrafo
+        if current_segment:
+            yield self._create_segment(' '.join(current_segment), max_line_chars, max_lines)
     
     def _split_sentences(self, text: str) -> List[str]:
         """Dividir texto em sentenças."""
@@ -213,7 +460,7 @@ class TextSubtitleGenerator:
         
         return lines if lines else [text[:max_chars]]
     
-    def _calculate_timing(self, segments: List[Dict], cfg: Dict, start_time: float) -> List[Dict]:
+    def _iter_timing(self, segments: Iterable[Dict], cfg: Dict, start_time: float) -> Iterator[Dict]:
         """Calcular timing para cada segmento."""
         wpm = cfg['words_per_minute']
         max_cps = cfg['max_cps']
@@ -222,7 +469,6 @@ class TextSubtitleGenerator:
         gap = cfg['gap_ms'] / 1000
         
         current_time = start_time
-        timed = []
         
         for segment in segments:
             text = segment['raw_text']
@@ -241,41 +487,30 @@ class TextSubtitleGenerator:
             # Aplicar limites
             duration = max(min_duration, min(duration, max_duration))
             
-            timed.append({
+            yield {
                 'text': segment['text'],
                 'start': current_time,
                 'end': current_time + duration,
                 'duration': duration
-            })
+            }
             
             current_time += duration + gap
-        
-        return timed
     
-    def _normalize_timing(self, segments: List[Dict], cfg: Dict) -> List[Dict]:
-        """Normalizar timing para remover overlaps."""
-        if not segments:
-            return segments
-        
+    def _iter_normalized(self, segments: Iterable[Dict], cfg: Dict) -> Iterator[Dict]:
+        """Normalizar timing para remover overlaps (ajusta os blocos recebidos, sem copiá-los)."""
         gap = cfg['gap_ms'] / 1000
         min_duration = cfg['min_duration_ms'] / 1000
         
-        normalized = []
-        
-        for i, segment in enumerate(segments):
-            seg = segment.copy()
-            
+        prev = None
+        for seg in segments:
             # Verificar overlap com segmento anterior
-            if normalized:
-                prev = normalized[-1]
-                if seg['start'] < prev['end'] + gap:
-                    seg['start'] = prev['end'] + gap
-                    # Recalcular end mantendo duração mínima
-                    seg['end'] = max(seg['start'] + min_duration, seg['end'])
+            if prev is not None and seg['start'] < prev['end'] + gap:
+                seg['start'] = prev['end'] + gap
+                # Recalcular end mantendo duração mínima
+                seg['end'] = max(seg['start'] + min_duration, seg['end'])
             
-            normalized.append(seg)
-        
-        return normalized
+            prev = seg
+            yield seg
     
     def _format_timestamp_srt(self, seconds: float) -> str:
         """Formatar timestamp para SRT (HH:MM:SS,mmm)."""
@@ -301,55 +536,62 @@ class TextSubtitleGenerator:
         centis = int((seconds % 1) * 100)
         return f"{hours}:{minutes:02d}:{secs:02d}.{centis:02d}"
     
-    def _format_srt(self, segments: List[Dict]) -> str:
-        """Formatar como SRT."""
-        srt_parts = []
-        for i, seg in enumerate(segments, 1):
-            start_ts = self._format_timestamp_srt(seg['start'])
-            end_ts = self._format_timestamp_srt(seg['end'])
-            srt_parts.append(f"{i}\n{start_ts} --> {end_ts}\n{seg['text']}\n")
-        return '\n'.join(srt_parts)
+    def _document_header(self, output_format: str) -> str:
+        """Cabeçalho do documento (antes do primeiro bloco)."""
+        if output_format == 'vtt':
+            return "WEBVTT\n"
+        elif output_format == 'ass':
+            return ASS_HEADER
+        return ''
     
-    def _format_vtt(self, segments: List[Dict]) -> str:
-        """Formatar como WebVTT."""
-        vtt_parts = ["WEBVTT\n"]
-        for seg in segments:
+    def _render_cue(self, output_format: str, index: int, seg: Dict) -> str:
+        """Renderizar um único bloco no formato pedido."""
+        if output_format == 'vtt':
             start_ts = self._format_timestamp_vtt(seg['start'])
             end_ts = self._format_timestamp_vtt(seg['end'])
-            vtt_parts.append(f"{start_ts} --> {end_ts}\n{seg['text']}\n")
-        return '\n'.join(vtt_parts)
-    
-    def _format_ass(self, segments: List[Dict]) -> str:
-        """Formatar como ASS/SSA."""
-        ass_header = """[Script Info]
-Title: Torio Tools Scribe
-ScriptType: v4.00+
-Collisions: Normal
-PlayDepth: 0
-
-[V4+ Styles]
-Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
-Style: Default,Arial,48,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,-1,0,0,0,100,100,0,0,1,2,1,2,20,20,20,1
-
-[Events]
-Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
-"""
-        ass_parts = [ass_header]
-        for seg in segments:
+            return f"{start_ts} --> {end_ts}\n{seg['text']}\n"
+        elif output_format == 'ass':
             start_ts = self._format_timestamp_ass(seg['start'])
             end_ts = self._format_timestamp_ass(seg['end'])
             # Substituir \n por \\N para ASS
             text = seg['text'].replace('\n', '\\N')
-            ass_parts.append(f"Dialogue: 0,{start_ts},{end_ts},Default,,0,0,0,,{text}")
-        return '\n'.join(ass_parts)
+            return f"Dialogue: 0,{start_ts},{end_ts},Default,,0,0,0,,{text}"
+        elif output_format == 'json':
+            return json.dumps(self._json_item(index, seg), ensure_ascii=False)
+        elif output_format == 'txt':
+            return seg['text']
+        
+        start_ts = self._format_timestamp_srt(seg['start'])
+        end_ts = self._format_timestamp_srt(seg['end'])
+        return f"{index}\n{start_ts} --> {end_ts}\n{seg['text']}\n"
     
-    def _format_json(self, segments: List[Dict]) -> str:
-        """Formatar como JSON."""
-        import json
-        json_segments = [{
-            'id': i + 1,
+    def _json_item(self, index: int, seg: Dict) -> Dict[str, Any]:
+        """Item do JSON."""
+        return {
+            'id': index,
             'start': round(seg['start'], 3),
             'end': round(seg['end'], 3),
             'text': seg['text']
-        } for i, seg in enumerate(segments)]
-        return json.dumps({'segments': json_segments}, indent=2, ensure_ascii=False)
+        }
+    
+    def _iter_srt(self, segments: Iterable[Dict]) -> Iterator[str]:
+        """Blocos SRT."""
+        for i, seg in enumerate(segments, 1):
+            yield self._render_cue('srt', i, seg)
+    
+    def _iter_vtt(self, segments: Iterable[Dict]) -> Iterator[str]:
+        """Cabeçalho e blocos WebVTT."""
+        yield self._document_header('vtt')
+        for i, seg in enumerate(segments, 1):
+            yield self._render_cue('vtt', i, seg)
+    
+    def _iter_ass(self, segments: Iterable[Dict]) -> Iterator[str]:
+        """Cabeçalho e linhas Dialogue ASS/SSA."""
+        yield self._document_header('ass')
+        for i, seg in enumerate(segments, 1):
+            yield self._render_cue('ass', i, seg)
+    
+    def _iter_json(self, segments: Iterable[Dict]) -> Iterator[Dict[str, Any]]:
+        """Itens do JSON."""
+        for i, seg in enumerate(segments, 1):
+            yield self._json_item(i, seg)
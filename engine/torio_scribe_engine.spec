@@ -5,7 +5,7 @@ a = Analysis(
     ['H:\\dev\\torio-tools-scribe\\engine\\main.py'],
     pathex=[],
     binaries=[],
-    datas=[('H:\\dev\\torio-tools-scribe\\engine\\transcriber.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\text_generator.py', '.')],
+    datas=[('H:\\dev\\torio-tools-scribe\\engine\\transcriber.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\text_generator.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\config.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\segments.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\transcription_cache.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\jobs.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\parallel.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\model_registry.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\autotune.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\metrics.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\profiling.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\audio_cache.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\output_writer.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\cli.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\watcher.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\language_detection.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\refinement.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\alignment.py', '.'), ('H:\\dev\\torio-tools-scribe\\engine\\windowed.py', '.')],
     hiddenimports=['flask', 'flask_cors', 'faster_whisper', 'ctranslate2', 'tokenizers', 'huggingface_hub'],
     hookspath=[],
     hooksconfig={},
@@ -7,10 +7,35 @@ import os
 import sys
 import json
 import subprocess
-import tempfile
+import time
+import threading
+import itertools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
-from faster_whisper import WhisperModel
+from contextlib import contextmanager, nullcontext
+from typing import Optional, Dict, Any, BinaryIO, Iterable, Iterator, List, Tuple, Union, Callable
+
+import numpy as np
+
+import metrics
+from transcription_cache import TranscriptionCache
+from audio_cache import AudioCache
+from language_detection import (
+    LanguageCache, media_duration, plan_windows, merge_probabilities,
+    DEFAULT_WINDOWS, DEFAULT_WINDOW_SECONDS, DEFAULT_TOP_K, MAX_WINDOWS, MIN_REUSE_PROBABILITY
+)
+from parallel import ParallelChunkRunner
+from output_writer import iter_joined, iter_json_segments, output_path_for, write_atomic
+from segments import segment_to_dict, segment_from_dict, segments_to_dicts, segments_from_dicts, shift_segment_dict
+from refinement import resolve_thresholds, plan_refinement, segment_confidence
+from alignment import ALIGN_BEAM_SIZE
+from windowed import (
+    ArrayWindowReader, PipeWindowReader, TailWindowReader,
+    DECODE_WINDOW_SECONDS, MIN_DECODE_WINDOW_SECONDS,
+    WINDOW_TAIL_SECONDS, WINDOWED_AUTO_SECONDS, PROMPT_CHARS,
+    DEFAULT_TAIL_LATENCY, MIN_TAIL_LATENCY, TAIL_WINDOW_SECONDS, TAIL_GUARD_SECONDS, TAIL_IDLE_SECONDS
+)
 
 def get_ffmpeg_path():
     """Obter caminho do FFmpeg (local ou sistema)."""
@@ -30,105 +55,601 @@ def get_ffmpeg_path():
     # Fallback: tentar ffmpeg do sistema
     return 'ffmpeg'
 
+SAMPLE_RATE = 16000  # Taxa esperada pelo Whisper
+
+DEFAULT_BEAM_SIZE = 5   # Decodificação sequencial (qualidade máxima)
+BATCHED_BEAM_SIZE = 1   # Modo em lote: busca gulosa, prioriza throughput
+DEFAULT_BATCH_SIZE = 8  # Janelas VAD decodificadas juntas no modo em lote
+
+PIPE_CHUNK_SIZE = 1 << 20  # Leitura do stdout do FFmpeg em blocos de 1 MB
+
+VIDEO_EXTENSIONS = ['.mp4', '.mov', '.mkv', '.avi', '.webm', '.flv', '.wmv']
+
+SUBTITLE_FORMATS = ('srt', 'vtt', 'ass', 'json', 'txt')
+
+SENTENCE_ENDINGS = ('.', '!', '?', '…')  # Cortes preferidos entre legendas
+MERGE_MAX_GAP = 0.3  # Pausa máxima (s) para unir uma legenda curta à seguinte
+
+ASS_HEADER = """[Script Info]
+Title: Torio Tools Scribe
+ScriptType: v4.00+
+Collisions: Normal
+PlayDepth: 0
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Arial,48,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,-1,0,0,0,100,100,0,0,1,2,1,2,20,20,20,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+def resolve_model_path(model_size: str, models_path: Optional[Path] = None) -> str:
+    """Caminho do modelo local, ou o nome para baixar."""
+    if models_path:
+        local_model_path = models_path / f'faster-whisper-{model_size}'
+        if local_model_path.exists():
+            return str(local_model_path)
+    return model_size
+
+class TranscriptionCancelled(Exception):
+    """Transcrição interrompida por pedido de cancelamento."""
+
+class CueFlush:
+    """
+    Marcador no fluxo de segmentos de _iter_cues: nenhum segmento novo
+    começa antes de `until`, então a legenda retida pode sair já.
+    """
+    
+    def __init__(self, until: float):
+        self.until = until
+
 class WhisperTranscriber:
     """Transcritor de áudio usando faster-whisper."""
     
-    def __init__(self, model_size: str = 'base', models_path: Optional[Path] = None):
+    def __init__(
+        self,
+        model_size: str = 'base',
+        models_path: Optional[Path] = None,
+        audio_backend: str = 'ffmpeg',
+        cache: Optional[TranscriptionCache] = None,
+        num_workers: int = 1,
+        compute_type: str = 'int8',
+        cpu_threads: int = 0,
+        model: Optional[Any] = None,
+        audio_cache: Optional[AudioCache] = None,
+        language_cache: Optional[LanguageCache] = None
+    ):
         """
         Inicializar transcritor.
         
         Args:
             model_size: Tamanho do modelo (tiny, base, small, medium, large-v3)
             models_path: Caminho para a pasta de modelos
+            audio_backend: Decodificador de vídeo ('ffmpeg' via pipe ou 'pyav')
+            cache: Cache de transcrições (opcional)
+            num_workers: Transcrições simultâneas (threads chamando o mesmo modelo)
+            compute_type: Tipo de computação do CTranslate2 (int8, int8_float32, float32...)
+            cpu_threads: Threads de inferência (0 = padrão do CTranslate2)
+            model: Modelo já construído (mesma interface do WhisperModel); pula o carregamento
+            audio_cache: Cache do áudio decodificado de vídeos (opcional)
+            language_cache: Idiomas detectados por arquivo (opcional, compartilhado entre modelos)
         """
         self.model_name = model_size
         self.models_path = models_path
+        self.audio_backend = audio_backend
+        self.cache = cache
+        self.audio_cache = audio_cache
+        self.language_cache = language_cache
+        self.num_workers = max(1, num_workers)
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
         self.model = None
         self.is_ready = False
+        self._parallel_runner = None
+        self._batched_pipeline = None
         self.ffmpeg_path = get_ffmpeg_path()
         
         print(f"[Transcriber] FFmpeg: {self.ffmpeg_path}")
-        self._load_model()
+        
+        if model is not None:
+            self.model = model
+            self.is_ready = True
+        else:
+            self._load_model()
+    
+    def _resolve_model_path(self) -> str:
+        """Caminho do modelo local, ou o nome para baixar."""
+        model_path = resolve_model_path(self.model_name, self.models_path)
+        if model_path != self.model_name:
+            print(f"[Transcriber] Usando modelo local: {model_path}")
+        elif self.models_path:
+            print(f"[Transcriber] Modelo local não encontrado, baixando: {self.model_name}")
+        return model_path
     
     def _load_model(self):
         """Carregar modelo Whisper."""
+        # Import pesado (ctranslate2) adiado até o primeiro modelo
+        from faster_whisper import WhisperModel
+        
         try:
             # Verificar se há modelo local
-            local_model_path = None
-            if self.models_path:
-                local_model_path = self.models_path / f'faster-whisper-{self.model_name}'
-                if local_model_path.exists():
-                    print(f"[Transcriber] Usando modelo local: {local_model_path}")
-                    model_path = str(local_model_path)
-                else:
-                    print(f"[Transcriber] Modelo local não encontrado, baixando: {self.model_name}")
-                    model_path = self.model_name
-            else:
-                model_path = self.model_name
+            model_path = self._resolve_model_path()
             
             # Carregar modelo
             self.model = WhisperModel(
                 model_path,
                 device='cpu',
-                compute_type='int8'
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads,
+                num_workers=self.num_workers
             )
             
             self.is_ready = True
-            print(f"[Transcriber] Modelo {self.model_name} carregado com sucesso!")
+            print(f"[Transcriber] Modelo {self.model_name} ({self.compute_type}) carregado com sucesso!")
             
         except Exception as e:
             print(f"[Transcriber] Erro ao carregar modelo: {e}")
             self.is_ready = False
             raise
     
-    def _extract_audio(self, video_path: str) -> str:
-        """Extrair áudio de vídeo usando FFmpeg local."""
-        # Criar arquivo temporário para o áudio
-        temp_audio = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-        temp_audio.close()
+    def warm_up(self) -> float:
+        """
+        Rodar uma inferência curta (1s de silêncio) para aquecer o modelo.
+        
+        Returns:
+            Tempo gasto em segundos
+        """
+        started = time.perf_counter()
+        segments, _ = self.model.transcribe(
+            np.zeros(SAMPLE_RATE, dtype=np.float32),
+            language='en',
+            beam_size=1,
+            vad_filter=False,
+            without_timestamps=True
+        )
+        list(segments)
+        elapsed = time.perf_counter() - started
+        print(f"[Transcriber] Aquecimento concluído em {elapsed:.2f}s")
+        return elapsed
+    
+    def _extract_audio(self, video_path: str) -> np.ndarray:
+        """
+        Extrair áudio de vídeo direto para memória (mono, 16kHz, float32).
+        
+        Sem arquivo WAV temporário: o FFmpeg escreve PCM no stdout e o
+        buffer vira o array entregue ao modelo. Com o cache de áudio, a
+        próxima vez é só um mmap.
+        """
+        if self.audio_cache is not None:
+            audio = self.audio_cache.get(video_path)
+            if audio is not None:
+                print(f"[Transcriber] Áudio do cache: {len(audio) / SAMPLE_RATE:.1f}s (mmap)")
+                return audio
+        
+        with metrics.timed('extract_audio'):
+            if self.audio_backend == 'pyav':
+                audio = self._extract_audio_pyav(video_path)
+            else:
+                audio = self._extract_audio_ffmpeg(video_path)
+        
+        if self.audio_cache is not None:
+            self.audio_cache.put(video_path, audio)
+        return audio
+    
+    @contextmanager
+    def _ffmpeg_pcm(
+        self,
+        video_path: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        follow: Optional[float] = None
+    ) -> Iterator[BinaryIO]:
+        """
+        FFmpeg decodificando para PCM float32 no stdout (mono, 16 kHz).
+        
+        Com start/end, o FFmpeg busca direto no início do trecho e decodifica
+        só a janela pedida. Com follow, o arquivo ainda está sendo gravado: o
+        FFmpeg continua lendo no fim dele e só termina após `follow` segundos
+        sem dados novos. O código de saída é verificado ao fechar.
+        """
+        seek = ['-ss', f'{start:.3f}'] if start else []
+        window = ['-t', f'{end - (start or 0):.3f}'] if end is not None else []
+        growing = ['-follow', '1', '-rw_timeout', str(int(follow * 1_000_000))] if follow else []
+        
+        cmd = [
+            self.ffmpeg_path, '-nostdin',
+            '-loglevel', 'error',
+            *seek,
+            *growing,
+            '-i', video_path,
+            *window,
+            '-vn',  # Sem vídeo
+            '-f', 'f32le',  # PCM float32 cru
+            '-acodec', 'pcm_f32le',
+            '-ar', str(SAMPLE_RATE),  # 16kHz (ótimo para Whisper)
+            '-ac', '1',  # Mono
+            'pipe:1'
+        ]
+        
+        print(f"[Transcriber] Extraindo áudio: {' '.join(cmd)}")
         
         try:
-            # Usar FFmpeg local
-            cmd = [
-                self.ffmpeg_path, '-y',
-                '-i', video_path,
-                '-vn',  # Sem vídeo
-                '-acodec', 'pcm_s16le',  # PCM 16-bit
-                '-ar', '16000',  # 16kHz (ótimo para Whisper)
-                '-ac', '1',  # Mono
-                temp_audio.name
-            ]
-            
-            print(f"[Transcriber] Extraindo áudio: {' '.join(cmd)}")
-            
-            result = subprocess.run(
+            process = subprocess.Popen(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 min timeout
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
             )
-            
-            if result.returncode != 0:
-                raise Exception(f"FFmpeg error: {result.stderr}")
-            
-            print(f"[Transcriber] Áudio extraído: {temp_audio.name}")
-            return temp_audio.name
-            
         except FileNotFoundError:
             # FFmpeg não encontrado
-            os.unlink(temp_audio.name)
             raise Exception(f"FFmpeg não encontrado em: {self.ffmpeg_path}")
+        
+        # Drenar stderr em paralelo para o FFmpeg nunca travar no pipe
+        stderr_chunks = []
+        stderr_thread = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()),
+            daemon=True
+        )
+        stderr_thread.start()
+        
+        try:
+            yield process.stdout
+        except BaseException:
+            # Leitura interrompida (erro ou cancelamento): não esperar o FFmpeg terminar o arquivo
+            process.kill()
+            raise
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+            stderr_thread.join()
+        
+        if returncode != 0:
+            stderr = b''.join(stderr_chunks).decode('utf-8', errors='replace')
+            if follow:
+                # Com -follow, a gravação termina pelo rw_timeout, que o FFmpeg trata como erro de leitura
+                print(f"[Transcriber] Leitura do arquivo em gravação encerrada: {stderr.strip()}")
+                return
+            raise Exception(f"Erro ao extrair áudio: FFmpeg error: {stderr}")
+    
+    def _extract_audio_ffmpeg(
+        self,
+        video_path: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+    ) -> np.ndarray:
+        """Decodificar áudio com FFmpeg via pipe (PCM float32 no stdout) para a memória."""
+        buffer = bytearray()
+        with self._ffmpeg_pcm(video_path, start, end) as stdout:
+            while True:
+                chunk = stdout.read(PIPE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                buffer += chunk
+        
+        # Descartar bytes incompletos de uma amostra final
+        usable = len(buffer) - len(buffer) % 4
+        audio = np.frombuffer(buffer, dtype=np.float32, count=usable // 4)
+        
+        print(f"[Transcriber] Áudio extraído: {len(audio) / SAMPLE_RATE:.1f}s em memória")
+        return audio
+    
+    def _extract_audio_pyav(self, video_path: str) -> np.ndarray:
+        """Decodificar áudio com PyAV (decoder embutido do faster-whisper)."""
+        from faster_whisper.audio import decode_audio
+        
+        try:
+            audio = decode_audio(video_path, sampling_rate=SAMPLE_RATE)
+        except Exception as e:
+            raise Exception(f"Erro ao extrair áudio: {str(e)}")
+        
+        print(f"[Transcriber] Áudio extraído (PyAV): {len(audio) / SAMPLE_RATE:.1f}s em memória")
+        return audio
+    
+    def _extract_range_pyav(self, video_path: str, start: float, end: Optional[float]) -> np.ndarray:
+        """
+        Decodificar só o trecho [start, end) com PyAV.
+        
+        Busca o quadro-chave anterior a start em vez de decodificar o arquivo
+        desde o início, e para de decodificar ao passar de end.
+        """
+        import av
+        from av.audio.resampler import AudioResampler
+        
+        chunks = []
+        first = None  # Tempo (s) da primeira amostra decodificada
+        try:
+            with av.open(video_path) as container:
+                stream = container.streams.audio[0]
+                resampler = AudioResampler(format='flt', layout='mono', rate=SAMPLE_RATE)
+                if start:
+                    container.seek(int(start * av.time_base))
+                
+                for frame in container.decode(stream):
+                    frame_time = float(frame.pts * stream.time_base) if frame.pts is not None else None
+                    if end is not None and frame_time is not None and frame_time >= end:
+                        break
+                    if first is None:
+                        first = frame_time if frame_time is not None else start
+                    for resampled in resampler.resample(frame):
+                        chunks.append(resampled.to_ndarray().reshape(-1))
+                
+                for resampled in resampler.resample(None):
+                    chunks.append(resampled.to_ndarray().reshape(-1))
         except Exception as e:
-            if os.path.exists(temp_audio.name):
-                os.unlink(temp_audio.name)
             raise Exception(f"Erro ao extrair áudio: {str(e)}")
+        
+        audio = np.concatenate(chunks).astype(np.float32, copy=False) if chunks else np.zeros(0, dtype=np.float32)
+        
+        # A busca cai num quadro-chave antes de start: descartar o excesso
+        skip = max(0, int(round((start - (first or 0.0)) * SAMPLE_RATE)))
+        length = int((end - start) * SAMPLE_RATE) if end is not None else None
+        audio = audio[skip:skip + length if length is not None else None]
+        
+        print(f"[Transcriber] Trecho extraído (PyAV): {len(audio) / SAMPLE_RATE:.1f}s em memória")
+        return audio
+
+    def _prepare_input(self, audio_path: str) -> Union[str, np.ndarray]:
+        """
+        Preparar entrada para o modelo.
+        
+        Vídeos são decodificados para um array em memória; arquivos de
+        áudio seguem como caminho (o faster-whisper decodifica uma vez).
+        """
+        # Verificar se arquivo existe
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Arquivo não encontrado: {audio_path}")
+        
+        # Verificar se é vídeo e extrair áudio
+        file_ext = os.path.splitext(audio_path)[1].lower()
+        
+        if file_ext in VIDEO_EXTENSIONS:
+            print(f"[Transcriber] Detectado vídeo, extraindo áudio...")
+            return self._extract_audio(audio_path)
+        
+        return audio_path
+    
+    def _extract_range(self, audio_path: str, start: float, end: Optional[float]) -> np.ndarray:
+        """
+        Decodificar apenas o trecho [start, end) de qualquer mídia.
+        
+        Se o áudio completo já está no cache, o trecho é uma fatia do mmap.
+        """
+        if self.audio_cache is not None:
+            audio = self.audio_cache.get(audio_path)
+            if audio is not None:
+                print(f"[Transcriber] Trecho {start:.1f}s-{end if end is not None else 'fim'} do cache de áudio")
+                return audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE) if end is not None else None]
+        
+        with metrics.timed('extract_audio'):
+            if self.audio_backend == 'pyav':
+                return self._extract_range_pyav(audio_path, start, end)
+            return self._extract_audio_ffmpeg(audio_path, start, end)
+    
+    def load_audio(self, audio_path: str) -> np.ndarray:
+        """Decodificar qualquer mídia (áudio ou vídeo) para um array em memória."""
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Arquivo não encontrado: {audio_path}")
+        return self._extract_audio(audio_path)
+    
+    def _decode_options(
+        self,
+        settings: Optional[Dict[str, Any]] = None,
+        output_format: Optional[Union[str, List[str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Opções de decodificação (também fazem parte da chave do cache).
+        
+        Com settings['batched'], inclui batch_size e usa o pipeline em lote.
+        O alinhamento por palavra só é pedido quando as legendas vão usá-lo.
+        """
+        settings = settings or {}
+        batched = settings.get('batched', False)
+        
+        options = {
+            'beam_size': int(settings.get('beam_size') or (BATCHED_BEAM_SIZE if batched else DEFAULT_BEAM_SIZE)),
+            'word_timestamps': self._needs_word_timestamps(settings, output_format),
+            'vad_filter': True
+        }
+        if batched:
+            options['batch_size'] = int(settings.get('batch_size') or DEFAULT_BATCH_SIZE)
+        return options
+    
+    def _needs_word_timestamps(
+        self,
+        settings: Dict[str, Any],
+        output_format: Optional[Union[str, List[str]]]
+    ) -> bool:
+        """Tempos por palavra só servem às legendas com tempo (txt e word_cues=false não usam)."""
+        if settings.get('word_cues', True) is False:
+            return False
+        if output_format is None:
+            return True
+        formats = output_format if isinstance(output_format, (list, tuple)) else [output_format]
+        return any(fmt != 'txt' for fmt in formats)
+    
+    def _decode(self, audio: Union[str, np.ndarray], language: str, options: Dict[str, Any]):
+        """
+        Iniciar decodificação (gerador lazy do faster-whisper).
+        
+        A chamada inicial (VAD, features e detecção de idioma) é medida como
+        'vad'; a iteração dos segmentos, como 'decode'.
+        """
+        lang = None if language == 'auto' else language
+        source = audio if isinstance(audio, str) else f"<áudio em memória: {len(audio) / SAMPLE_RATE:.1f}s>"
+        
+        options = dict(options)
+        batch_size = options.pop('batch_size', None)
+        
+        if batch_size:
+            print(f"[Transcriber] Transcrevendo em lote: {source} (idioma: {lang or 'auto'}, batch {batch_size})")
+            with metrics.timed('vad'):
+                segments, info = self._get_batched_pipeline().transcribe(
+                    audio, language=lang, batch_size=batch_size, **options
+                )
+        else:
+            print(f"[Transcriber] Transcrevendo: {source} (idioma: {lang or 'auto'})")
+            with metrics.timed('vad'):
+                segments, info = self.model.transcribe(audio, language=lang, **options)
+        
+        return metrics.timed_iter(segments, 'decode'), info
+    
+    def _get_batched_pipeline(self):
+        """Pipeline em lote do faster-whisper (compartilha o modelo carregado)."""
+        if self._batched_pipeline is None:
+            from faster_whisper import BatchedInferencePipeline
+            self._batched_pipeline = BatchedInferencePipeline(model=self.model)
+        return self._batched_pipeline
+    
+    def _cache_lookup(self, audio_path: str, language: str, options: Dict[str, Any]):
+        """
+        Consultar cache de transcrições.
+        
+        Returns:
+            Tupla (chave ou None, registro em cache ou None)
+        """
+        if not self.cache:
+            return None, None
+        
+        try:
+            key = self.cache.make_key(audio_path, self.model_name, language, options)
+            keys = [key]
+            if not options.get('word_timestamps'):
+                # Um registro com tempos por palavra também serve (só tem dados a mais)
+                keys.insert(0, self.cache.make_key(
+                    audio_path, self.model_name, language, {**options, 'word_timestamps': True}
+                ))
+        except OSError as e:
+            print(f"[Transcriber] Cache indisponível para {audio_path}: {e}")
+            return None, None
+        
+        # Uma consulta, um acerto ou erro nas métricas (não um por chave)
+        cached = self.cache.get(*keys)
+        if cached:
+            print(f"[Transcriber] Cache: reaproveitando {len(cached['segments'])} segmentos")
+        return key, cached
+    
+    def detect_language(
+        self,
+        audio_path: str,
+        windows: int = DEFAULT_WINDOWS,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        top_k: int = DEFAULT_TOP_K
+    ) -> Dict[str, Any]:
+        """
+        Detectar idioma amostrando janelas curtas espalhadas pelo arquivo.
+        
+        Cada janela é decodificada sozinha (busca direta do FFmpeg, ou fatia
+        do cache de áudio), passa pelo VAD e só a fala vai para o detector.
+        As probabilidades são somadas com peso pela fala de cada janela.
+        
+        Returns:
+            Dict com language, probability, languages (top-k), windows,
+            duration e cached
+        """
+        if not self.is_ready:
+            raise RuntimeError("Modelo não está pronto")
+        
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Arquivo não encontrado: {audio_path}")
+        
+        if self.language_cache is not None:
+            cached = self.language_cache.get(audio_path)
+            if cached is not None:
+                return self._detection_result(cached, top_k, cached=True)
+        
+        from faster_whisper.vad import get_speech_timestamps
+        
+        windows = max(1, min(int(windows), MAX_WINDOWS))
+        duration = media_duration(audio_path)
+        planned = plan_windows(duration, windows, float(window_seconds))
+        
+        with metrics.timed('language_detection'):
+            # Janelas decodificadas em paralelo (um FFmpeg por janela)
+            with ThreadPoolExecutor(max_workers=len(planned)) as executor:
+                clips = list(executor.map(lambda window: self._extract_range(audio_path, *window), planned))
+            
+            speech_clips = []
+            for (start, end), clip in zip(planned, clips):
+                speech = get_speech_timestamps(clip)
+                if speech:
+                    voiced = np.concatenate([clip[chunk['start']:chunk['end']] for chunk in speech])
+                    speech_clips.append((start, end, voiced))
+            
+            if not speech_clips:
+                # Nenhuma fala detectada pelo VAD: usar as janelas inteiras
+                speech_clips = [(start, end, clip) for (start, end), clip in zip(planned, clips) if len(clip)]
+            
+            detections = []
+            window_results = []
+            for start, end, clip in speech_clips:
+                lang, probability, all_probabilities = self.model.detect_language(clip)
+                speech_seconds = len(clip) / SAMPLE_RATE
+                detections.append((all_probabilities, speech_seconds))
+                window_results.append({
+                    'start': start,
+                    'end': end,
+                    'speech_seconds': round(speech_seconds, 2),
+                    'language': lang,
+                    'probability': round(probability, 4)
+                })
+        
+        probabilities = merge_probabilities(detections)
+        if not probabilities:
+            raise Exception("Não foi possível detectar o idioma: nenhum áudio nas janelas amostradas")
+        
+        detection = {
+            'language': probabilities[0][0],
+            'probability': probabilities[0][1],
+            'probabilities': probabilities,
+            'windows': window_results,
+            'duration': duration,
+            'model': self.model_name
+        }
+        print(f"[Transcriber] Idioma detectado (amostragem de {len(window_results)} janelas): "
+              f"{detection['language']} ({detection['probability']:.2f})")
+        
+        if self.language_cache is not None:
+            self.language_cache.put(audio_path, detection)
+        return self._detection_result(detection, top_k, cached=False)
+    
+    def _detection_result(self, detection: Dict[str, Any], top_k: int, cached: bool) -> Dict[str, Any]:
+        """Resposta de detect_language (top-k a partir da detecção guardada)."""
+        return {
+            'language': detection['language'],
+            'probability': round(detection['probability'], 4),
+            'languages': [
+                {'code': code, 'probability': round(probability, 4)}
+                for code, probability in detection['probabilities'][:max(1, top_k)]
+            ],
+            'windows': detection['windows'],
+            'duration': detection['duration'],
+            'model': detection['model'],
+            'cached': cached
+        }
+    
+    def _known_language(self, audio_path: str, language: str) -> str:
+        """Com 'auto', reaproveitar o idioma de um detect_language anterior (pula a detecção)."""
+        if language != 'auto' or self.language_cache is None:
+            return language
+        
+        detection = self.language_cache.get(audio_path)
+        if detection is None or detection['probability'] < MIN_REUSE_PROBABILITY:
+            return language
+        
+        print(f"[Transcriber] Idioma já detectado: {detection['language']} ({detection['probability']:.2f})")
+        return detection['language']
     
     def transcribe(
         self,
         audio_path: str,
         language: str = 'pt',
-        output_format: str = 'srt',
-        settings: Optional[Dict[str, Any]] = None
+        output_format: Union[str, List[str]] = 'srt',
+        settings: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        base_segments: Optional[List[Dict[str, Any]]] = None,
+        output_path: Optional[str] = None,
+        refiner: Optional['WhisperTranscriber'] = None
     ) -> Dict[str, Any]:
         """
         Transcrever arquivo de áudio.
@@ -136,186 +657,1065 @@ class WhisperTranscriber:
         Args:
             audio_path: Caminho do arquivo de áudio/vídeo
             language: Código do idioma (pt, en, es, etc.) ou 'auto'
-            output_format: Formato de saída (srt, vtt, ass, json, txt)
-            settings: Configurações de legenda
+            output_format: Formato de saída (srt, vtt, ass, json, txt) ou lista de formatos
+            settings: Configurações de legenda (start/end limitam a um trecho)
+            progress_callback: Chamado com (segundos processados, duração total)
+            cancel_event: Quando sinalizado, interrompe a decodificação
+            base_segments: Segmentos existentes; com start/end, o trecho é
+                retranscrito e encaixado neles
+            output_path: Gravar a legenda neste arquivo em vez de devolvê-la
+            refiner: Transcritor de um modelo maior; os segmentos de baixa
+                confiança são redecodificados por ele
         
         Returns:
-            Dict com subtitles, duration, detected_language
+            Dict com subtitles (texto, ou dict formato -> texto quando
+            output_format é uma lista) ou outputs (arquivos gravados),
+            duration, detected_language e refinement (com refiner)
         """
         if not self.is_ready:
             raise RuntimeError("Modelo não está pronto")
         
-        # Verificar se arquivo existe
         if not os.path.exists(audio_path):
             raise FileNotFoundError(f"Arquivo não encontrado: {audio_path}")
         
-        settings = settings or {}
-        max_chars = settings.get('max_chars_per_line', 42)
-        max_lines = settings.get('max_lines', 2)
-        min_duration = settings.get('min_duration', 1.5)
-        max_duration = settings.get('max_duration', 7.0)
-        
-        # Verificar se é vídeo e extrair áudio
-        temp_audio = None
-        file_ext = os.path.splitext(audio_path)[1].lower()
-        video_extensions = ['.mp4', '.mov', '.mkv', '.avi', '.webm', '.flv', '.wmv']
-        
-        transcribe_path = audio_path
+        language = self._known_language(audio_path, language)
+        time_range = self._time_range(settings)
+        if time_range:
+            return self._transcribe_range(
+                audio_path, time_range, language, output_format, settings,
+                base_segments, progress_callback, cancel_event, output_path, refiner
+            )
         
-        if file_ext in video_extensions:
-            print(f"[Transcriber] Detectado vídeo, extraindo áudio...")
-            temp_audio = self._extract_audio(audio_path)
-            transcribe_path = temp_audio
+        options = self._decode_options(settings, output_format)
+        cache_key, cached = self._cache_lookup(audio_path, language, options)
         
-        try:
-            # Transcrever
-            lang = None if language == 'auto' else language
-            print(f"[Transcriber] Transcrevendo: {transcribe_path} (idioma: {lang or 'auto'})")
-            
-            segments, info = self.model.transcribe(
-                transcribe_path,
-                language=lang,
-                beam_size=5,
-                word_timestamps=True,
-                vad_filter=True
+        if cached:
+            segments_list = cached['segments']
+            duration = cached['duration']
+            detected_language = cached['language']
+        else:
+            result = self._run_transcription(
+                audio_path, language, options, settings, progress_callback, cancel_event
             )
+            segments_list = result['segments']
+            duration = result['duration']
+            detected_language = result['language']
             
-            # Processar segmentos
-            segments_list = list(segments)
-            print(f"[Transcriber] {len(segments_list)} segmentos encontrados")
-            
-            # Formatar saída
-            if output_format == 'srt':
-                subtitles = self._format_srt(segments_list, max_chars, max_lines, min_duration, max_duration)
-            elif output_format == 'vtt':
-                subtitles = self._format_vtt(segments_list, max_chars, max_lines, min_duration, max_duration)
-            elif output_format == 'ass':
-                subtitles = self._format_ass(segments_list, max_chars, max_lines, min_duration, max_duration)
-            elif output_format == 'json':
-                subtitles = self._format_json(segments_list, max_chars, max_lines, min_duration, max_duration)
-            elif output_format == 'txt':
-                subtitles = self._format_txt(segments_list)
-            else:
-                subtitles = self._format_srt(segments_list, max_chars, max_lines, min_duration, max_duration)
-            
-            return {
-                'subtitles': subtitles,
-                'duration': info.duration,
-                'detected_language': info.language
-            }
-            
-        finally:
-            # Limpar arquivo temporário
-            if temp_audio and os.path.exists(temp_audio):
-                os.unlink(temp_audio)
+            if cache_key:
+                self.cache.put(cache_key, segments_list, duration, detected_language)
+        
+        refinement = None
+        if refiner is not None:
+            segments_list, refinement = self._refine_cached(
+                audio_path, segments_list, refiner, language, detected_language,
+                options, duration, settings, output_format, cancel_event
+            )
+        
+        subtitles, outputs = self._deliver(segments_list, output_format, settings, output_path)
+        
+        return {
+            'subtitles': subtitles,
+            'outputs': outputs,
+            'duration': duration,
+            'detected_language': detected_language,
+            'cached': cached is not None,
+            'refinement': refinement
+        }
     
-    def _format_srt(
+    def refine(
         self,
-        segments: list,
-        max_chars: int,
-        max_lines: int,
-        min_duration: float,
-        max_duration: float
-    ) -> str:
-        """Formatar segmentos como SRT."""
-        srt_parts = []
-        index = 1
+        audio_path: str,
+        segments: List,
+        refiner: 'WhisperTranscriber',
+        language: str,
+        settings: Optional[Dict[str, Any]] = None,
+        output_format: Optional[Union[str, List[str]]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[List, Dict[str, Any]]:
+        """
+        Redecodificar com um modelo maior apenas os segmentos de baixa confiança.
         
-        for segment in segments:
-            text = segment.text.strip()
-            if not text:
-                continue
-            
-            # Quebrar texto longo
-            lines = self._wrap_text(text, max_chars, max_lines)
-            formatted_text = '\n'.join(lines)
-            
-            # Ajustar duração
-            start = segment.start
-            end = segment.end
-            duration = end - start
-            
-            if duration < min_duration:
-                end = start + min_duration
-            elif duration > max_duration:
-                end = start + max_duration
-            
-            # Formatar timestamps
-            start_ts = self._format_timestamp_srt(start)
-            end_ts = self._format_timestamp_srt(end)
-            
-            srt_parts.append(f"{index}\n{start_ts} --> {end_ts}\n{formatted_text}\n")
-            index += 1
+        Os trechos fracos são extraídos deste arquivo (cache de áudio/FFmpeg com
+        busca direta), decodificados pelo refiner no idioma já conhecido e
+        encaixados no lugar dos segmentos originais.
+        
+        Returns:
+            Tupla (segmentos ordenados, resumo do refinamento)
+        """
+        thresholds = resolve_thresholds((settings or {}).get('refine_thresholds'))
+        windows = plan_refinement(segments, thresholds)
+        options = refiner._decode_options(settings, output_format)
         
-        return '\n'.join(srt_parts)
+        refined = []
+        started = time.perf_counter()
+        for start, end in windows:
+            self._check_cancelled(cancel_event)
+            audio = self._extract_range(audio_path, start, end)
+            decoded, info = refiner._decode(audio, language, options)
+            refined.extend(
+                segment_from_dict(shift_segment_dict(segment_to_dict(segment), start))
+                for segment in refiner._track(decoded, info.duration, None, cancel_event)
+            )
+        
+        kept = [
+            segment for segment in segments
+            if not any(segment.end > start and segment.start < end for start, end in windows)
+        ]
+        refined_seconds = sum(end - start for start, end in windows)
+        elapsed = time.perf_counter() - started
+        if windows:
+            metrics.record_transcription(refiner.model_name, refined_seconds, elapsed)
+        
+        print(f"[Transcriber] Refinamento ({refiner.model_name}): {len(windows)} trechos, "
+              f"{refined_seconds:.1f}s de áudio em {elapsed:.1f}s")
+        
+        summary = {
+            'model': refiner.model_name,
+            'thresholds': thresholds,
+            'windows': [{'start': round(start, 3), 'end': round(end, 3)} for start, end in windows],
+            'refined_seconds': round(refined_seconds, 3),
+            'replaced_segments': len(segments) - len(kept),
+            'elapsed_seconds': round(elapsed, 3)
+        }
+        return sorted(kept + refined, key=lambda segment: segment.start), summary
     
-    def _format_vtt(
+    def _refine_cached(
         self,
-        segments: list,
-        max_chars: int,
-        max_lines: int,
-        min_duration: float,
-        max_duration: float
-    ) -> str:
-        """Formatar segmentos como WebVTT."""
-        vtt_parts = ["WEBVTT\n"]
+        audio_path: str,
+        segments: List,
+        refiner: 'WhisperTranscriber',
+        language: str,
+        detected_language: str,
+        options: Dict[str, Any],
+        duration: float,
+        settings: Optional[Dict[str, Any]],
+        output_format: Optional[Union[str, List[str]]],
+        cancel_event: Optional[threading.Event]
+    ) -> Tuple[List, Dict[str, Any]]:
+        """
+        refine() com o resultado guardado no cache de transcrições (chave inclui o refiner e os limiares).
         
-        for segment in segments:
-            text = segment.text.strip()
-            if not text:
-                continue
-            
-            lines = self._wrap_text(text, max_chars, max_lines)
-            formatted_text = '\n'.join(lines)
-            
-            start = segment.start
-            end = segment.end
-            duration = end - start
-            
-            if duration < min_duration:
-                end = start + min_duration
-            elif duration > max_duration:
-                end = start + max_duration
-            
-            start_ts = self._format_timestamp_vtt(start)
-            end_ts = self._format_timestamp_vtt(end)
-            
-            vtt_parts.append(f"{start_ts} --> {end_ts}\n{formatted_text}\n")
+        O resumo do refinamento é guardado junto: um acerto devolve os mesmos
+        campos da execução original, com cached=True.
+        """
+        thresholds = resolve_thresholds((settings or {}).get('refine_thresholds'))
+        refine_options = {**options, 'refine': {'model': refiner.model_name, 'thresholds': thresholds}}
+        cache_key, cached = self._cache_lookup(audio_path, language, refine_options)
+        if cached and cached['summary']:
+            return cached['segments'], {**cached['summary'], 'cached': True}
         
-        return '\n'.join(vtt_parts)
-    
-    def _format_ass(
+        segments, summary = self.refine(
+            audio_path, segments, refiner, detected_language, settings, output_format, cancel_event
+        )
+        if cache_key:
+            self.cache.put(cache_key, segments, duration, detected_language, summary)
+        return segments, {**summary, 'cached': False}
+
+    def transcribe_words(
         self,
-        segments: list,
-        max_chars: int,
-        max_lines: int,
-        min_duration: float,
-        max_duration: float
-    ) -> str:
-        """Formatar segmentos como ASS/SSA (Adobe Premiere, DaVinci, etc)."""
-        ass_header = """[Script Info]
-Title: Torio Tools Scribe
-ScriptType: v4.00+
-Collisions: Normal
-PlayDepth: 0
+        audio_path: str,
+        language: str = 'pt',
+        settings: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Palavras reconhecidas com tempos, para alinhar um roteiro conhecido.
+        
+        O texto reconhecido só serve de âncora: a decodificação é gulosa
+        (beam 1, salvo settings['beam_size']), bem mais barata que uma
+        transcrição para entrega.
+        
+        Returns:
+            Dict com words (start, end, word), duration, detected_language e cached
+        """
+        if not self.is_ready:
+            raise RuntimeError("Modelo não está pronto")
+        
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Arquivo não encontrado: {audio_path}")
+        
+        settings = settings or {}
+        language = self._known_language(audio_path, language)
+        options = {
+            **self._decode_options({**settings, 'word_cues': True}),
+            'beam_size': int(settings.get('beam_size') or ALIGN_BEAM_SIZE)
+        }
+        cache_key, cached = self._cache_lookup(audio_path, language, options)
+        
+        if cached:
+            segments_list = cached['segments']
+            duration = cached['duration']
+            detected_language = cached['language']
+        else:
+            result = self._run_transcription(
+                audio_path, language, options, settings, progress_callback, cancel_event
+            )
+            segments_list = result['segments']
+            duration = result['duration']
+            detected_language = result['language']
+            
+            if cache_key:
+                self.cache.put(cache_key, segments_list, duration, detected_language)
+        
+        words = [
+            {'start': word.start, 'end': word.end, 'word': word.word}
+            for segment in segments_list
+            for word in getattr(segment, 'words', None) or []
+            if word.word.strip()
+        ]
+        return {
+            'words': words,
+            'duration': duration,
+            'detected_language': detected_language,
+            'cached': cached is not None
+        }
 
-[V4+ Styles]
-Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
-Style: Default,Arial,48,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,-1,0,0,0,100,100,0,0,1,2,1,2,20,20,20,1
+    def decode_audio(
+        self,
+        audio: np.ndarray,
+        language: str = 'pt',
+        settings: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        output_format: Optional[Union[str, List[str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Decodificar áudio já carregado em memória (sem cache nem modo paralelo).
+        
+        Usado por pipelines que extraem o áudio em outra thread (batch).
+        output_format (os formatos que serão gravados) decide se vale alinhar palavras.
+        
+        Returns:
+            Dict com segments (lista), duration e language
+        """
+        if not self.is_ready:
+            raise RuntimeError("Modelo não está pronto")
+        
+        started = time.perf_counter()
+        segments, info = self._decode(audio, language, self._decode_options(settings, output_format))
+        segments_list = list(self._track(segments, info.duration, progress_callback, cancel_event))
+        metrics.record_transcription(self.model_name, info.duration, time.perf_counter() - started)
+        
+        return {
+            'segments': segments_list,
+            'duration': info.duration,
+            'language': info.language
+        }
+    
+    def _time_range(self, settings: Optional[Dict[str, Any]]) -> Optional[Tuple[float, Optional[float]]]:
+        """Trecho pedido em settings (start/end em segundos), ou None."""
+        settings = settings or {}
+        start = settings.get('start')
+        end = settings.get('end')
+        if start is None and end is None:
+            return None
+        
+        start = float(start or 0)
+        end = float(end) if end is not None else None
+        if start < 0 or (end is not None and end <= start):
+            raise ValueError(f"Trecho inválido: start={start}, end={end}")
+        return start, end
+    
+    def _transcribe_range(
+        self,
+        audio_path: str,
+        time_range: Tuple[float, Optional[float]],
+        language: str,
+        output_format: Union[str, List[str]],
+        settings: Optional[Dict[str, Any]] = None,
+        base_segments: Optional[List[Dict[str, Any]]] = None,
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        output_path: Optional[str] = None,
+        refiner: Optional['WhisperTranscriber'] = None
+    ) -> Dict[str, Any]:
+        """
+        Transcrever apenas um trecho, com tempos globais.
+        
+        Com base_segments, os segmentos que tocam o trecho são substituídos
+        pelos novos (o trecho é ampliado para não cortar segmentos ao meio).
+        O custo depende do tamanho do trecho, não do arquivo.
+        """
+        start, end = time_range
+        kept = []
+        
+        if base_segments:
+            base = segments_from_dicts(base_segments)
+            for segment in base:
+                if segment.end > start and (end is None or segment.start < end):
+                    start = min(start, segment.start)
+                    end = max(end, segment.end) if end is not None else None
+            kept = [
+                segment for segment in base
+                if segment.end <= start or (end is not None and segment.start >= end)
+            ]
+        
+        # Sem o modo paralelo: numa janela curta, dividir em processos não compensa
+        options = self._decode_options(settings, output_format)
+        cache_key, cached = self._cache_lookup(audio_path, language, {**options, 'range': [start, end]})
+        
+        if cached:
+            window = cached['segments']
+            duration = cached['duration']
+            detected_language = cached['language']
+        else:
+            started = time.perf_counter()
+            audio = self._extract_range(audio_path, start, end)
+            self._check_cancelled(cancel_event)
+            segments, info = self._decode(audio, language, options)
+            
+            window = segments_from_dicts(
+                shift_segment_dict(segment_to_dict(segment), start)
+                for segment in self._track(segments, info.duration, progress_callback, cancel_event)
+            )
+            duration = info.duration
+            detected_language = info.language
+            metrics.record_transcription(self.model_name, duration, time.perf_counter() - started)
+            
+            if cache_key:
+                self.cache.put(cache_key, window, duration, detected_language)
+        
+        end_label = f'{end:.1f}s' if end is not None else 'fim'
+        print(f"[Transcriber] Trecho {start:.1f}s-{end_label}: {len(window)} segmentos "
+              f"({len(kept)} mantidos da lista existente)")
+        
+        refinement = None
+        if refiner is not None:
+            window, refinement = self.refine(
+                audio_path, window, refiner, detected_language, settings, output_format, cancel_event
+            )
+        
+        merged = sorted(kept + window, key=lambda segment: segment.start)
+        subtitles, outputs = self._deliver(merged, output_format, settings, output_path)
+        
+        return {
+            'subtitles': subtitles,
+            'outputs': outputs,
+            'duration': duration,
+            'detected_language': detected_language,
+            'cached': cached is not None,
+            'range': {'start': start, 'end': end},
+            'segments': segments_to_dicts(merged),
+            'refinement': refinement
+        }
+    
+    def _run_transcription(
+        self,
+        audio_path: str,
+        language: str,
+        options: Dict[str, Any],
+        settings: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Executar o modelo no modo pedido pelas configurações.
+        
+        Returns:
+            Dict com segments (lista), duration e language
+        """
+        settings = settings or {}
+        started = time.perf_counter()
+        
+        if settings.get('parallel'):
+            result = self._transcribe_parallel(
+                audio_path,
+                language,
+                options,
+                settings.get('parallel_workers'),
+                progress_callback,
+                cancel_event
+            )
+            print(f"[Transcriber] {len(result['segments'])} segmentos encontrados (paralelo)")
+        elif self._use_windowed(audio_path, settings):
+            result = self._transcribe_windowed(
+                audio_path,
+                language,
+                options,
+                settings.get('window_seconds'),
+                progress_callback,
+                cancel_event
+            )
+        else:
+            audio = self._prepare_input(audio_path)
+            self._check_cancelled(cancel_event)
+            segments, info = self._decode(audio, language, options)
+            
+            # Processar segmentos
+            segments_list = list(self._track(segments, info.duration, progress_callback, cancel_event))
+            print(f"[Transcriber] {len(segments_list)} segmentos encontrados")
+            
+            result = {
+                'segments': segments_list,
+                'duration': info.duration,
+                'language': info.language
+            }
+        
+        metrics.record_transcription(self.model_name, result['duration'], time.perf_counter() - started)
+        return result
+    
+    def _use_windowed(self, audio_path: str, settings: Dict[str, Any]) -> bool:
+        """Janelas com settings['windowed']; sem a opção, automático para arquivos longos."""
+        windowed = settings.get('windowed')
+        if windowed is not None:
+            return bool(windowed)
+        duration = media_duration(audio_path)
+        return duration is not None and duration >= WINDOWED_AUTO_SECONDS
+    
+    def _transcribe_windowed(
+        self,
+        audio_path: str,
+        language: str,
+        options: Dict[str, Any],
+        window_seconds: Optional[float] = None,
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Transcrever em janelas de tamanho fixo, com memória constante.
+        
+        O áudio nunca existe inteiro em memória: as janelas vêm do pipe do
+        FFmpeg (buffer fixo) ou são fatias do mmap do cache de áudio.
+        
+        Returns:
+            Dict com segments (lista), duration e language
+        """
+        window_seconds = max(MIN_DECODE_WINDOW_SECONDS, float(window_seconds or DECODE_WINDOW_SECONDS))
+        window_samples = int(window_seconds * SAMPLE_RATE)
+        total = media_duration(audio_path) or 0.0
+        
+        cached_audio = self.audio_cache.get(audio_path) if self.audio_cache is not None else None
+        if cached_audio is not None:
+            return self.decode_windows(
+                ArrayWindowReader(cached_audio, window_samples),
+                language, options, total, progress_callback, cancel_event
+            )
+        
+        with self._ffmpeg_pcm(audio_path) as stream:
+            return self.decode_windows(
+                PipeWindowReader(stream, window_samples),
+                language, options, total, progress_callback, cancel_event
+            )
+    
+    def decode_windows(
+        self,
+        reader: Union[ArrayWindowReader, PipeWindowReader],
+        language: str = 'pt',
+        options: Optional[Dict[str, Any]] = None,
+        total: float = 0.0,
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Decodificar janela a janela o áudio de um leitor (ArrayWindowReader/PipeWindowReader).
+        
+        Os segmentos que terminam nos últimos WINDOW_TAIL_SECONDS da janela são
+        descartados e o áudio a partir dali abre a janela seguinte, que recebe
+        o texto anterior como contexto (initial_prompt). O idioma detectado na
+        primeira janela vale para as demais. A memória fica limitada a uma
+        janela de áudio, qualquer que seja a duração.
+        
+        Args:
+            reader: Fonte das janelas
+            language: Código do idioma ou 'auto'
+            options: Opções de decodificação (padrão: _decode_options())
+            total: Duração esperada (só para o progresso; 0 = desconhecida)
+        
+        Returns:
+            Dict com segments (lista), duration e language
+        """
+        options = options if options is not None else self._decode_options()
+        collected = []
+        offset = 0
+        prompt = None
+        windows = 0
+        
+        while True:
+            self._check_cancelled(cancel_event)
+            audio = reader.window(offset)
+            if len(audio) == 0:
+                break
+            
+            window_start = offset / SAMPLE_RATE
+            decoded, language = self._decode_window(audio, window_start, language, options, prompt, cancel_event)
+            windows += 1
+            window_end = window_start + len(audio) / SAMPLE_RATE
+            
+            if reader.eof:
+                collected.extend(decoded)
+                offset += len(audio)
+                break
+            
+            # Segmentos perto do fim da janela podem estar cortados: refeitos na próxima
+            limit = window_end - WINDOW_TAIL_SECONDS
+            finished = [segment for segment in decoded if segment.end <= limit]
+            cut = finished[-1].end if finished else self._resume_point(decoded, window_start, limit)
+            collected.extend(finished)
+            
+            text = ' '.join(segment.text.strip() for segment in finished)
+            prompt = text[-PROMPT_CHARS:] if text else prompt
+            offset += max(1, int((cut - window_start) * SAMPLE_RATE))
+            
+            if progress_callback:
+                progress_callback(cut, max(total, cut))
+        
+        duration = offset / SAMPLE_RATE
+        if progress_callback:
+            progress_callback(duration, duration)
+        
+        print(f"[Transcriber] {len(collected)} segmentos em {windows} janelas de até "
+              f"{reader.window_samples / SAMPLE_RATE:.0f}s")
+        return {
+            'segments': collected,
+            'duration': duration,
+            'language': language
+        }
+    
+    def _resume_point(self, decoded: List, window_start: float, limit: float) -> float:
+        """
+        Início da próxima janela quando nenhum segmento terminou antes de limit.
+        
+        É o início do primeiro segmento inacabado: a fala entre ele e limit é
+        decodificada de novo em vez de perdida. Se ele abre a janela (a
+        janela não avançaria), ou se não há fala, vale limit.
+        """
+        return min([limit] + [segment.start for segment in decoded if segment.start > window_start])
+    
+    def _decode_window(
+        self,
+        audio: np.ndarray,
+        window_start: float,
+        language: str,
+        options: Dict[str, Any],
+        prompt: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[List, str]:
+        """
+        Decodificar uma janela com o texto anterior como contexto.
+        
+        Returns:
+            Tupla (segmentos com tempos globais, idioma — o detectado, se era 'auto')
+        """
+        window_options = {**options, 'initial_prompt': prompt} if prompt else options
+        segments, info = self._decode(audio, language, window_options)
+        decoded = [
+            segment_from_dict(shift_segment_dict(segment_to_dict(segment), window_start))
+            for segment in self._track(segments, info.duration, None, cancel_event)
+        ]
+        return decoded, info.language if language == 'auto' else language
+    
+    def transcribe_stream(
+        self,
+        audio_path: str,
+        language: str = 'pt',
+        output_format: str = 'srt',
+        settings: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Transcrever arquivo emitindo cada legenda assim que o segmento é decodificado.
+        
+        Eventos emitidos (dicts):
+            start: formato, idioma, duração do áudio e cabeçalho do documento
+            cue: legenda formatada (index, start, end, text, formatted)
+            summary: total de legendas, duração e idioma
+        
+        As legendas saem sem esperar o fim da decodificação. Sem cache de
+        transcrições, nenhuma lista de segmentos é mantida em memória; com o
+        cache ativo, os segmentos crus são acumulados para gravar o registro
+        ao final (e um acerto no cache carrega o registro inteiro).
+        """
+        if not self.is_ready:
+            raise RuntimeError("Modelo não está pronto")
+        
+        if output_format not in SUBTITLE_FORMATS:
+            output_format = 'srt'
+        
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Arquivo não encontrado: {audio_path}")
+        
+        started = time.perf_counter()
+        language = self._known_language(audio_path, language)
+        options = self._decode_options(settings, output_format)
+        cache_key, cached = self._cache_lookup(audio_path, language, options)
+        
+        # Com cache ativo, os segmentos crus são guardados ao final
+        collected = [] if cache_key and not cached else None
+        
+        if cached:
+            segments = cached['segments']
+            duration = cached['duration']
+            detected_language = cached['language']
+        else:
+            audio = self._prepare_input(audio_path)
+            segments, info = self._decode(audio, language, options)
+            duration = info.duration
+            detected_language = info.language
+            
+            if collected is not None:
+                segments = self._collect(segments, collected)
+        
+        yield {
+            'type': 'start',
+            'format': output_format,
+            'language': detected_language,
+            'duration': duration,
+            'header': self._document_header(output_format),
+            'cached': cached is not None
+        }
+        
+        cue_count = 0
+        for cue in self._iter_cues(segments, **self._cue_limits(settings)):
+            cue_count += 1
+            yield {
+                'type': 'cue',
+                'index': cue['index'],
+                'start': round(cue['start'], 3),
+                'end': round(cue['end'], 3),
+                'text': cue['text'],
+                'formatted': self._render_cue(output_format, cue)
+            }
+        
+        print(f"[Transcriber] {cue_count} legendas transmitidas")
+        
+        if not cached:
+            metrics.record_transcription(self.model_name, duration, time.perf_counter() - started)
+        
+        if collected is not None:
+            self.cache.put(cache_key, collected, duration, detected_language)
+        
+        yield {
+            'type': 'summary',
+            'segment_count': cue_count,
+            'duration': duration,
+            'language': detected_language
+        }
+    
+    def transcribe_tail(
+        self,
+        source: Union[str, BinaryIO],
+        language: str = 'pt',
+        output_format: str = 'srt',
+        settings: Optional[Dict[str, Any]] = None,
+        latency: float = DEFAULT_TAIL_LATENCY,
+        idle_timeout: float = TAIL_IDLE_SECONDS,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Transcrever uma gravação em andamento, emitindo só legendas finalizadas.
+        
+        source é o caminho de um arquivo que ainda está crescendo (o FFmpeg lê
+        o que for acrescentado e termina após `idle_timeout` segundos sem dados
+        novos) ou um fluxo binário de PCM float32 mono 16 kHz (ex.: stdin),
+        lido até o fim.
+        
+        A cada `latency` segundos de áudio novo, o trecho ainda não finalizado
+        é decodificado de novo junto com o novo (janelas sobrepostas); um
+        segmento só vira legenda quando termina TAIL_GUARD_SECONDS antes do fim
+        do áudio lido, e não muda mais depois disso.
+        
+        Eventos emitidos (dicts), como em transcribe_stream:
+            start: formato, idioma (None se 'auto', até a primeira janela) e cabeçalho
+            cue: legenda finalizada (index, start, end, text, formatted)
+            summary: total de legendas, duração lida e idioma
+        """
+        if not self.is_ready:
+            raise RuntimeError("Modelo não está pronto")
+        
+        if output_format not in SUBTITLE_FORMATS:
+            output_format = 'srt'
+        
+        if isinstance(source, str):
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"Arquivo não encontrado: {source}")
+            pcm = self._ffmpeg_pcm(source, follow=max(1.0, float(idle_timeout)))
+        else:
+            pcm = nullcontext(source)
+        
+        latency = min(max(MIN_TAIL_LATENCY, float(latency)), TAIL_WINDOW_SECONDS / 2)
+        options = self._decode_options(settings, output_format)
+        state = {'duration': 0.0, 'language': language}
+        started = time.perf_counter()
+        
+        with pcm as stream:
+            reader = TailWindowReader(stream, int(TAIL_WINDOW_SECONDS * SAMPLE_RATE))
+            
+            yield {
+                'type': 'start',
+                'format': output_format,
+                'language': None if language == 'auto' else language,
+                'latency': latency,
+                'header': self._document_header(output_format)
+            }
+            
+            cue_count = 0
+            segments = self._tail_segments(reader, language, options, int(latency * SAMPLE_RATE), state, cancel_event)
+            for cue in self._iter_cues(segments, **self._cue_limits(settings)):
+                cue_count += 1
+                yield {
+                    'type': 'cue',
+                    'index': cue['index'],
+                    'start': round(cue['start'], 3),
+                    'end': round(cue['end'], 3),
+                    'text': cue['text'],
+                    'formatted': self._render_cue(output_format, cue)
+                }
+        
+        print(f"[Transcriber] Acompanhamento encerrado: {cue_count} legendas, {state['duration']:.1f}s de áudio")
+        metrics.record_transcription(self.model_name, state['duration'], time.perf_counter() - started)
+        
+        yield {
+            'type': 'summary',
+            'segment_count': cue_count,
+            'duration': state['duration'],
+            'language': state['language']
+        }
+    
+    def _tail_segments(
+        self,
+        reader: TailWindowReader,
+        language: str,
+        options: Dict[str, Any],
+        step_samples: int,
+        state: Dict[str, Any],
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator:
+        """
+        Segmentos finalizados de uma gravação em andamento, em ordem.
+        
+        O início da janela avança até o fim do último segmento finalizado; o
+        resto é redecodificado com o áudio novo. Uma janela sem nada novo
+        emite um CueFlush, para _iter_cues não reter a última legenda. state
+        recebe a duração lida e o idioma (detectado na primeira janela, se 'auto').
+        """
+        offset = 0
+        prompt = None
+        
+        while True:
+            self._check_cancelled(cancel_event)
+            audio = reader.window(offset, step_samples)
+            window_start = offset / SAMPLE_RATE
+            window_end = window_start + len(audio) / SAMPLE_RATE
+            state['duration'] = window_end
+            if len(audio) == 0:
+                break
+            
+            decoded, language = self._decode_window(audio, window_start, language, options, prompt, cancel_event)
+            state['language'] = language
+            
+            if reader.eof:
+                # Fim da gravação: nada mais pode mudar
+                yield from decoded
+                break
+            
+            limit = window_end - TAIL_GUARD_SECONDS
+            finished = [segment for segment in decoded if segment.end <= limit]
+            if finished:
+                cut = finished[-1].end
+            elif not decoded or len(audio) >= reader.window_samples:
+                # Sem fala até aqui (ou janela cheia): recomeçar no primeiro segmento inacabado
+                cut = self._resume_point(decoded, window_start, limit)
+            else:
+                cut = window_start
+            
+            yield from finished
+            if not finished:
+                # Nada novo nesta janela (pausa): a última legenda não espera a próxima fala
+                yield CueFlush(cut)
+            
+            text = ' '.join(segment.text.strip() for segment in finished)
+            prompt = text[-PROMPT_CHARS:] if text else prompt
+            offset += max(0, int((cut - window_start) * SAMPLE_RATE))
 
-[Events]
-Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
-"""
-        ass_parts = [ass_header]
+    def _transcribe_parallel(
+        self,
+        audio_path: str,
+        language: str,
+        options: Dict[str, Any],
+        workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[float, float], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Transcrever dividindo o áudio em trechos (cortes em silêncio) processados em paralelo.
+        
+        Cada processo tem seu próprio modelo e uma fatia das threads da CPU;
+        os segmentos voltam com tempos globais corrigidos.
+        """
+        workers = workers or max(1, (os.cpu_count() or 1) // 4)
+        
+        # Os processos usam a decodificação sequencial (sem lote)
+        options = {key: value for key, value in options.items() if key != 'batch_size'}
+        
+        if self._parallel_runner is None or self._parallel_runner.workers != workers:
+            if self._parallel_runner is not None:
+                self._parallel_runner.close()
+            self._parallel_runner = ParallelChunkRunner(self._resolve_model_path(), workers, self.compute_type)
+            # Transcritor descartado (ex.: descarregado pelo registro): os processos só
+            # são encerrados quando o último pedido que ainda o usa terminar
+            weakref.finalize(self, self._parallel_runner.close)
+        
+        audio = self.load_audio(audio_path)
+        self._check_cancelled(cancel_event)
+        
+        # Detectar idioma uma vez para que todos os trechos usem o mesmo
+        lang = None if language == 'auto' else language
+        if lang is None:
+            lang, probability, _ = self.model.detect_language(audio)
+            print(f"[Transcriber] Idioma detectado: {lang} ({probability:.2f})")
         
+        result = self._parallel_runner.transcribe(audio, lang, options, progress_callback, cancel_event)
+        self._check_cancelled(cancel_event)
+        return result
+    
+    def close(self):
+        """Liberar recursos auxiliares (processos do modo paralelo)."""
+        if self._parallel_runner is not None:
+            self._parallel_runner.close()
+            self._parallel_runner = None
+    
+    def _check_cancelled(self, cancel_event: Optional[threading.Event]):
+        """Levantar TranscriptionCancelled se o cancelamento foi pedido."""
+        if cancel_event is not None and cancel_event.is_set():
+            raise TranscriptionCancelled("Transcrição cancelada")
+    
+    def _track(
+        self,
+        segments: Iterable,
+        duration: float,
+        progress_callback: Optional[Callable[[float, float], None]],
+        cancel_event: Optional[threading.Event]
+    ) -> Iterator:
+        """
+        Repassar segmentos reportando progresso e verificando cancelamento.
+        
+        Ao cancelar, o gerador do faster-whisper é fechado, o que encerra a
+        decodificação e libera a CPU imediatamente.
+        """
+        try:
+            for segment in segments:
+                self._check_cancelled(cancel_event)
+                if progress_callback:
+                    progress_callback(min(segment.end, duration), duration)
+                yield segment
+            self._check_cancelled(cancel_event)
+        finally:
+            close = getattr(segments, 'close', None)
+            if close:
+                close()
+    
+    def _collect(self, segments: Iterable, collected: list) -> Iterator:
+        """Repassar segmentos guardando cada um em `collected`."""
         for segment in segments:
+            collected.append(segment)
+            yield segment
+
+    
+    def _cue_limits(self, settings: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Extrair limites de legenda das configurações."""
+        settings = settings or {}
+        return {
+            'max_chars': settings.get('max_chars_per_line', 42),
+            'max_lines': settings.get('max_lines', 2),
+            'min_duration': settings.get('min_duration', 1.5),
+            'max_duration': settings.get('max_duration', 7.0),
+            'word_level': settings.get('word_cues', True) is not False
+        }
+    
+    def _deliver(
+        self,
+        segments: List,
+        output_format: Union[str, List[str]],
+        settings: Optional[Dict[str, Any]] = None,
+        output_path: Optional[str] = None
+    ) -> Tuple[Optional[Union[str, Dict[str, str]]], Optional[Dict[str, Dict[str, Any]]]]:
+        """
+        Entregar o resultado: texto na resposta ou arquivos em output_path.
+        
+        Returns:
+            Tupla (subtitles, outputs); apenas um dos dois é preenchido
+        """
+        if output_path:
+            return None, self.write_outputs(segments, output_format, settings, output_path)
+        return self._render_outputs(segments, output_format, settings), None
+    
+    def write_outputs(
+        self,
+        segments: List,
+        output_format: Union[str, List[str]],
+        settings: Optional[Dict[str, Any]],
+        output_path: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Gravar cada formato direto em disco, legenda a legenda (escrita atômica).
+        
+        Com vários formatos, cada arquivo recebe a extensão do formato.
+        """
+        multiple = isinstance(output_format, (list, tuple))
+        formats = list(dict.fromkeys(output_format)) if multiple else [output_format]
+        # Legendas, não segmentos: _iter_cues divide segmentos longos e une os curtos
+        cue_count = sum(1 for _ in self._iter_cues(segments, **self._cue_limits(settings)))
+        
+        outputs = {}
+        for fmt in formats:
+            path = output_path_for(output_path, fmt, multiple)
+            with metrics.timed('format'):
+                size = write_atomic(path, self._iter_document(segments, fmt, settings))
+            outputs[fmt] = {'path': path, 'cue_count': cue_count, 'bytes': size}
+            print(f"[Transcriber] Legenda gravada: {path} ({cue_count} legendas, {size} bytes)")
+        return outputs
+    
+    def _iter_document(
+        self,
+        segments: Iterable,
+        output_format: str,
+        settings: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """Documento em pedaços, legenda a legenda (mesmo conteúdo de _format_segments)."""
+        if output_format == 'txt':
+            # Como _format_txt: um segmento por linha, sem a divisão em legendas
+            return iter_joined(self._iter_texts(segments))
+        
+        cues = self._iter_cues(segments, **self._cue_limits(settings))
+        
+        if output_format == 'json':
+            return iter_json_segments(self._cue_to_json(cue) for cue in cues)
+        elif output_format not in ('vtt', 'ass'):
+            output_format = 'srt'
+        
+        parts = (self._render_cue(output_format, cue) for cue in cues)
+        if output_format != 'srt':
+            parts = itertools.chain([self._document_header(output_format)], parts)
+        return iter_joined(parts)
+    
+    def _render_outputs(
+        self,
+        segments: List,
+        output_format: Union[str, List[str]],
+        settings: Optional[Dict[str, Any]] = None
+    ) -> Union[str, Dict[str, str]]:
+        """Renderizar um formato, ou vários (dict formato -> texto) a partir da mesma decodificação."""
+        if isinstance(output_format, (list, tuple)):
+            return {
+                fmt: self._format_segments(segments, fmt, settings)
+                for fmt in dict.fromkeys(output_format)
+            }
+        return self._format_segments(segments, output_format, settings)
+    
+    def _format_segments(
+        self,
+        segments: Iterable,
+        output_format: str,
+        settings: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Formatar segmentos no formato pedido (SRT como padrão)."""
+        limits = self._cue_limits(settings)
+        
+        with metrics.timed('format'):
+            if output_format == 'vtt':
+                return self._format_vtt(segments, **limits)
+            elif output_format == 'ass':
+                return self._format_ass(segments, **limits)
+            elif output_format == 'json':
+                return self._format_json(segments, **limits)
+            elif output_format == 'txt':
+                return self._format_txt(segments)
+            return self._format_srt(segments, **limits)
+    
+    def _iter_cues(
+        self,
+        segments: Iterable,
+        max_chars: int,
+        max_lines: int,
+        min_duration: float,
+        max_duration: float,
+        word_level: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Converter segmentos em legendas (texto quebrado e duração ajustada).
+        
+        Com tempos por palavra, as legendas são cortadas e unidas nas fronteiras
+        reais das palavras para caber em max_lines × max_chars e max_duration;
+        legendas curtas crescem até min_duration sem invadir a seguinte.
+        Segmentos sem palavras viram uma legenda cada (fim limitado a max_duration).
+        
+        Um CueFlush entre os segmentos entrega a legenda retida sem esperar a
+        próxima (fontes ao vivo, numa pausa da fala).
+        """
+        pieces = self._cue_pieces(segments, max_chars, max_lines, min_duration, max_duration, word_level)
+        index = 1
+        pending = None
+        
+        # Uma peça de atraso: é preciso ver a próxima para unir ou estender
+        for piece in itertools.chain(pieces, [None]):
+            flush = isinstance(piece, CueFlush)
+            if pending is not None and piece is not None and not flush and self._can_merge(
+                pending, piece, max_chars, max_lines, min_duration, max_duration
+            ):
+                pending = {
+                    **pending,
+                    'end': piece['end'],
+                    'text': f"{pending['text']} {piece['text']}",
+                    'confidence': min(pending['confidence'], piece['confidence'], key=self._confidence_value)
+                }
+                continue
+            
+            if pending is not None:
+                end = pending['end']
+                if pending['timed'] and end - pending['start'] < min_duration:
+                    end = pending['start'] + min_duration
+                    if piece is not None:
+                        next_start = piece.until if flush else piece['start']
+                        end = min(end, max(pending['end'], next_start))
+                
+                yield {
+                    'id': pending['id'],
+                    'index': index,
+                    'start': pending['start'],
+                    'end': end,
+                    'text': pending['text'],
+                    'lines': self._wrap_text(pending['text'], max_chars, max_lines),
+                    'confidence': pending['confidence']
+                }
+                index += 1
+            pending = None if flush else piece
+    
+    def _cue_pieces(
+        self,
+        segments: Iterable,
+        max_chars: int,
+        max_lines: int,
+        min_duration: float,
+        max_duration: float,
+        word_level: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """Peças de legenda: grupos de palavras (timed) ou segmentos inteiros (CueFlush passa adiante)."""
+        i = -1
+        for segment in segments:
+            if isinstance(segment, CueFlush):
+                yield segment
+                continue
+            
+            i += 1
             text = segment.text.strip()
             if not text:
                 continue
             
-            lines = self._wrap_text(text, max_chars, max_lines)
-            formatted_text = '\\N'.join(lines)  # ASS usa \N para quebra de linha
+            confidence = segment_confidence(segment)
+            words = [word for word in getattr(segment, 'words', None) or [] if word.word.strip()] if word_level else []
+            if words:
+                for group in self._split_words(words, max_chars, max_lines, max_duration):
+                    yield {
+                        'id': i + 1,
+                        'start': group[0].start,
+                        'end': group[-1].end,
+                        'text': ''.join(word.word for word in group).strip(),
+                        'timed': True,
+                        'confidence': confidence
+                    }
+                continue
             
+            # Ajustar duração
             start = segment.start
             end = segment.end
             duration = end - start
@@ -325,55 +1725,186 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             elif duration > max_duration:
                 end = start + max_duration
             
-            start_ts = self._format_timestamp_ass(start)
-            end_ts = self._format_timestamp_ass(end)
+            yield {'id': i + 1, 'start': start, 'end': end, 'text': text, 'timed': False, 'confidence': confidence}
+    
+    def _split_words(self, words: List, max_chars: int, max_lines: int, max_duration: float) -> Iterator[List]:
+        """
+        Agrupar palavras em legendas que caibam nos limites.
+        
+        Corta antes da palavra que estouraria linhas ou duração; depois de uma
+        linha cheia, prefere cortar no fim de frase.
+        """
+        group = []
+        tokens = []
+        
+        for word in words:
+            token = word.word.strip()
+            if group:
+                overflow = (
+                    self._line_count(tokens + [token], max_chars) > max_lines
+                    or word.end - group[0].start > max_duration
+                )
+                sentence_break = tokens[-1].endswith(SENTENCE_ENDINGS) and len(' '.join(tokens)) >= max_chars
+                if overflow or sentence_break:
+                    yield group
+                    group = []
+                    tokens = []
             
-            ass_parts.append(f"Dialogue: 0,{start_ts},{end_ts},Default,,0,0,0,,{formatted_text}")
+            group.append(word)
+            tokens.append(token)
+        
+        if group:
+            yield group
+    
+    def _can_merge(
+        self,
+        cue: Dict[str, Any],
+        following: Dict[str, Any],
+        max_chars: int,
+        max_lines: int,
+        min_duration: float,
+        max_duration: float
+    ) -> bool:
+        """Unir legenda curta à seguinte quando estão próximas e o texto ainda cabe."""
+        return (
+            cue['timed'] and following['timed']
+            and cue['end'] - cue['start'] < min_duration
+            and following['start'] - cue['end'] <= MERGE_MAX_GAP
+            and following['end'] - cue['start'] <= max_duration
+            and self._line_count((cue['text'] + ' ' + following['text']).split(), max_chars) <= max_lines
+        )
+    
+    def _confidence_value(self, confidence: Dict[str, Optional[float]]) -> float:
+        # Legenda unida herda a confiança do pedaço mais fraco (sem dado = confiável)
+        return confidence['confidence'] if confidence['confidence'] is not None else 1.0
+    
+    def _line_count(self, tokens: List[str], max_chars: int) -> int:
+        """Linhas ocupadas pelas palavras (mesma quebra gulosa de _wrap_text)."""
+        lines = 0
+        length = 0
+        for token in tokens:
+            if lines and length + 1 + len(token) <= max_chars:
+                length += 1 + len(token)
+            else:
+                lines += 1
+                length = len(token)
+        return lines
+    
+    def _document_header(self, output_format: str) -> str:
+        """Cabeçalho do documento (antes da primeira legenda)."""
+        if output_format == 'vtt':
+            return "WEBVTT\n"
+        elif output_format == 'ass':
+            return ASS_HEADER
+        return ''
+    
+    def _render_cue(self, output_format: str, cue: Dict[str, Any]) -> str:
+        """Renderizar uma única legenda no formato pedido."""
+        if output_format == 'vtt':
+            start_ts = self._format_timestamp_vtt(cue['start'])
+            end_ts = self._format_timestamp_vtt(cue['end'])
+            formatted_text = '\n'.join(cue['lines'])
+            return f"{start_ts} --> {end_ts}\n{formatted_text}\n"
+        elif output_format == 'ass':
+            start_ts = self._format_timestamp_ass(cue['start'])
+            end_ts = self._format_timestamp_ass(cue['end'])
+            formatted_text = '\\N'.join(cue['lines'])  # ASS usa \N para quebra de linha
+            return f"Dialogue: 0,{start_ts},{end_ts},Default,,0,0,0,,{formatted_text}"
+        elif output_format == 'json':
+            return json.dumps(self._cue_to_json(cue), ensure_ascii=False)
+        elif output_format == 'txt':
+            return cue['text']
+        
+        start_ts = self._format_timestamp_srt(cue['start'])
+        end_ts = self._format_timestamp_srt(cue['end'])
+        formatted_text = '\n'.join(cue['lines'])
+        return f"{cue['index']}\n{start_ts} --> {end_ts}\n{formatted_text}\n"
+    
+    def _cue_to_json(self, cue: Dict[str, Any]) -> Dict[str, Any]:
+        """Representação JSON de uma legenda (com a confiança do segmento, quando conhecida)."""
+        confidence = cue.get('confidence') or {}
+        return {
+            'id': cue['id'],
+            'start': round(cue['start'], 3),
+            'end': round(cue['end'], 3),
+            'text': cue['text'],
+            **{key: value for key, value in confidence.items() if value is not None}
+        }
+    
+    def _format_srt(
+        self,
+        segments: Iterable,
+        max_chars: int,
+        max_lines: int,
+        min_duration: float,
+        max_duration: float,
+        word_level: bool = True
+    ) -> str:
+        """Formatar segmentos como SRT."""
+        cues = self._iter_cues(segments, max_chars, max_lines, min_duration, max_duration, word_level)
+        return '\n'.join(self._render_cue('srt', cue) for cue in cues)
+    
+    def _format_vtt(
+        self,
+        segments: Iterable,
+        max_chars: int,
+        max_lines: int,
+        min_duration: float,
+        max_duration: float,
+        word_level: bool = True
+    ) -> str:
+        """Formatar segmentos como WebVTT."""
+        vtt_parts = [self._document_header('vtt')]
+        
+        for cue in self._iter_cues(segments, max_chars, max_lines, min_duration, max_duration, word_level):
+            vtt_parts.append(self._render_cue('vtt', cue))
+        
+        return '\n'.join(vtt_parts)
+    
+    def _format_ass(
+        self,
+        segments: Iterable,
+        max_chars: int,
+        max_lines: int,
+        min_duration: float,
+        max_duration: float,
+        word_level: bool = True
+    ) -> str:
+        """Formatar segmentos como ASS/SSA (Adobe Premiere, DaVinci, etc)."""
+        ass_parts = [self._document_header('ass')]
+        
+        for cue in self._iter_cues(segments, max_chars, max_lines, min_duration, max_duration, word_level):
+            ass_parts.append(self._render_cue('ass', cue))
         
         return '\n'.join(ass_parts)
     
     def _format_json(
         self,
-        segments: list,
+        segments: Iterable,
         max_chars: int,
         max_lines: int,
         min_duration: float,
-        max_duration: float
+        max_duration: float,
+        word_level: bool = True
     ) -> str:
         """Formatar segmentos como JSON."""
-        json_segments = []
-        
-        for i, segment in enumerate(segments):
-            text = segment.text.strip()
-            if not text:
-                continue
-            
-            start = segment.start
-            end = segment.end
-            duration = end - start
-            
-            if duration < min_duration:
-                end = start + min_duration
-            elif duration > max_duration:
-                end = start + max_duration
-            
-            json_segments.append({
-                'id': i + 1,
-                'start': round(start, 3),
-                'end': round(end, 3),
-                'text': text
-            })
+        json_segments = [
+            self._cue_to_json(cue)
+            for cue in self._iter_cues(segments, max_chars, max_lines, min_duration, max_duration, word_level)
+        ]
         
         return json.dumps({'segments': json_segments}, indent=2, ensure_ascii=False)
     
-    def _format_txt(self, segments: list) -> str:
+    def _format_txt(self, segments: Iterable) -> str:
         """Formatar segmentos como texto puro (transcrição)."""
-        texts = []
+        return '\n'.join(self._iter_texts(segments))
+    
+    def _iter_texts(self, segments: Iterable) -> Iterator[str]:
+        """Textos não vazios dos segmentos (linhas do formato txt)."""
         for segment in segments:
             text = segment.text.strip()
             if text:
-                texts.append(text)
-        return '\n'.join(texts)
+                yield text
     
     def _wrap_text(self, text: str, max_chars: int, max_lines: int) -> list:
         """Quebrar texto em linhas respeitando limites."""
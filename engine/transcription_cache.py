@@ -0,0 +1,198 @@
+"""
+Torio Tools Scribe - Transcription Cache
+Cache persistente de transcrições, endereçado pelo conteúdo do arquivo.
+
+Guarda os segmentos crus (com palavras) para que mudanças de formato ou de
+quebra de linha não exijam rodar o modelo de novo.
+"""
+
+import os
+import json
+import gzip
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import metrics
+from segments import segments_to_dicts, segments_from_dicts
+
+HASH_CHUNK_SIZE = 1 << 20  # Leitura em blocos de 1 MB para o hash
+
+class TranscriptionCache:
+    """Cache LRU em disco de segmentos transcritos, limitado por tamanho."""
+    
+    def __init__(self, cache_dir: Path, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Inicializar cache.
+        
+        Args:
+            cache_dir: Pasta onde os registros são gravados
+            max_bytes: Tamanho máximo em disco (os menos usados são removidos)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # (caminho, tamanho, mtime) -> sha256 do conteúdo
+        self._hash_memo: Dict[tuple, str] = {}
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._remove_orphans()
+    
+    def file_hash(self, file_path: str) -> str:
+        """Calcular sha256 do conteúdo (memorizado por tamanho + mtime)."""
+        stat = os.stat(file_path)
+        memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        
+        cached = self._hash_memo.get(memo_key)
+        if cached:
+            return cached
+        
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(HASH_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+        
+        content_hash = digest.hexdigest()
+        self._hash_memo[memo_key] = content_hash
+        return content_hash
+    
+    def make_key(self, file_path: str, model: str, language: str, options: Dict[str, Any]) -> str:
+        """Montar chave a partir do conteúdo, modelo, idioma e opções de decodificação."""
+        payload = json.dumps({
+            'content': self.file_hash(file_path),
+            'model': model,
+            'language': language,
+            'options': options
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.json.gz'
+    
+    def get(self, *keys: str) -> Optional[Dict[str, Any]]:
+        """
+        Buscar transcrição no cache.
+        
+        Com várias chaves, vale a primeira encontrada; a consulta conta como
+        um único acerto ou erro, não um por chave.
+        
+        Returns:
+            Dict com segments, duration, language e summary (ou None), ou None
+        """
+        with self._lock:
+            for key in keys:
+                data = self._read(self._entry_path(key))
+                if data is not None:
+                    break
+            
+            if data is None:
+                self.misses += 1
+                metrics.record_cache('transcription', hit=False)
+                return None
+            
+            self.hits += 1
+            metrics.record_cache('transcription', hit=True)
+        
+        return {
+            'segments': segments_from_dicts(data['segments']),
+            'duration': data['duration'],
+            'language': data['language'],
+            'summary': data.get('summary')
+        }
+    
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Ler um registro (None se não existe ou está corrompido)."""
+        if not path.exists():
+            return None
+        
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+            # Marcar como usado recentemente (LRU pelo mtime)
+            os.utime(path, None)
+        except (OSError, ValueError) as e:
+            print(f"[Cache] Registro corrompido, removendo: {path.name} ({e})")
+            path.unlink(missing_ok=True)
+            return None
+        return data
+    
+    def put(
+        self,
+        key: str,
+        segments: List,
+        duration: float,
+        language: str,
+        summary: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Gravar transcrição no cache (escrita atômica) e aplicar o limite de tamanho.
+        
+        summary acompanha o registro (ex.: o resumo do refinamento) e volta em get().
+        """
+        path = self._entry_path(key)
+        temp_path = path.with_name(path.name + '.tmp')
+        
+        data = {
+            'segments': segments_to_dicts(segments),
+            'duration': duration,
+            'language': language
+        }
+        if summary is not None:
+            data['summary'] = summary
+        
+        with self._lock:
+            try:
+                with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(temp_path, path)
+            except OSError as e:
+                print(f"[Cache] Erro ao gravar registro: {e}")
+                temp_path.unlink(missing_ok=True)
+                return
+            
+            self._evict()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas do cache."""
+        sizes = []
+        for entry in self.cache_dir.glob('*.json.gz'):
+            try:
+                sizes.append(entry.stat().st_size)
+            except OSError:
+                continue
+        return {
+            'entries': len(sizes),
+            'bytes': sum(sizes),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+    
+    def _evict(self):
+        """Remover registros menos usados até caber no limite."""
+        entries = []
+        for entry in self.cache_dir.glob('*.json.gz'):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            print(f"[Cache] Removido (LRU): {entry.name}")
+    
+    def _remove_orphans(self):
+        """Apagar arquivos temporários deixados por gravações interrompidas."""
+        for orphan in self.cache_dir.glob('*.tmp'):
+            orphan.unlink(missing_ok=True)
@@ -0,0 +1,314 @@
+"""
+Torio Tools Scribe - Watch Folder
+Monitora pastas e transcreve automaticamente as mídias que chegam.
+
+Usa eventos do sistema de arquivos (watchdog: inotify/ReadDirectoryChangesW)
+quando disponível e varredura periódica como alternativa. Cada arquivo só
+entra na fila depois de estável (tamanho e data sem mudar), e o hash do
+conteúdo evita processar a mesma mídia duas vezes, inclusive após reiniciar.
+"""
+
+import os
+import glob
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Set, Tuple
+
+from jobs import JobManager
+from transcriber import WhisperTranscriber, VIDEO_EXTENSIONS
+
+AUDIO_EXTENSIONS = ['.wav', '.mp3', '.m4a', '.flac', '.ogg', '.opus', '.aac', '.wma']
+
+MEDIA_EXTENSIONS = set(VIDEO_EXTENSIONS + AUDIO_EXTENSIONS)
+
+HASH_CHUNK_SIZE = 1 << 20
+
+def subtitle_path(path: str, output_format: str, output_dir: Optional[Path] = None, root: Optional[str] = None) -> str:
+    """
+    Caminho da legenda de uma mídia, sem colidir com a de outra mídia.
+    
+    Sem output_dir, fica ao lado da mídia; com output_dir, espelha a pasta
+    da mídia relativa a root (a/talk.mp4 e b/talk.mp4 não se sobrescrevem).
+    Se outra mídia da mesma pasta tem o mesmo nome-base (talk.mp4 e
+    talk.wav), a extensão da mídia entra no nome: talk.mp4.srt.
+    """
+    source = Path(path)
+    directory = source.parent
+    if output_dir is not None:
+        directory = Path(output_dir) / (directory.relative_to(root) if root else Path())
+    
+    name = source.stem
+    siblings = source.parent.glob(glob.escape(source.stem) + '.*')
+    if any(
+        sibling.stem == source.stem and sibling != source and sibling.suffix.lower() in MEDIA_EXTENSIONS
+        for sibling in siblings
+    ):
+        name = source.name
+    return str(directory / f'{name}.{output_format}')
+
+def content_hash(path: str) -> str:
+    """sha256 do conteúdo (leitura em blocos de 1 MB)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class WatchLedger:
+    """Registro persistente das mídias já transcritas (por hash do conteúdo)."""
+    
+    def __init__(self, ledger_path: Path):
+        self.ledger_path = Path(ledger_path)
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        
+        if self.ledger_path.exists():
+            try:
+                with open(self.ledger_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('files', {})
+            except (OSError, ValueError) as e:
+                print(f"[Watch] Registro ilegível, começando do zero: {e}")
+    
+    def known_paths(self) -> Dict[str, Tuple[int, int]]:
+        """Caminho -> (tamanho, mtime_ns) das mídias concluídas (evita recalcular o hash)."""
+        with self._lock:
+            return {
+                entry['path']: (entry['source']['size'], entry['source']['mtime_ns'])
+                for entry in self.entries.values()
+                if 'source' in entry
+            }
+    
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.entries.get(digest)
+    
+    def record(self, digest: str, entry: Dict[str, Any]):
+        """Registrar mídia concluída e persistir (escrita atômica)."""
+        with self._lock:
+            self.entries[digest] = entry
+            self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.ledger_path.with_name(self.ledger_path.name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'files': self.entries}, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.ledger_path)
+
+class FolderWatcher:
+    """Detecta mídias novas e enfileira transcrições com limite de concorrência."""
+    
+    def __init__(
+        self,
+        transcriber: WhisperTranscriber,
+        folders: List[str],
+        ledger: WatchLedger,
+        formats: List[str],
+        language: str = 'pt',
+        settings: Optional[Dict[str, Any]] = None,
+        concurrency: int = 1,
+        stable_seconds: float = 5.0,
+        poll_interval: float = 2.0,
+        recursive: bool = True
+    ):
+        """
+        Inicializar monitor.
+        
+        Args:
+            transcriber: Transcritor já carregado (compartilhado pelos jobs)
+            folders: Pastas monitoradas
+            ledger: Registro das mídias já transcritas
+            formats: Formatos gravados ao lado de cada mídia
+            language: Código do idioma ou 'auto'
+            settings: Configurações de legenda e decodificação
+            concurrency: Transcrições simultâneas
+            stable_seconds: Tempo sem mudança de tamanho/data antes de processar
+            poll_interval: Intervalo das verificações (e da varredura sem watchdog)
+            recursive: Incluir subpastas
+        """
+        self.transcriber = transcriber
+        self.folders = [os.path.abspath(folder) for folder in folders]
+        self.ledger = ledger
+        self.formats = formats
+        self.language = language
+        self.settings = settings or {}
+        self.stable_seconds = stable_seconds
+        self.poll_interval = poll_interval
+        self.recursive = recursive
+        self.jobs = JobManager(max_workers=concurrency)
+        
+        # caminho -> (tamanho, mtime_ns, visto desde)
+        self._candidates: Dict[str, Tuple[int, int, float]] = {}
+        # caminho -> (tamanho, mtime_ns) já tratado (processado, enfileirado ou duplicado)
+        self._handled: Dict[str, Tuple[int, int]] = ledger.known_paths()
+        self._in_flight: Set[str] = set()
+        self._lock = threading.Lock()
+        self._observer = None
+    
+    def _is_media(self, path: str) -> bool:
+        name = os.path.basename(path)
+        return not name.startswith('.') and os.path.splitext(name)[1].lower() in MEDIA_EXTENSIONS
+    
+    def notify(self, path: str):
+        """Marcar caminho como possivelmente novo/alterado (eventos ou varredura)."""
+        if not self._is_media(path):
+            return
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        
+        signature = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if self._handled.get(path) == signature:
+                return
+            previous = self._candidates.get(path)
+            if previous is None or previous[:2] != signature:
+                # Novo ou ainda crescendo: o relógio de estabilidade recomeça
+                self._candidates[path] = (*signature, time.monotonic())
+    
+    def scan(self):
+        """Varrer as pastas (sempre na partida; periodicamente sem watchdog)."""
+        for folder in self.folders:
+            if self.recursive:
+                for root, _, names in os.walk(folder):
+                    for name in names:
+                        self.notify(os.path.join(root, name))
+            else:
+                for entry in os.scandir(folder):
+                    if entry.is_file():
+                        self.notify(entry.path)
+    
+    def _start_observer(self) -> bool:
+        """Eventos do sistema de arquivos via watchdog (dependência opcional)."""
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            print("[Watch] watchdog não instalado: usando varredura periódica")
+            return False
+        
+        watcher = self
+        
+        class Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    watcher.notify(event.src_path)
+            
+            def on_modified(self, event):
+                if not event.is_directory:
+                    watcher.notify(event.src_path)
+            
+            def on_moved(self, event):
+                if not event.is_directory:
+                    watcher.notify(event.dest_path)
+        
+        self._observer = Observer()
+        for folder in self.folders:
+            self._observer.schedule(Handler(), folder, recursive=self.recursive)
+        self._observer.start()
+        print("[Watch] Monitorando eventos do sistema de arquivos (watchdog)")
+        return True
+    
+    def _stable_candidates(self) -> List[str]:
+        """Candidatos sem mudança há stable_seconds (reconfere tamanho e data)."""
+        now = time.monotonic()
+        stable = []
+        with self._lock:
+            candidates = list(self._candidates.items())
+        
+        for path, (size, mtime_ns, since) in candidates:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                with self._lock:
+                    self._candidates.pop(path, None)
+                continue
+            
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                with self._lock:
+                    self._candidates[path] = (stat.st_size, stat.st_mtime_ns, now)
+            elif now - since >= self.stable_seconds:
+                stable.append(path)
+        return stable
+    
+    def _dispatch(self, path: str):
+        """Deduplicar pelo conteúdo e enfileirar."""
+        with self._lock:
+            size, mtime_ns, _ = self._candidates.pop(path)
+            self._handled[path] = (size, mtime_ns)
+        
+        try:
+            digest = content_hash(path)
+        except OSError as e:
+            print(f"[Watch] Não foi possível ler {path}: {e}")
+            return
+        
+        finished = self.ledger.get(digest)
+        if finished is not None:
+            print(f"[Watch] Já transcrito (mesmo conteúdo de {finished['path']}): {path}")
+            return
+        
+        with self._lock:
+            if digest in self._in_flight:
+                print(f"[Watch] Duplicado em processamento, ignorando: {path}")
+                return
+            self._in_flight.add(digest)
+        
+        source = {'size': size, 'mtime_ns': mtime_ns}
+        self.jobs.submit(lambda job: self._transcribe(job, path, digest, source), {'file_path': path})
+    
+    def _transcribe(self, job, path: str, digest: str, source: Dict[str, int]) -> Dict[str, Any]:
+        """Job: transcrever e gravar as legendas ao lado da mídia."""
+        try:
+            started = time.perf_counter()
+            result = self.transcriber.transcribe(
+                path,
+                language=self.language,
+                output_format=self.formats,
+                settings=self.settings,
+                progress_callback=job.report_progress,
+                cancel_event=job.cancel_event,
+                output_path=subtitle_path(path, self.formats[0])
+            )
+            elapsed = time.perf_counter() - started
+            
+            self.ledger.record(digest, {
+                'path': path,
+                'source': source,
+                'outputs': result['outputs'],
+                'duration': result['duration'],
+                'language': result['detected_language'],
+                'elapsed_seconds': round(elapsed, 3),
+                'finished_at': time.time()
+            })
+            print(f"[Watch] Concluído: {path} ({result['duration']:.1f}s de áudio em {elapsed:.1f}s)")
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.discard(digest)
+    
+    def run(self, stop_event: Optional[threading.Event] = None):
+        """Monitorar até stop_event (ou Ctrl+C)."""
+        stop_event = stop_event or threading.Event()
+        print(f"[Watch] Pastas: {', '.join(self.folders)} (formatos: {', '.join(self.formats)}, "
+              f"{self.jobs.max_workers} simultâneas)")
+        
+        use_events = self._start_observer()
+        self.scan()
+        
+        try:
+            while not stop_event.wait(self.poll_interval):
+                if not use_events:
+                    self.scan()
+                for path in self._stable_candidates():
+                    self._dispatch(path)
+        except KeyboardInterrupt:
+            print("[Watch] Encerrando...")
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join()
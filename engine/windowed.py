@@ -0,0 +1,132 @@
+"""
+Torio Tools Scribe - Windowed Audio
+Leitura do áudio em janelas de tamanho fixo para decodificar arquivos longos
+com memória constante (pipe do FFmpeg ou mmap do cache de áudio), e de
+gravações ainda em andamento (arquivo que cresce ou PCM do stdin).
+"""
+
+from typing import Optional, BinaryIO
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 4  # float32
+
+DECODE_WINDOW_SECONDS = 600.0   # Áudio decodificado por vez (~38 MB em float32)
+MIN_DECODE_WINDOW_SECONDS = 120.0
+WINDOW_TAIL_SECONDS = 30.0       # Segmentos que terminam aqui voltam na próxima janela
+WINDOWED_AUTO_SECONDS = 1800.0   # A partir desta duração, o modo em janelas é automático
+PROMPT_CHARS = 200               # Texto anterior passado como contexto à janela seguinte
+
+# Modo de acompanhamento (gravação em andamento)
+DEFAULT_TAIL_LATENCY = 10.0      # Áudio novo (s) entre decodificações
+MIN_TAIL_LATENCY = 1.0
+TAIL_WINDOW_SECONDS = 120.0      # Máximo de áudio não finalizado mantido
+TAIL_GUARD_SECONDS = 2.0         # Segmento só é final se termina esse tanto antes do fim do áudio lido
+TAIL_IDLE_SECONDS = 30.0         # Arquivo sem crescer por esse tempo: gravação encerrada
+
+class ArrayWindowReader:
+    """Janelas de um array já disponível (ex.: mmap do cache de áudio): fatias sem cópia."""
+    
+    def __init__(self, audio: np.ndarray, window_samples: int):
+        self.audio = audio
+        self.window_samples = window_samples
+        self.eof = False
+    
+    def window(self, start_sample: int) -> np.ndarray:
+        """Amostras [start_sample, start_sample + janela)."""
+        end = start_sample + self.window_samples
+        self.eof = end >= len(self.audio)
+        return self.audio[start_sample:end]
+
+class PipeWindowReader:
+    """
+    Janelas lidas de um fluxo PCM float32 (stdout do FFmpeg) num buffer fixo.
+    
+    As janelas só avançam: o trecho ainda não concluído da janela anterior é
+    movido para o início do buffer e o restante é completado com o fluxo.
+    """
+    
+    def __init__(self, stream: BinaryIO, window_samples: int):
+        self.stream = stream
+        self.window_samples = window_samples
+        self.buffer = bytearray(window_samples * BYTES_PER_SAMPLE)
+        self.buffer_start = 0  # Primeira amostra presente no buffer
+        self.filled = 0        # Bytes válidos no buffer
+        self.eof = False
+        # readinto1 devolve o que já chegou (uma leitura só); fluxos crus não têm, mas já fazem isso
+        self._readinto = getattr(stream, 'readinto1', None) or stream.readinto
+    
+    def window(self, start_sample: int) -> np.ndarray:
+        """
+        Amostras [start_sample, start_sample + janela), ou menos no fim do fluxo.
+        
+        O array devolvido é uma vista do buffer: vale até a próxima chamada.
+        """
+        self._shift(start_sample)
+        self._fill(len(self.buffer))
+        return self._view()
+    
+    def _shift(self, start_sample: int):
+        """Mover o buffer para começar em start_sample (descartando do fluxo o que ficar antes)."""
+        if start_sample < self.buffer_start:
+            raise ValueError("Janelas do pipe só podem avançar")
+        
+        skip = (start_sample - self.buffer_start) * BYTES_PER_SAMPLE
+        kept = max(0, self.filled - skip)
+        if kept:
+            self.buffer[:kept] = self.buffer[skip:self.filled]
+        discard = max(0, skip - self.filled)  # Salto além do buffer: descartar do fluxo
+        self.buffer_start = start_sample
+        self.filled = kept
+        
+        view = memoryview(self.buffer)
+        try:
+            while discard and not self.eof:
+                read = self._readinto(view[:min(discard, len(self.buffer))])
+                if not read:
+                    self.eof = True
+                    break
+                discard -= read
+        finally:
+            view.release()
+    
+    def _fill(self, target: int):
+        """Ler do fluxo até ter `target` bytes no buffer (ou até o fim do fluxo)."""
+        view = memoryview(self.buffer)
+        try:
+            while not self.eof and self.filled < target:
+                read = self._readinto(view[self.filled:target])
+                if not read:
+                    self.eof = True
+                    break
+                self.filled += read
+        finally:
+            view.release()
+    
+    def _view(self) -> np.ndarray:
+        # Bytes de uma amostra incompleta ficam para a próxima leitura
+        return np.frombuffer(self.buffer, dtype=np.float32, count=self.filled // BYTES_PER_SAMPLE)
+
+class TailWindowReader(PipeWindowReader):
+    """
+    Janelas de uma gravação em andamento (FFmpeg com -follow, ou PCM do stdin).
+    
+    Em vez de esperar uma janela cheia, cada chamada espera só `new_samples`
+    amostras novas: o atraso das legendas depende da latência pedida, não do
+    tamanho da janela. O áudio ainda não finalizado continua no buffer e é
+    decodificado de novo junto com o novo (janelas sobrepostas).
+    """
+    
+    def window(self, start_sample: int, new_samples: Optional[int] = None) -> np.ndarray:
+        """
+        Amostras desde start_sample com até `new_samples` novas (limitado à janela).
+        
+        Bloqueia até o áudio novo chegar ou o fluxo terminar.
+        """
+        self._shift(start_sample)
+        target = len(self.buffer)
+        if new_samples is not None:
+            target = min(target, self.filled + new_samples * BYTES_PER_SAMPLE)
+        self._fill(target)
+        return self._view()